@@ -1,3 +1,4 @@
+import json
 from typing import Annotated, Sequence
 
 from crud.crud_element import crud_element
@@ -6,11 +7,13 @@ from crud.crud_group_type import crud_group_type
 from crud.element import ElementService
 from crud.group import GroupService
 from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from models.model_group import GroupModel
 from pydantic import BaseModel
 from schemas.schema_group import (
     GroupResponse,
     GroupSchema,
+    GroupStatisticRequest,
     InputGroupFromUser,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -165,6 +168,35 @@ async def get_group_statistic(
     )
 
 
+@router.post("/statistics/", status_code=status.HTTP_200_OK)
+async def get_groups_statistic(
+    *,
+    session: AsyncSession = Depends(utils.get_session),
+    statistic_request: GroupStatisticRequest,
+    request: Request,
+) -> StreamingResponse:
+    """Statistic of groups with names or of all groups of TMO. Response is
+    stream of JSON lines {"group_name": ..., "statistic": {...}}."""
+    group_models = await crud_group.get_groups_with_elements(
+        session=session,
+        group_names=statistic_request.group_names,
+        tmo_id=statistic_request.tmo_id,
+    )
+    redis = request.state.lifespan_app.store.redis
+
+    async def statistic_lines():
+        async for group_model, statistic in redis.get_statistics(group_models):
+            line = {
+                "group_name": group_model.group_name,
+                "statistic": statistic.model_dump(mode="json"),
+            }
+            yield json.dumps(line) + "\n"
+
+    return StreamingResponse(
+        statistic_lines(), media_type="application/x-ndjson"
+    )
+
+
 @router.post("/statistic/reset", status_code=status.HTTP_200_OK)
 async def reset_group_statistic(
     *,
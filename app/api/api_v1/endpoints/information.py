@@ -9,3 +9,10 @@ async def get_information_about_group_schema(
 ) -> dict[str, list[str]]:
     result = request.state.lifespan_app.store.group_scheme
     return {"created group_schema": list(result.keys())}
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+async def get_information_about_statistic_cache(
+    request: Request,
+) -> dict[str, int | float]:
+    return request.state.lifespan_app.store.redis.statistic_cache.stats()
@@ -57,6 +57,10 @@ class GRPCConfig(BaseSettings):
     INVENTORY_GRPC_PORT: int = Field(default=50051, ge=1, le=65_535)
     SEARCH_GRPC_PORT: int = Field(default=50051, ge=1, le=65_535)
     SERVER_GRPC_PORT: int = Field(default=50051, ge=1, le=65_535)
+    # Processes are read from Search in pages, up to SEARCH_PAGE_CONCURRENCY
+    # pages at once
+    SEARCH_PAGE_SIZE: int = Field(default=10_000, ge=1)
+    SEARCH_PAGE_CONCURRENCY: int = Field(default=4, ge=1)
 
 
 class KeycloakConfig(BaseSettings):
@@ -206,7 +210,58 @@ class KafkaConfig(BaseSettings):
 class RedisConfig(BaseSettings):
     host: str = Field(default="redis")
     port: int = Field(default=6379, ge=1, le=65_535)
+    # Connect to Redis Cluster, host and port are used as startup node
+    cluster: bool = Field(default=False)
     password: str = Field(default="", validation_alias="redis_pass")
+    # Comma separated host:port of Sentinels, primary is discovered by them
+    sentinel_hosts: str = Field(default="")
+    sentinel_service: str = Field(default="mymaster")
+    # Replica for statistic reads, used only when read_from_replicas is set.
+    # With Sentinel replicas are discovered by Sentinel.
+    replica_host: str = Field(default="")
+    replica_port: int = Field(default=6379, ge=1, le=65_535)
+    read_from_replicas: bool = Field(default=False)
+    # Statistic of group written by this process is read from primary during
+    # this number of seconds, so a write is always visible to the next read
+    read_your_writes_seconds: float = Field(default=5.0, ge=0)
+    # python - aggregate raw hash values in Python on every read
+    # aggregate - read running aggregates maintained on write
+    # lua - aggregate raw hash values inside Redis with Lua script
+    statistic_engine: Literal["python", "aggregate", "lua"] = Field(
+        default="aggregate"
+    )
+    # Max number of keys read with one pipeline or script call
+    pipeline_chunk_size: int = Field(default=500, ge=1)
+    # Number of entities written to Redis with one pipeline
+    ingest_chunk_size: int = Field(default=1000, ge=1)
+    # Max number of elements of approximate group kept in Redis
+    approximate_sample_size: int = Field(default=10000, ge=1)
+    # none - statistic of written chunks is built in event loop
+    # thread, process - in pool of statistic_workers threads or processes
+    statistic_executor: Literal["none", "thread", "process"] = Field(
+        default="none"
+    )
+    statistic_workers: int = Field(default=2, ge=1)
+    # full - Search rows are validated into statistic models, which are
+    # dumped for Redis, needed - only fields of rows used by statistic are
+    # validated into dicts, models are not built
+    row_validation: Literal["full", "needed"] = Field(default="full")
+    # Max number of group statistic models cached in process, 0 - disabled
+    statistic_cache_size: int = Field(default=1024, ge=0)
+    # Keep serialized statistic of group in Redis until group is changed
+    statistic_snapshots: bool = Field(default=True)
+    # full - "None" field for every entity in not necessary parameters of
+    # non aggregate group, compact - one placeholder field per parameter
+    non_aggregate_storage: Literal["full", "compact"] = Field(default="full")
+    # legacy - GROUP_MS:<group name>:<statistic>:<type>:<aggregation>:<name>
+    # compact - GMS:<group id>:<parameter code>, both layouts are readable
+    key_layout: Literal["legacy", "compact"] = Field(default="legacy")
+    # text - all values are stored as text, binary - numbers of average and
+    # maximum statistics are stored as 8 byte doubles
+    value_codec: Literal["text", "binary"] = Field(default="text")
+    # Migrations run under lock with this TTL, lock is extended while they
+    # run, other instances wait until it is released
+    migration_lock_seconds: int = Field(default=60, ge=1)
 
     model_config = SettingsConfigDict(env_prefix="redis_")
 
@@ -4,7 +4,7 @@ from typing import Sequence, Union
 from models.model_element import ElementModel
 from models.model_group import GroupModel
 from schemas.schema_group import GroupBase, GroupSchema
-from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy import delete, func, insert, or_, select, update
 from sqlalchemy.exc import IntegrityError, InvalidRequestError, ProgrammingError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload, subqueryload
@@ -163,6 +163,33 @@ class CRUDGroup:
         ).all()
         return list(result)
 
+    @staticmethod
+    async def get_groups_with_elements(
+        session: AsyncSession,
+        group_names: list[str] | None = None,
+        tmo_id: int | None = None,
+    ) -> list[GroupModel]:
+        """Groups with given names and groups of TMO in one query."""
+        conditions = []
+        if group_names:
+            conditions.append(GroupModel.group_name.in_(group_names))
+        if tmo_id is not None:
+            conditions.append(GroupModel.tmo_id == tmo_id)
+        if not conditions:
+            return []
+        stmt = (
+            select(GroupModel)
+            .where(or_(*conditions))
+            .options(
+                selectinload(GroupModel.elements),
+                joinedload(GroupModel.group_type),
+            )
+        )
+        result: Sequence[GroupModel] = (
+            await session.scalars(statement=stmt)
+        ).all()
+        return list(result)
+
     @staticmethod
     async def get_all_group(
         session: AsyncSession, limit: int = 15, offset: int = 0
@@ -35,6 +35,8 @@ class ElementService:
     async def add_elements(
         self, group: GroupSchema, input_elements: set[int] | None = None
     ) -> list[ElementResponse]:
+        if group.group_type_id == 2:
+            return await self._add_processes(group, input_elements)
         try:
             if group.group_type_id == 1:
                 statistic_data: tuple[
@@ -42,18 +44,6 @@ class ElementService:
                 ] = await self.app.store.grpc.inventory_get_info(
                     current_group=group, mo_ids=list(input_elements)
                 )
-            # Get information about process from Search MS for group
-            elif group.group_type_id == 2:
-                all_elements = []
-                if group.elements:
-                    all_elements += [el.entity_id for el in group.elements]
-                if input_elements:
-                    all_elements += list(input_elements)
-                statistic_data: tuple[
-                    list[BaseModel], list, list[BaseModel]
-                ] = await self.app.store.grpc.get_severity_processes(
-                    group_schema=group, mo_ids=all_elements
-                )
             else:
                 raise ValueError("Incorrect group type.")
         except RuntimeError as ex:
@@ -72,12 +62,7 @@ class ElementService:
         #     session=self.session, group_id=group.id
         # )
         # Remove elements from input if they existed in current group
-        if group.elements:
-            ids_to_add: set[int] = input_elements - set(
-                el.entity_id for el in group.elements
-            )
-        else:
-            ids_to_add = input_elements
+        ids_to_add = self._ids_to_add(group, input_elements)
         if ids_to_add and (
             len(group.elements) + len(ids_to_add) > (group.min_qnt or 0)
         ):
@@ -97,6 +82,49 @@ class ElementService:
             return element_response
         return []
 
+    async def _add_processes(
+        self, group: GroupSchema, input_elements: set[int] | None
+    ) -> list[ElementResponse]:
+        """Processes of all elements of group are read from Search and
+        written to Redis as they are received, only their ids are kept."""
+        all_elements = []
+        if group.elements:
+            all_elements += [el.entity_id for el in group.elements]
+        if input_elements:
+            all_elements += list(input_elements)
+        processes = self.app.store.grpc.stream_severity_processes(
+            group_schema=group, mo_ids=all_elements
+        )
+        try:
+            statistic = await self.app.store.redis.set_process_statistic(
+                group_schema=group, processes=processes
+            )
+        except RuntimeError as ex:
+            self.logger.error("Cannot get data from external service.")
+            raise ex
+        except ValueError as ex:
+            self.logger.exception(ex)
+            raise ex
+        ids_to_add = self._ids_to_add(
+            group, input_elements or set(processes.ids)
+        )
+        if ids_to_add and (
+            len(group.elements) + len(ids_to_add) > (group.min_qnt or 0)
+        ):
+            return await self._update_info_about_group(
+                new_ids=ids_to_add,
+                is_valid=processes.missing_fields,
+                group=group,
+                statistic=statistic,
+            )
+        return []
+
+    @staticmethod
+    def _ids_to_add(group: GroupSchema, input_elements: set[int]) -> set[int]:
+        if group.elements:
+            return input_elements - set(el.entity_id for el in group.elements)
+        return input_elements
+
     async def _update_info_about_group(
         self,
         new_ids: set[int],
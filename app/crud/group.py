@@ -64,6 +64,7 @@ class GroupService:
                 tmo_id=group_info.tmo_id,
                 column_filters=group_info.columnFilters,
                 is_aggregate=group_info.is_aggregate,
+                is_approximate=group_info.is_approximate,
                 min_qnt=group_info.min_qnt,
             )
             new_group: GroupSchema = (
@@ -172,9 +173,14 @@ class GroupService:
                     action="group_statistic:delete",
                 )
             # Remove statistics from Redis
-            await self.app.store.redis.remove_groups(
+            purge_report = await self.app.store.redis.purge_groups(
                 group_names=[cur.group_name for cur in existed_group]
             )
+            self.logger.info(
+                "Removed %d statistic keys for %d groups.",
+                sum(purge_report.values()),
+                len(purge_report),
+            )
             # Send message to kafka group
             for current_group_to_del in deleted_group:
                 # if current_group.elements:
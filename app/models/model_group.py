@@ -43,6 +43,11 @@ class GroupModel(Base):
     )
     min_qnt: Mapped[int] = mapped_column(nullable=True)
     is_aggregate: Mapped[bool] = mapped_column(default=True, server_default="t")
+    # Statistic is built from a bounded random sample of elements, averages
+    # and other values are calculated over the sample only
+    is_approximate: Mapped[bool] = mapped_column(
+        default=False, server_default="f"
+    )
 
     def __str__(self):
         return f"{self.__class__.__name__}({self.id=}, {self.group_name=}, {self.tmo_id=})"
@@ -66,6 +71,7 @@ class GroupModel(Base):
             column_filters=self.column_filters,
             ranges_object=self.ranges_object,
             is_aggregate=self.is_aggregate,
+            is_approximate=self.is_approximate,
             min_qnt=self.min_qnt,
             group_template_id=self.group_template_id,
             elements=schema_elements,
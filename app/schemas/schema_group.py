@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Annotated, Any, Hashable, TypeVar
 
-from pydantic import AfterValidator, BaseModel
+from pydantic import AfterValidator, BaseModel, model_validator
 from pydantic_core import PydanticCustomError
 
 from schemas.schema_element import ElementSchema
@@ -33,6 +33,7 @@ class InputGroupFromUser(BaseModel):
     columnFilters: list[dict[str, Any]] | None = None
     ranges_object: dict | None = None
     is_aggregate: bool = False
+    is_approximate: bool = False
     min_qnt: int | None = None
     group_template_id: int | None = None
 
@@ -46,6 +47,7 @@ class GroupBase(BaseModel):
     column_filters: list[dict[str, Any]] | None = None
     ranges_object: dict | None = None
     is_aggregate: bool | None = None
+    is_approximate: bool | None = None
     min_qnt: int | None = None
     group_template_id: int | None = None
 
@@ -102,3 +104,16 @@ class GroupResponse(BaseModel):
 
 class GroupSchemaDelete(BaseModel):
     group_ids: UniqueList[int]
+
+
+class GroupStatisticRequest(BaseModel):
+    group_names: UniqueList[str] = []
+    tmo_id: int | None = None
+
+    @model_validator(mode="after")
+    def check_filter(self) -> "GroupStatisticRequest":
+        if not self.group_names and self.tmo_id is None:
+            raise PydanticCustomError(
+                "empty_filter", "group_names or tmo_id must be set"
+            )
+        return self
@@ -21,6 +21,8 @@ class Store:
         from .redis.accessor import RedisAccessor
 
         self.group_scheme: dict = {}
+        # Field metadata of group_scheme models, see StatisticDescriptor
+        self.group_descriptors: dict = {}
         # self.grouped_elements: set[int] = set()
         self.grpc = GRPCAccessor(app=app)
         self.grpc_server = GRPCServer(app=app)
@@ -3,7 +3,7 @@ import json
 import pickle
 from datetime import date, datetime
 from logging import getLogger
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, AsyncIterator, Union
 
 import grpc
 from base.base_accessor import BaseAccessor
@@ -20,6 +20,7 @@ from schemas.schema_group import (
 )
 from schemas.schema_group_template import GroupTemplateMain
 
+from store.grpc.descriptor import StatisticDescriptor
 from store.grpc.protobuf import (
     from_group_to_search_pb2,
     from_group_to_search_pb2_grpc,
@@ -53,6 +54,33 @@ mapping_sql_python: dict = {
 }
 
 
+class SeverityProcesses:
+    """Rows of processes of group streamed from Search. While rows are
+    consumed only their ids and the last row are kept."""
+
+    def __init__(
+        self, rows: AsyncIterator[dict], descriptor: StatisticDescriptor
+    ):
+        self._rows = rows
+        self._descriptor = descriptor
+        self._last_row: dict | None = None
+        self.ids: list[int] = []
+
+    async def __aiter__(self) -> AsyncIterator[dict]:
+        async for row in self._rows:
+            self.ids.append(row["id"])
+            self._last_row = row
+            yield row
+
+    @property
+    def missing_fields(self) -> set[str]:
+        """Fields of model missing in the last row, like validity of
+        get_severity_processes."""
+        if self._last_row is None:
+            return set()
+        return self._descriptor.missing_fields(self._last_row)
+
+
 class GRPCAccessor(BaseAccessor):
     def __init__(self, app: "Application", *args, **kwargs):
         super().__init__(app, *args, **kwargs)
@@ -455,6 +483,7 @@ class GRPCAccessor(BaseAccessor):
         group_statistic_fields.setdefault("Camunda", (camunda_model, None))
         group_statistic_fields.setdefault("groupName", (str, None))
         group_statistic = create_model(f"{tmo_id}", **group_statistic_fields)
+        self.app.store.group_descriptors.pop(f"{tmo_id}", None)
         if self.app.store.group_scheme.get(f"{tmo_id}", None):
             self.app.store.group_scheme[f"{tmo_id}"] = group_statistic
         else:
@@ -558,6 +587,69 @@ class GRPCAccessor(BaseAccessor):
     ):
         statistic = list()
         valid_statistic = set()
+        self._set_severity_filters(group_schema=group_schema, mo_ids=mo_ids)
+        result = [row async for row in self._iter_processes(group_schema)]
+        if len(result) > (group_schema.min_qnt or 0):
+            statistic, valid_statistic = self._create_statistic_from_data(
+                data=result, group=group_schema
+            )
+        return statistic, valid_statistic
+
+    async def stream_severity_rows(
+        self, group_schema: GroupBase, mo_ids: list = None
+    ) -> AsyncIterator[dict]:
+        """Rows of processes as they are received from Search. Like
+        get_severity_processes yields nothing for group with not more than
+        min_qnt processes."""
+        self._set_severity_filters(group_schema=group_schema, mo_ids=mo_ids)
+        min_qnt = group_schema.min_qnt or 0
+        # Rows are kept until group is known to be big enough
+        buffered: list[dict] | None = []
+        async for row in self._iter_processes(group_schema):
+            if buffered is None:
+                yield row
+                continue
+            buffered.append(row)
+            if len(buffered) > min_qnt:
+                for buffered_row in buffered:
+                    yield buffered_row
+                buffered = None
+
+    def stream_severity_processes(
+        self, group_schema: GroupBase, mo_ids: list = None
+    ) -> SeverityProcesses:
+        """Rows of stream_severity_rows which keep ids of processes and
+        validity of statistic once consumed."""
+        return SeverityProcesses(
+            self.stream_severity_rows(group_schema, mo_ids),
+            self.statistic_descriptor(group_schema.tmo_id),
+        )
+
+    async def stream_severity_statistic(
+        self, group_schema: GroupBase, mo_ids: list = None
+    ) -> AsyncIterator[BaseModel]:
+        """Statistic of processes converted in batches as rows are received
+        from Search, so group is never kept in memory."""
+        # Batch matches chunk of records written to Redis
+        batch_size = self.app.config.redis.ingest_chunk_size
+        batch: list[dict] = []
+        async for row in self.stream_severity_rows(group_schema, mo_ids):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                statistic, _ = self._create_statistic_from_data(
+                    data=batch, group=group_schema
+                )
+                batch = []
+                for record in statistic:
+                    yield record
+        statistic, _ = self._create_statistic_from_data(
+            data=batch, group=group_schema
+        )
+        for record in statistic:
+            yield record
+
+    @staticmethod
+    def _set_severity_filters(group_schema: GroupBase, mo_ids: list | None):
         if group_schema.column_filters:
             group_schema.column_filters = GRPCAccessor._update_query_filter(
                 group_schema.column_filters
@@ -575,38 +667,79 @@ class GRPCAccessor(BaseAccessor):
                     ],
                 }
             ]
+
+    async def _iter_processes(
+        self, group_schema: GroupBase
+    ) -> AsyncIterator[dict]:
+        """Processes of group from Search in order. First page is streamed
+        as it is received."""
         stub = from_group_to_search_pb2_grpc.GroupSearchStub(
             self.channel_search
         )
-        limit = 10_000
-        offset = 0
-        result = []
-        while offset <= len(result) + 1:
-            msg = from_group_to_search_pb2.RequestGetProcesses(
-                tmo_id=group_schema.tmo_id,
-                filters_list=json.dumps(group_schema.column_filters)
-                if group_schema.column_filters
-                else None,
-                ranges_object=json.dumps(group_schema.ranges_object)
-                if group_schema.ranges_object
-                else None,
-                with_groups=False,
-                limit=json.dumps({"limit": limit, "offset": offset}),
+        limit = self.app.config.grpc.SEARCH_PAGE_SIZE
+        concurrency = self.app.config.grpc.SEARCH_PAGE_CONCURRENCY
+        # Search does not return total count. Most groups fit in the first
+        # page, next pages are requested in batches of concurrent requests
+        # until a page is not full.
+        received = 0
+        async for row in self._stream_processes_page(
+            stub=stub, group_schema=group_schema, offset=0, limit=limit
+        ):
+            received += 1
+            yield row
+        offset = limit
+        has_next_page = received == limit
+        while has_next_page:
+            pages = await asyncio.gather(
+                *(
+                    self._get_processes_page(
+                        stub=stub,
+                        group_schema=group_schema,
+                        offset=offset + i * limit,
+                        limit=limit,
+                    )
+                    for i in range(concurrency)
+                )
             )
-            offset += limit
-            try:
-                async for response in stub.GetProcesses(msg):
-                    entity = json.loads(response.mo)
-                    result.append(entity)
-            except grpc.aio.AioRpcError as ex:
-                self.logger.exception(ex)
-                self.logger.warning("Current message to gRPC: %s", msg)
-                raise ValueError(ex.details())
-        if len(result) > (group_schema.min_qnt or 0):
-            statistic, valid_statistic = self._create_statistic_from_data(
-                data=result, group=group_schema
+            offset += concurrency * limit
+            for page in pages:
+                for row in page:
+                    yield row
+                if len(page) < limit:
+                    has_next_page = False
+                    break
+
+    async def _get_processes_page(
+        self, stub, group_schema: GroupBase, offset: int, limit: int
+    ) -> list[dict]:
+        return [
+            row
+            async for row in self._stream_processes_page(
+                stub=stub, group_schema=group_schema, offset=offset, limit=limit
             )
-        return statistic, valid_statistic
+        ]
+
+    async def _stream_processes_page(
+        self, stub, group_schema: GroupBase, offset: int, limit: int
+    ) -> AsyncIterator[dict]:
+        msg = from_group_to_search_pb2.RequestGetProcesses(
+            tmo_id=group_schema.tmo_id,
+            filters_list=json.dumps(group_schema.column_filters)
+            if group_schema.column_filters
+            else None,
+            ranges_object=json.dumps(group_schema.ranges_object)
+            if group_schema.ranges_object
+            else None,
+            with_groups=False,
+            limit=json.dumps({"limit": limit, "offset": offset}),
+        )
+        try:
+            async for response in stub.GetProcesses(msg):
+                yield json.loads(response.mo)
+        except grpc.aio.AioRpcError as ex:
+            self.logger.exception(ex)
+            self.logger.warning("Current message to gRPC: %s", msg)
+            raise ValueError(ex.details())
 
     @staticmethod
     def _update_query_filter(query: list) -> list:
@@ -625,46 +758,11 @@ class GRPCAccessor(BaseAccessor):
             )
         return query
 
-    def _create_statistic_from_data(
-        self, data: list, group: GroupBase
-    ) -> (list, set):
-        statistic: list[BaseModel] = list()
-        valid_statistic = set()
-        for el in data:
-            set_fields_from_data = set([k for k, _ in el.items()])
-            data_for_new_statistic = {
-                "Camunda": el,
-                "TPRM": el,
-                "TMO": {"tmo_id": el["tmo_id"]},
-                "MO": el,
-                "groupName": group.group_name,
-            }
-            set_fields_from_model = set()
-            exclude_fields = {
-                "geometry",
-                "groupName",
-                "latitude",
-                "longitude",
-                "model",
-                "p_id",
-                "point_a_id",
-                "point_b_id",
-                "pov",
-                "status",
-                "version",
-            }
+    def statistic_descriptor(self, tmo_id: int) -> StatisticDescriptor:
+        descriptor = self.app.store.group_descriptors.get(f"{tmo_id}")
+        if descriptor is None:
             try:
-                for k, v in self.app.store.group_scheme[
-                    f"{group.tmo_id}"
-                ].model_fields.items():
-                    if v.annotation is str:
-                        set_fields_from_model.add(k)
-                    elif k in ["MO", "Camunda", "TPRM"]:
-                        for (
-                            inner_k,
-                            inner_v,
-                        ) in v.annotation.model_fields.items():
-                            set_fields_from_model.add(inner_k)
+                model = self.app.store.group_scheme[f"{tmo_id}"]
             except KeyError as ex:
                 self.logger.warning(
                     "Group Scheme: %s", self.app.store.group_scheme
@@ -673,15 +771,22 @@ class GRPCAccessor(BaseAccessor):
                     "Can't find model for tmo with id: %s. Check auto model generation",
                     ex.args[0],
                 )
+                raise
+            descriptor = StatisticDescriptor(model)
+            self.app.store.group_descriptors[f"{tmo_id}"] = descriptor
+        return descriptor
 
-            set_fields_from_model -= exclude_fields
-            valid_statistic = set_fields_from_model - set_fields_from_data
-
-            statistic.append(
-                self.app.store.group_scheme[f"{group.tmo_id}"](
-                    **data_for_new_statistic
-                )
-            )
+    def _create_statistic_from_data(
+        self, data: list, group: GroupBase
+    ) -> (list, set):
+        if not data:
+            return [], set()
+        descriptor = self.statistic_descriptor(group.tmo_id)
+        statistic: list[BaseModel] = descriptor.validate_many(
+            data, group.group_name
+        )
+        # Fields of model missing in the last row
+        valid_statistic = descriptor.missing_fields(data[-1])
         return statistic, valid_statistic
 
 
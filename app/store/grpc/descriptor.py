@@ -0,0 +1,162 @@
+from functools import lru_cache
+
+from pydantic import BaseModel, TypeAdapter, create_model
+from typing_extensions import TypedDict
+
+# Fields of statistic model which are never expected in Search rows
+EXCLUDED_FIELDS = frozenset(
+    {
+        "geometry",
+        "groupName",
+        "latitude",
+        "longitude",
+        "model",
+        "p_id",
+        "point_a_id",
+        "point_b_id",
+        "pov",
+        "status",
+        "version",
+    }
+)
+NESTED_MODELS = ("MO", "Camunda", "TPRM")
+
+
+def _model_spec(model: type[BaseModel]) -> tuple:
+    """Hashable description of model fields, nested models included.
+    Generated models can't be pickled, they are sent to other processes
+    as spec."""
+    fields = []
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            annotation = _model_spec(annotation)
+        fields.append((name, annotation, field.default))
+    return model.__name__, tuple(fields)
+
+
+def _spec_model(spec: tuple) -> type[BaseModel]:
+    name, fields = spec
+    return create_model(
+        name,
+        **{
+            field: (
+                _spec_model(annotation)
+                if isinstance(annotation, tuple)
+                else annotation,
+                default,
+            )
+            for field, annotation, default in fields
+        },
+    )
+
+
+def _fields_dict(
+    model: type[BaseModel], names: tuple[str, ...] | None = None
+) -> type:
+    """TypedDict of fields of model, keys missing in input are not added."""
+    return TypedDict(
+        model.__name__,
+        {
+            name: field.annotation
+            for name, field in model.model_fields.items()
+            if names is None or name in names
+        },
+        total=False,
+    )
+
+
+@lru_cache(maxsize=64)
+def _descriptor_from_spec(spec: tuple) -> "StatisticDescriptor":
+    return StatisticDescriptor(_spec_model(spec))
+
+
+class StatisticDescriptor:
+    """Field metadata of generated statistic model of one TMO.
+
+    Built once per model, so conversion of Search rows does only per row
+    work. Must be dropped when model of TMO is generated again.
+    Pickled descriptor is rebuilt once per process from model spec."""
+
+    __slots__ = (
+        "model",
+        "string_fields",
+        "fields",
+        "_adapter",
+        "_dict_adapter",
+        "_spec",
+    )
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+        self.string_fields: list[str] = []
+        fields = set()
+        for name, field in model.model_fields.items():
+            if field.annotation is str:
+                self.string_fields.append(name)
+                fields.add(name)
+            elif name in NESTED_MODELS:
+                fields.update(field.annotation.model_fields)
+        self.fields = frozenset(fields - EXCLUDED_FIELDS)
+        self._adapter = TypeAdapter(list[model])
+        self._dict_adapter: TypeAdapter | None = None
+        self._spec: tuple | None = None
+
+    def __reduce__(self):
+        if self._spec is None:
+            self._spec = _model_spec(self.model)
+        return _descriptor_from_spec, (self._spec,)
+
+    def validate_many(
+        self, rows: list[dict], group_name: str
+    ) -> list[BaseModel]:
+        """Statistic records of Search rows. All rows are validated with
+        one call, which is faster than validation of every record."""
+        return self._adapter.validate_python(
+            [
+                {
+                    "Camunda": row,
+                    "TPRM": row,
+                    "TMO": {"tmo_id": row["tmo_id"]},
+                    "MO": row,
+                    "groupName": group_name,
+                }
+                for row in rows
+            ]
+        )
+
+    def validate_dicts(self, rows: list[dict]) -> list[dict]:
+        """Statistic records of Search rows as dicts, like dumps of
+        validate_many records without fields missing in rows. Only tmo_id of
+        TMO and fields present in rows are validated, models are not
+        built."""
+        if self._dict_adapter is None:
+            self._dict_adapter = TypeAdapter(list[self._record_dict()])
+        return self._dict_adapter.validate_python(
+            [
+                {
+                    "TMO": {"tmo_id": row["tmo_id"]},
+                    "MO": row,
+                    "TPRM": row,
+                    "Camunda": row,
+                }
+                for row in rows
+            ]
+        )
+
+    def _record_dict(self) -> type:
+        fields = self.model.model_fields
+        return TypedDict(
+            self.model.__name__,
+            {
+                "TMO": _fields_dict(fields["TMO"].annotation, ("tmo_id",)),
+                **{
+                    name: _fields_dict(fields[name].annotation)
+                    for name in NESTED_MODELS
+                },
+            },
+        )
+
+    def missing_fields(self, row: dict) -> set[str]:
+        """Fields of model which are not present in row."""
+        return set(self.fields.difference(row))
@@ -14,15 +14,15 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10grpc_group.proto\x12\ngrpc_group\"I\n\x0fGroupInfoCreate\x12\x12\n\ngroup_name\x18\x01 \x01(\t\x12\x12\n\ngroup_type\x18\x02 \x01(\t\x12\x0e\n\x06tmo_id\x18\x03 \x01(\x05\"1\n\x08\x45lements\x12\x12\n\ngroup_name\x18\x01 \x01(\t\x12\x11\n\tentity_id\x18\x02 \x03(\x05\"E\n\x12RequestCreateGroup\x12/\n\ngroup_info\x18\x01 \x03(\x0b\x32\x1b.grpc_group.GroupInfoCreate\"*\n\x14RequestListGroupName\x12\x12\n\ngroup_name\x18\x01 \x03(\t\"?\n\x12RequestGroupByType\x12)\n\ngroup_type\x18\x01 \x01(\x0e\x32\x15.grpc_group.GroupType\"\'\n\x13ResponseGroupStatus\x12\x10\n\x08response\x18\x01 \x01(\x08\"9\n\x0fRequestElements\x12&\n\x08\x65lements\x18\x01 \x03(\x0b\x32\x14.grpc_group.Elements\"+\n\x15ResponseListGroupName\x12\x12\n\ngroup_name\x18\x01 \x03(\t\":\n\x10ResponseElements\x12&\n\x08\x65lements\x18\x01 \x03(\x0b\x32\x14.grpc_group.Elements\")\n\x17RequestListGroupByTMOID\x12\x0e\n\x06tmo_id\x18\x01 \x01(\x03\"/\n\x18ResponseListGroupByTMOID\x12\x13\n\x0bgroup_names\x18\x01 \x03(\t\"4\n\x1eRequestListMOIdsInSpecialGroup\x12\x12\n\ngroup_name\x18\x01 \x01(\t\"5\n\x1fResponseListMOIdsInSpecialGroup\x12\x12\n\nentity_ids\x18\x01 \x03(\x03\".\n\x18RequestGetGroupStatistic\x12\x12\n\ngroup_name\x18\x01 \x01(\t\"4\n\x19ResponseGetGroupStatistic\x12\x17\n\x0fgroup_statistic\x18\x01 \x01(\t*0\n\tGroupType\x12\x10\n\x0cobject_group\x10\x00\x12\x11\n\rprocess_group\x10\x01\x32\xae\x07\n\x05Group\x12Q\n\x0c\x43reateGroups\x12\x1e.grpc_group.RequestCreateGroup\x1a\x1f.grpc_group.ResponseGroupStatus\"\x00\x12S\n\x0c\x44\x65leteGroups\x12 .grpc_group.RequestListGroupName\x1a\x1f.grpc_group.ResponseGroupStatus\"\x00\x12T\n\x12\x41\x64\x64\x45lementsToGroup\x12\x1b.grpc_group.RequestElements\x1a\x1f.grpc_group.ResponseGroupStatus\"\x00\x12Y\n\x17RemoveElementsFromGroup\x12\x1b.grpc_group.RequestElements\x1a\x1f.grpc_group.ResponseGroupStatus\"\x00\x12U\n\x0c\x45xistedGroup\x12 .grpc_group.RequestListGroupName\x1a!.grpc_group.ResponseListGroupName\"\x00\x12\\\n\x15ListGroupWithElements\x12\x1e.grpc_group.RequestGroupByType\x1a!.grpc_group.ResponseListGroupName\"\x00\x12X\n\x14ListElementsInGroups\x12 .grpc_group.RequestListGroupName\x1a\x1c.grpc_group.ResponseElements\"\x00\x12\x61\n\x10ListGroupByTMOID\x12#.grpc_group.RequestListGroupByTMOID\x1a$.grpc_group.ResponseListGroupByTMOID\"\x00\x30\x01\x12v\n\x17ListMOIdsInSpecialGroup\x12*.grpc_group.RequestListMOIdsInSpecialGroup\x1a+.grpc_group.ResponseListMOIdsInSpecialGroup\"\x00\x30\x01\x12\x62\n\x11GetGroupStatistic\x12$.grpc_group.RequestGetGroupStatistic\x1a%.grpc_group.ResponseGetGroupStatistic\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x10grpc_group.proto\x12\ngrpc_group\"I\n\x0fGroupInfoCreate\x12\x12\n\ngroup_name\x18\x01 \x01(\t\x12\x12\n\ngroup_type\x18\x02 \x01(\t\x12\x0e\n\x06tmo_id\x18\x03 \x01(\x05\"1\n\x08\x45lements\x12\x12\n\ngroup_name\x18\x01 \x01(\t\x12\x11\n\tentity_id\x18\x02 \x03(\x05\"E\n\x12RequestCreateGroup\x12/\n\ngroup_info\x18\x01 \x03(\x0b\x32\x1b.grpc_group.GroupInfoCreate\"*\n\x14RequestListGroupName\x12\x12\n\ngroup_name\x18\x01 \x03(\t\"?\n\x12RequestGroupByType\x12)\n\ngroup_type\x18\x01 \x01(\x0e\x32\x15.grpc_group.GroupType\"\'\n\x13ResponseGroupStatus\x12\x10\n\x08response\x18\x01 \x01(\x08\"9\n\x0fRequestElements\x12&\n\x08\x65lements\x18\x01 \x03(\x0b\x32\x14.grpc_group.Elements\"+\n\x15ResponseListGroupName\x12\x12\n\ngroup_name\x18\x01 \x03(\t\":\n\x10ResponseElements\x12&\n\x08\x65lements\x18\x01 \x03(\x0b\x32\x14.grpc_group.Elements\")\n\x17RequestListGroupByTMOID\x12\x0e\n\x06tmo_id\x18\x01 \x01(\x03\"/\n\x18ResponseListGroupByTMOID\x12\x13\n\x0bgroup_names\x18\x01 \x03(\t\"4\n\x1eRequestListMOIdsInSpecialGroup\x12\x12\n\ngroup_name\x18\x01 \x01(\t\"5\n\x1fResponseListMOIdsInSpecialGroup\x12\x12\n\nentity_ids\x18\x01 \x03(\x03\".\n\x18RequestGetGroupStatistic\x12\x12\n\ngroup_name\x18\x01 \x01(\t\"4\n\x19ResponseGetGroupStatistic\x12\x17\n\x0fgroup_statistic\x18\x01 \x01(\t\"P\n\x19RequestGetGroupsStatistic\x12\x13\n\x0bgroup_names\x18\x01 \x03(\t\x12\x13\n\x06tmo_id\x18\x02 \x01(\x03H\x00\x88\x01\x01\x42\t\n\x07_tmo_id\"I\n\x1aResponseGetGroupsStatistic\x12\x12\n\ngroup_name\x18\x01 \x01(\t\x12\x17\n\x0fgroup_statistic\x18\x02 \x01(\t*0\n\tGroupType\x12\x10\n\x0cobject_group\x10\x00\x12\x11\n\rprocess_group\x10\x01\x32\x97\x08\n\x05Group\x12Q\n\x0c\x43reateGroups\x12\x1e.grpc_group.RequestCreateGroup\x1a\x1f.grpc_group.ResponseGroupStatus\"\x00\x12S\n\x0c\x44\x65leteGroups\x12 .grpc_group.RequestListGroupName\x1a\x1f.grpc_group.ResponseGroupStatus\"\x00\x12T\n\x12\x41\x64\x64\x45lementsToGroup\x12\x1b.grpc_group.RequestElements\x1a\x1f.grpc_group.ResponseGroupStatus\"\x00\x12Y\n\x17RemoveElementsFromGroup\x12\x1b.grpc_group.RequestElements\x1a\x1f.grpc_group.ResponseGroupStatus\"\x00\x12U\n\x0c\x45xistedGroup\x12 .grpc_group.RequestListGroupName\x1a!.grpc_group.ResponseListGroupName\"\x00\x12\\\n\x15ListGroupWithElements\x12\x1e.grpc_group.RequestGroupByType\x1a!.grpc_group.ResponseListGroupName\"\x00\x12X\n\x14ListElementsInGroups\x12 .grpc_group.RequestListGroupName\x1a\x1c.grpc_group.ResponseElements\"\x00\x12\x61\n\x10ListGroupByTMOID\x12#.grpc_group.RequestListGroupByTMOID\x1a$.grpc_group.ResponseListGroupByTMOID\"\x00\x30\x01\x12v\n\x17ListMOIdsInSpecialGroup\x12*.grpc_group.RequestListMOIdsInSpecialGroup\x1a+.grpc_group.ResponseListMOIdsInSpecialGroup\"\x00\x30\x01\x12\x62\n\x11GetGroupStatistic\x12$.grpc_group.RequestGetGroupStatistic\x1a%.grpc_group.ResponseGetGroupStatistic\"\x00\x12g\n\x12GetGroupsStatistic\x12%.grpc_group.RequestGetGroupsStatistic\x1a&.grpc_group.ResponseGetGroupsStatistic\"\x00\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'grpc_group_pb2', _globals)
 if _descriptor._USE_C_DESCRIPTORS == False:
   DESCRIPTOR._options = None
-  _globals['_GROUPTYPE']._serialized_start=846
-  _globals['_GROUPTYPE']._serialized_end=894
+  _globals['_GROUPTYPE']._serialized_start=1003
+  _globals['_GROUPTYPE']._serialized_end=1051
   _globals['_GROUPINFOCREATE']._serialized_start=32
   _globals['_GROUPINFOCREATE']._serialized_end=105
   _globals['_ELEMENTS']._serialized_start=107
@@ -53,6 +53,10 @@ if _descriptor._USE_C_DESCRIPTORS == False:
   _globals['_REQUESTGETGROUPSTATISTIC']._serialized_end=790
   _globals['_RESPONSEGETGROUPSTATISTIC']._serialized_start=792
   _globals['_RESPONSEGETGROUPSTATISTIC']._serialized_end=844
-  _globals['_GROUP']._serialized_start=897
-  _globals['_GROUP']._serialized_end=1839
+  _globals['_REQUESTGETGROUPSSTATISTIC']._serialized_start=846
+  _globals['_REQUESTGETGROUPSSTATISTIC']._serialized_end=926
+  _globals['_RESPONSEGETGROUPSSTATISTIC']._serialized_start=928
+  _globals['_RESPONSEGETGROUPSSTATISTIC']._serialized_end=1001
+  _globals['_GROUP']._serialized_start=1054
+  _globals['_GROUP']._serialized_end=2101
 # @@protoc_insertion_point(module_scope)
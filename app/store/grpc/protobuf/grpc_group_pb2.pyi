@@ -108,3 +108,19 @@ class ResponseGetGroupStatistic(_message.Message):
     GROUP_STATISTIC_FIELD_NUMBER: _ClassVar[int]
     group_statistic: str
     def __init__(self, group_statistic: _Optional[str] = ...) -> None: ...
+
+class RequestGetGroupsStatistic(_message.Message):
+    __slots__ = ("group_names", "tmo_id")
+    GROUP_NAMES_FIELD_NUMBER: _ClassVar[int]
+    TMO_ID_FIELD_NUMBER: _ClassVar[int]
+    group_names: _containers.RepeatedScalarFieldContainer[str]
+    tmo_id: int
+    def __init__(self, group_names: _Optional[_Iterable[str]] = ..., tmo_id: _Optional[int] = ...) -> None: ...
+
+class ResponseGetGroupsStatistic(_message.Message):
+    __slots__ = ("group_name", "group_statistic")
+    GROUP_NAME_FIELD_NUMBER: _ClassVar[int]
+    GROUP_STATISTIC_FIELD_NUMBER: _ClassVar[int]
+    group_name: str
+    group_statistic: str
+    def __init__(self, group_name: _Optional[str] = ..., group_statistic: _Optional[str] = ...) -> None: ...
@@ -64,6 +64,11 @@ class GroupStub(object):
                 request_serializer=grpc__group__pb2.RequestGetGroupStatistic.SerializeToString,
                 response_deserializer=grpc__group__pb2.ResponseGetGroupStatistic.FromString,
                 )
+        self.GetGroupsStatistic = channel.unary_stream(
+                '/grpc_group.Group/GetGroupsStatistic',
+                request_serializer=grpc__group__pb2.RequestGetGroupsStatistic.SerializeToString,
+                response_deserializer=grpc__group__pb2.ResponseGetGroupsStatistic.FromString,
+                )
 
 
 class GroupServicer(object):
@@ -129,6 +134,12 @@ class GroupServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetGroupsStatistic(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_GroupServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -182,6 +193,11 @@ def add_GroupServicer_to_server(servicer, server):
                     request_deserializer=grpc__group__pb2.RequestGetGroupStatistic.FromString,
                     response_serializer=grpc__group__pb2.ResponseGetGroupStatistic.SerializeToString,
             ),
+            'GetGroupsStatistic': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetGroupsStatistic,
+                    request_deserializer=grpc__group__pb2.RequestGetGroupsStatistic.FromString,
+                    response_serializer=grpc__group__pb2.ResponseGetGroupsStatistic.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'grpc_group.Group', rpc_method_handlers)
@@ -361,3 +377,20 @@ class Group(object):
             grpc__group__pb2.ResponseGetGroupStatistic.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetGroupsStatistic(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/grpc_group.Group/GetGroupsStatistic',
+            grpc__group__pb2.RequestGetGroupsStatistic.SerializeToString,
+            grpc__group__pb2.ResponseGetGroupsStatistic.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
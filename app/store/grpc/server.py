@@ -20,12 +20,14 @@ from .protobuf.grpc_group_pb2 import (
     Elements,
     RequestCreateGroup,
     RequestElements,
+    RequestGetGroupsStatistic,
     RequestGetGroupStatistic,
     RequestGroupByType,
     RequestListGroupByTMOID,
     RequestListGroupName,
     RequestListMOIdsInSpecialGroup,
     ResponseElements,
+    ResponseGetGroupsStatistic,
     ResponseGetGroupStatistic,
     ResponseGroupStatus,
     ResponseListGroupByTMOID,
@@ -561,6 +563,34 @@ class GroupGRPC(grpc_group_pb2_grpc.GroupServicer):
         pickled_data = pickle.dumps(temp_statistic).hex()
         return ResponseGetGroupStatistic(group_statistic=pickled_data)
 
+    async def GetGroupsStatistic(
+        self,
+        request: RequestGetGroupsStatistic,
+        context: grpc.aio.ServicerContext,
+    ) -> AsyncGenerator:
+        """Returns stream of statistic for groups with names or for all
+        groups of TMO"""
+        async with self.app.database.session() as session:
+            group_models = await crud_group.get_groups_with_elements(
+                session=session,
+                group_names=list(request.group_names),
+                tmo_id=request.tmo_id if request.HasField("tmo_id") else None,
+            )
+        try:
+            async for (
+                group_model,
+                statistic,
+            ) in self.app.store.redis.get_statistics(group_models):
+                temp_statistic = statistic.model_dump()
+                temp_statistic["group_type"] = group_model.group_type.name
+                yield ResponseGetGroupsStatistic(
+                    group_name=group_model.group_name,
+                    group_statistic=pickle.dumps(temp_statistic).hex(),
+                )
+        except Exception as ex:
+            self.logger.exception("GetGroupsStatistic Error: %s", ex)
+            await context.abort(grpc.StatusCode.INTERNAL, f"{type(ex)}: {ex}")
+
 
 class GRPCServer(BaseAccessor):
     def __init__(self, app: "Application", *args, **kwargs):
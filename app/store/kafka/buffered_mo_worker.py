@@ -726,16 +726,16 @@ class AutoGroupSubscriber(BufferedMoWorkerSubscriber):
             await self._update_group(existed_group=gr)
 
     async def _update_group(self, existed_group: GroupSchema):
-        # Add elements to group
-        data_for_statistic: tuple[
-            list[BaseModel], bool
-        ] = await self.app.store.grpc.get_severity_processes(
+        # Statistic is written while processes are received from Search,
+        # only ids of processes are kept
+        processes = self.app.store.grpc.stream_severity_processes(
             group_schema=existed_group
         )
-        data_input_elements, is_valid = data_for_statistic
-        list_input_entity_id: list[int] = [
-            el.MO.id for el in data_input_elements
-        ]
+        await self.app.store.redis.set_process_statistic(
+            group_schema=existed_group, processes=processes
+        )
+        is_valid = processes.missing_fields
+        list_input_entity_id: list[int] = processes.ids
         if existed_group.is_valid != is_valid:
             async with self.app.database.session() as session:
                 await crud_group.update_valid_schema(
@@ -790,16 +790,11 @@ class AutoGroupSubscriber(BufferedMoWorkerSubscriber):
                                 description=bool(is_valid),
                             )
                         )
-                    await self.app.store.redis.set_statistic_by_schema(
-                        current_group=existed_group, data=data_input_elements
-                    )
                     # Send message to Kafka about add element
                     group_for_kafka = GroupForKafka(
                         **{
                             "group_name": existed_group.group_name,
-                            "entity_ids": [
-                                el.MO.id for el in data_input_elements
-                            ],
+                            "entity_ids": processes.ids,
                             "group_type": existed_group.group_type.name,
                             "tmo_id": existed_group.tmo_id,
                         }
@@ -852,9 +847,23 @@ class TMOSubscriber(BufferedTmoWorkerSubscriber):
             list_group_names_to_delete = (
                 await group_service.get_group_names_by_tmo_id(tmo_ids=tmo_ids)
             )
-            await group_service.remove_many_by_names_by_schema(
+            deleted_groups = await group_service.remove_many_by_names_by_schema(
                 group_names=list_group_names_to_delete
             )
+            # Statistic of groups which were not removed from DB by service
+            # must not stay in Redis after TMO removal
+            orphan_group_names = set(list_group_names_to_delete) - {
+                group.group_name for group in deleted_groups or []
+            }
+            if orphan_group_names:
+                purge_report = await self.app.store.redis.purge_groups(
+                    group_names=list(orphan_group_names)
+                )
+                self.logger.warning(
+                    "Removed %d statistic keys for %d orphan groups.",
+                    sum(purge_report.values()),
+                    len(purge_report),
+                )
             # await group_service.remove_many_by_tmo(tmo_ids=tmo_ids)
             self.logger.warning("Deleted groups for tmos: %s", tmo_ids)
             await group_template_service.remove_group_template_by_tmo_ids(
@@ -1,33 +1,73 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date, datetime
+from itertools import islice
 from logging import getLogger
-from typing import TYPE_CHECKING, Union
+from multiprocessing import get_context
+from time import monotonic
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+)
 
 import redis.asyncio as redis
 from base.base_accessor import BaseAccessor
 from models.model_group import GroupModel
-from pydantic import BaseModel
-from redis.exceptions import DataError
+from pydantic import BaseModel, ValidationError
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.sentinel import Sentinel
+from redis.crc import key_slot
+from redis.exceptions import DataError, LockError
 from schemas.schema_group import GroupSchema
 from sqlalchemy.exc import MissingGreenlet
 
+from store.grpc.descriptor import StatisticDescriptor
+from store.redis.aggregation import (
+    EMPTY_VALUES,
+    NUMERIC_MAXIMUM_TYPES,
+    StatisticAggregator,
+    decode_maximum,
+    encode_maximum,
+    script_aggregation,
+)
+from store.redis.cache import StatisticCache
+from store.redis.codec import (
+    decode_value,
+    decode_values,
+    encode_number,
+    is_binary,
+)
+from store.redis.ingest import (
+    ChunkSpec,
+    T,
+    build_chunk,
+    dump_records,
+    param_path_and_mapping,
+)
+from store.redis.sampling import ReservoirSampler
+from store.redis.scripts import (
+    AGGREGATE_STATISTIC,
+    DELETE_VALUES,
+    DROP_PLACEHOLDERS,
+    ENCODE_NAMES,
+    REBUILD_AGGREGATES,
+    RENAME_KEYS,
+    SET_VALUES,
+    UPDATE_IF_MEMBER,
+    WRITE_SNAPSHOT,
+)
+
 if TYPE_CHECKING:
     from core.app import Application
 
-
-mapper = {
-    "Count": "frequency",
-    "endDate": "maximum",
-    "id": "maximum",
-    "processInstanceId": "frequency",
-    "processInstanceKey": "frequency",
-    "processVersion": "maximum",
-    "startDate": "maximum",
-    "tmo_id": "frequency",
-    "version": "frequency",
-    "name": "maximum",
-}
-
-T = Union[bool, date, datetime, int, float, str, None]
+# Running aggregates of average with totals of entities out of sample of
+# approximate group
+AVERAGE_FIELDS = ("sum", "count", "rest_sum", "rest_count")
 
 
 class RedisAccessor(BaseAccessor):
@@ -35,11 +75,143 @@ class RedisAccessor(BaseAccessor):
         super().__init__(app, *args, **kwargs)
         self.logger = getLogger("Redis_Accessor")
         self._pool: redis.ConnectionPool | None = None
-        self._redis: redis.Redis | None = None
+        self._redis: redis.Redis | RedisCluster | None = None
+        # Client for statistic reads, None - everything is read from primary
+        self._replica: redis.Redis | None = None
+        # Group name -> time until its statistic is read from primary
+        self._recent_writes: dict[str, float] = {}
+        # In cluster mode group name in keys is a hash tag {<group name>},
+        # so all keys of group are in one slot and per group scripts and
+        # transactions are possible.
+        self.cluster = app.config.redis.cluster
         self.prefix = "GROUP_MS:"
+        # Set of statistic keys per group and group -> index key registry.
+        # Used instead of KEYS GROUP_MS:<group>:* which blocks Redis.
+        # Registry is not kept in cluster mode, one hash would be a hot
+        # spot, index keys are scanned instead.
+        self.index_prefix = "GROUP_MS_INDEX:"
+        self.registry_key = "GROUP_MS_REGISTRY"
+        # TPRM id -> statistic keys of all groups for this TPRM
+        self.tprm_index_prefix = "GROUP_MS_TPRM:"
+        # Running aggregates for every statistic key, see scripts.py
+        self.aggregate_prefix = "GROUP_MS_AGG:"
+        self.counter_prefix = "GROUP_MS_CNT:"
+        self.maximum_prefix = "GROUP_MS_MAX:"
+        # Compact layout GMS:<group id>:<parameter code>. Group ids and
+        # parameter codes ("<statistic>:<type>:<aggregation>:<name>") are
+        # interned in Redis and never reused, so codes and names of ids are
+        # cached forever. Id of group is freed when group is purged, so ids
+        # of group names are always read from Redis.
+        self.compact_prefix = "GMS:"
+        self.compact_companion_prefixes = ("GMS_A:", "GMS_C:", "GMS_M:")
+        # Keys used by one script must share hash tag in cluster mode
+        names_tag = ":{names}" if self.cluster else ""
+        self.group_ids_key = f"GROUP_MS_GROUP_IDS{names_tag}"
+        self.group_names_key = f"GROUP_MS_GROUP_NAMES{names_tag}"
+        self.parameter_codes_key = f"GROUP_MS_PARAM_CODES{names_tag}"
+        self.parameter_names_key = f"GROUP_MS_PARAM_NAMES{names_tag}"
+        self.sequence_key = f"GROUP_MS_SEQ{names_tag}"
+        self.compact_keys = app.config.redis.key_layout == "compact"
+        # Numbers of average and maximum statistics packed by codec.py
+        self.binary_values = app.config.redis.value_codec == "binary"
+        self._group_names: dict[str, str] = {}
+        self._parameter_codes: dict[str, str] = {}
+        self._parameter_names: dict[str, str] = {}
+        # Group name -> version, set from global counter on every write of
+        # group statistic and removed with group. In cluster mode version of
+        # every group is a key GROUP_MS_VERSION:{<group name>}.
+        self.version_key = "GROUP_MS_VERSION"
+        self.version_sequence_key = "GROUP_MS_VERSION_SEQ"
+        # Serialized statistic of group with version it was built for.
+        # Snapshot is dirty when group version differs from its version.
+        self.snapshot_prefix = "GROUP_MS_SNAPSHOT:"
+        self.snapshots = app.config.redis.statistic_snapshots
+        # Entity ids in sample of approximate group
+        self.sample_prefix = "GROUP_MS_SAMPLE:"
+        # Group name -> number of offered entities, kept by previous sampler
+        self.sample_seen_key = "GROUP_MS_SAMPLE_SEEN"
+        self.statistic_cache = StatisticCache(
+            max_size=app.config.redis.statistic_cache_size
+        )
+        # Migration name -> version, applied migrations stored in meta hash
+        self.meta_key = "GROUP_MS_META"
+        self.migration_lock_key = "GROUP_MS_MIGRATION_LOCK"
+        self.migrations = {
+            "group_index": ("1", self.build_group_index),
+            "version_sequence": ("1", self.seed_version_sequence),
+            # Before aggregates, which are built from numeric values
+            "numeric_maximum": ("1", self.build_numeric_maximum),
+            # Runs again when codec is changed
+            "value_codec": (
+                app.config.redis.value_codec,
+                self.build_value_codec,
+            ),
+            "aggregates": ("1", self.build_aggregates),
+            "tprm_index": ("1", self.build_tprm_index),
+            "sample_seen": ("1", self.drop_sample_seen),
+        }
+        # Migrations which rewrite values of statistic keys, they run in
+        # background after start. Keys which are rebuilt are read from their
+        # values meanwhile.
+        self.background_migrations = {
+            "numeric_maximum",
+            "value_codec",
+            "aggregates",
+        }
+        self.migration_retries = 3
+        self._migration_task: asyncio.Task | None = None
+        # Version of keys written before migration existed
+        self.initial_versions = {"value_codec": "text"}
+        # Values of not necessary parameters of non aggregate group are never
+        # read, in compact mode one placeholder field is kept per parameter
+        # instead of "None" for every entity.
+        self.placeholder_field = "*"
+        # Max number of hash fields (keys x entity ids) processed by one
+        # call of delete script
+        self.script_fields = 10_000
+        # Max number of hash fields counted by one call of rebuild script
+        self.rebuild_fields = 1000
+        self.compact_placeholders = (
+            app.config.redis.non_aggregate_storage == "compact"
+        )
+        if self.compact_placeholders:
+            self.migrations["compact_placeholders"] = (
+                "1",
+                self.build_compact_placeholders,
+            )
+        if self.compact_keys:
+            self.migrations["compact_keys"] = ("1", self.build_compact_keys)
+        if self.cluster:
+            self.migrations["cluster_hashes"] = (
+                "1",
+                self.drop_cluster_hashes,
+            )
+        self._set_values_script = None
+        self._delete_values_script = None
+        self._drop_placeholders_script = None
+        self._aggregate_statistic_script = None
+        self._encode_names_script = None
+        self._rename_keys_script = None
+        self._rebuild_aggregates_script = None
+        self._update_if_member_script = None
+        self._write_snapshot_script = None
+        # Chunks of entities are converted and aggregated by executor, so
+        # event loop is not blocked by big groups. None - in event loop.
+        self._executor: Executor | None = None
+        workers = app.config.redis.statistic_workers
+        if app.config.redis.statistic_executor == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="statistic"
+            )
+        elif app.config.redis.statistic_executor == "process":
+            # Workers are spawned, forked child would inherit threads of
+            # gRPC and event loop
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers, mp_context=get_context("spawn")
+            )
 
     @property
-    def redis(self) -> redis.Redis:
+    def redis(self) -> redis.Redis | RedisCluster:
         if self._redis is None:
             raise RuntimeError(
                 "Redis client is not initialized. Call connect() first."
@@ -47,136 +219,250 @@ class RedisAccessor(BaseAccessor):
         return self._redis
 
     async def connect(self, app: "Application"):
-        self._pool = redis.ConnectionPool.from_url(
-            f"redis://{app.config.redis.host}:{app.config.redis.port}",
-            password=app.config.redis.password,
+        if self.cluster:
+            self._redis = RedisCluster(
+                host=app.config.redis.host,
+                port=app.config.redis.port,
+                password=app.config.redis.password or None,
+                decode_responses=True,
+                encoding_errors="surrogateescape",
+                protocol=3,
+            )
+            self._register_scripts()
+            # Scripts called inside cluster pipelines are not loaded on
+            # demand, load them on all primaries
+            for script in self._scripts():
+                await self.redis.script_load(script.script)
+            await self._start_migrations()
+            return
+        config = app.config.redis
+        connection_kwargs = dict(
+            password=config.password or None,
             decode_responses=True,
-        )
-        self._redis = redis.Redis(
-            connection_pool=self._pool,
+            encoding_errors="surrogateescape",
             protocol=3,
         )
+        if config.sentinel_hosts:
+            sentinel = Sentinel(
+                [
+                    (host, int(port))
+                    for host, port in (
+                        address.strip().rsplit(":", 1)
+                        for address in config.sentinel_hosts.split(",")
+                    )
+                ],
+                **connection_kwargs,
+            )
+            self._redis = sentinel.master_for(config.sentinel_service)
+            if config.read_from_replicas:
+                self._replica = sentinel.slave_for(config.sentinel_service)
+        else:
+            self._pool = redis.ConnectionPool.from_url(
+                f"redis://{config.host}:{config.port}",
+                password=config.password,
+                decode_responses=True,
+                encoding_errors="surrogateescape",
+            )
+            self._redis = redis.Redis(
+                connection_pool=self._pool,
+                protocol=3,
+            )
+            if config.read_from_replicas and config.replica_host:
+                self._replica = redis.Redis.from_url(
+                    f"redis://{config.replica_host}:{config.replica_port}",
+                    **connection_kwargs,
+                )
+        self._register_scripts()
+        await self._start_migrations()
 
     async def disconnect(self, app: "Application"):
-        if self._pool and self.redis:
+        if self._migration_task is not None:
+            self._migration_task.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._replica is not None:
+            await self._replica.aclose()
+        if self.cluster and self._redis:
+            await self._redis.aclose()
+        elif self._pool and self.redis:
             await self._pool.disconnect()
+        elif self._redis:
+            await self._redis.aclose()
+
+    def _reader(self, *group_names: str) -> "redis.Redis | RedisCluster":
+        """Client for statistic reads of groups: replica unless one of groups
+        was written by this process recently."""
+        if self._replica is None:
+            return self.redis
+        now = monotonic()
+        for group_name in group_names:
+            if self._recent_writes.get(group_name, 0) > now:
+                return self.redis
+        return self._replica
+
+    def _mark_written(self, *group_names: str) -> None:
+        if self._replica is None:
+            return
+        now = monotonic()
+        if len(self._recent_writes) > 1000:
+            self._recent_writes = {
+                name: until
+                for name, until in self._recent_writes.items()
+                if until > now
+            }
+        until = now + self.app.config.redis.read_your_writes_seconds
+        for group_name in group_names:
+            self._recent_writes[group_name] = until
+
+    def _register_scripts(self) -> None:
+        self._set_values_script = self.redis.register_script(SET_VALUES)
+        self._delete_values_script = self.redis.register_script(DELETE_VALUES)
+        self._drop_placeholders_script = self.redis.register_script(
+            DROP_PLACEHOLDERS
+        )
+        self._aggregate_statistic_script = self.redis.register_script(
+            AGGREGATE_STATISTIC
+        )
+        self._encode_names_script = self.redis.register_script(ENCODE_NAMES)
+        self._rename_keys_script = self.redis.register_script(RENAME_KEYS)
+        self._rebuild_aggregates_script = self.redis.register_script(
+            REBUILD_AGGREGATES
+        )
+        self._update_if_member_script = self.redis.register_script(
+            UPDATE_IF_MEMBER
+        )
+        self._write_snapshot_script = self.redis.register_script(WRITE_SNAPSHOT)
+
+    def _scripts(self) -> tuple:
+        return (
+            self._set_values_script,
+            self._delete_values_script,
+            self._drop_placeholders_script,
+            self._aggregate_statistic_script,
+            self._encode_names_script,
+            self._rename_keys_script,
+            self._rebuild_aggregates_script,
+            self._update_if_member_script,
+            self._write_snapshot_script,
+        )
+
+    def _pipeline(self, transaction: bool = True):
+        """Pipeline which is MULTI/EXEC on single node. Commands of one
+        transaction may touch many slots, so cluster pipelines are never
+        transactional."""
+        return self.redis.pipeline(transaction=transaction and not self.cluster)
 
     async def _create_hset_for_redis(
-        self, data: list[BaseModel], pipe, is_aggregate: bool, group_name: str
-    ) -> dict:
-        raw_data = {}
-        exclude_parameters_name = ["sortValues", "operations", "params"]
-        necessary_params = ["active", "tmo_id"]
-        for entity in data:  # type: BaseModel
-            # TMO, MO, TPRM, Camunda
-            for statistic_name, statistic_value in entity.model_dump(
-                by_alias=True, exclude={"groupName"}
-            ).items():  # type: str, dict
-                for parameter_name, parameter_value in statistic_value.items():
-                    if (
-                        parameter_name not in exclude_parameters_name
-                        and parameter_value
-                    ):
-                        if is_aggregate or parameter_name in necessary_params:
-                            path, mapping = self._redis_param_builder(
-                                group_name=group_name,
-                                statistic_name=statistic_name,
-                                parameter_name=parameter_name,
-                                parameter_value=parameter_value,
-                                entity_id=entity.MO.id,
-                            )
-                        else:
-                            path, mapping = self._redis_param_builder(
-                                group_name=group_name,
-                                statistic_name=statistic_name,
-                                parameter_name=parameter_name,
-                                parameter_value=None,
-                                entity_id=entity.MO.id,
-                            )
-                        await pipe.hset(name=path, mapping=mapping)
-                        data = (
-                            parameter_value
-                            if is_aggregate or parameter_name == "tmo_id"
-                            else None
-                        )
-                        raw_data.setdefault(path, []).append(data)
-                # raw_data.update(await self._create_path_and_mapping(group_name=group_name,
-                #                                                     statistic_name=statistic_name,
-                #                                                     statistic_value=statistic_value,
-                #                                                     is_aggregate=is_aggregate,
-                #                                                     mo_id=entity.MO.id,
-                #                                                     pipe=pipe)
-                #                 )
-                # raw_data.setdefault()
-        return raw_data
-
-    async def _create_path_and_mapping(
         self,
+        data: list,
+        pipe,
+        is_aggregate: bool,
         group_name: str,
-        statistic_name: str,
-        statistic_value: dict,
+        aggregators: dict[str, StatisticAggregator],
+        descriptor: StatisticDescriptor | None = None,
+    ) -> None:
+        """Queue hset of entities into pipe and fold their values into
+        aggregators of statistic paths. Entities are Search rows converted
+        with descriptor or statistic records."""
+        mappings, partial = await self._aggregate_entities(
+            data, is_aggregate, group_name, descriptor
+        )
+        keys = await self._storage_keys(group_name, list(mappings))
+        for path, mapping in mappings.items():
+            await self._set_values(pipe=pipe, path=keys[path], mapping=mapping)
+        await self._register_keys(
+            pipe=pipe, group_name=group_name, paths=keys.values()
+        )
+        self._merge_aggregators(aggregators, partial)
+
+    @staticmethod
+    def _merge_aggregators(
+        aggregators: dict[str, StatisticAggregator],
+        partial: dict[str, StatisticAggregator],
+    ) -> None:
+        for path, aggregator in partial.items():
+            if path in aggregators:
+                aggregators[path].merge(aggregator)
+            else:
+                aggregators[path] = aggregator
+
+    async def _write_rest_totals(
+        self, pipe, group_name: str, rest: dict[str, StatisticAggregator]
+    ) -> None:
+        """Replace totals of entities out of sample in average keys of
+        approximate group. Parameters which no entity of sample has are
+        not kept."""
+        keys = await self._storage_keys(group_name, list(rest))
+        totals = {keys[path]: rest[path] for path in rest if path in keys}
+        for path in await self._get_group_keys(group_name):
+            if self._script_aggregation(path) != "average":
+                continue
+            agg_key, *_ = self._companion_keys(path)
+            aggregator = totals.get(path)
+            if aggregator is None or aggregator.is_empty:
+                await pipe.hdel(agg_key, "rest_sum", "rest_count")
+                continue
+            await pipe.hset(
+                agg_key,
+                mapping={
+                    "rest_sum": repr(aggregator.sum),
+                    "rest_count": aggregator.total - aggregator.empty,
+                },
+            )
+
+    async def _aggregate_entities(
+        self,
+        data: list,
         is_aggregate: bool,
-        mo_id: int,
-        pipe,
-    ) -> dict:
-        exclude_parameters_name = ["sortValues", "operations", "params"]
-        necessary_params = ["active", "tmo_id"]
-        output = {}
-        for parameter_name, parameter_value in statistic_value.items():
-            if (
-                parameter_name not in exclude_parameters_name
-                and parameter_value
-            ):
-                if is_aggregate or parameter_name in necessary_params:
-                    path, mapping = self._redis_param_builder(
-                        group_name=group_name,
-                        statistic_name=statistic_name,
-                        parameter_name=parameter_name,
-                        parameter_value=parameter_value,
-                        entity_id=mo_id,
-                    )
-                else:
-                    path, mapping = self._redis_param_builder(
-                        group_name=group_name,
-                        statistic_name=statistic_name,
-                        parameter_name=parameter_name,
-                        parameter_value=None,
-                        entity_id=mo_id,
-                    )
-                await pipe.hset(name=path, mapping=mapping)
-                data = (
-                    parameter_value
-                    if is_aggregate or parameter_name == "tmo_id"
-                    else None
-                )
-                output.setdefault(path, []).append(data)
-        return output
+        group_name: str,
+        descriptor: StatisticDescriptor | None = None,
+    ) -> tuple[dict[str, dict], dict[str, StatisticAggregator]]:
+        """Hash mapping and aggregator of every statistic path of
+        entities."""
+        if descriptor is None:
+            data = dump_records(data)
+        spec = ChunkSpec(
+            key_prefix=f"{self.prefix}{self._group_tag(group_name)}",
+            is_aggregate=is_aggregate,
+            placeholder_field=(
+                self.placeholder_field if self.compact_placeholders else None
+            ),
+            descriptor=descriptor,
+            full_validation=self.app.config.redis.row_validation == "full",
+        )
+        return await self._build_chunk(spec, data)
+
+    async def _build_chunk(
+        self, spec: ChunkSpec, entities: list
+    ) -> tuple[dict[str, dict], dict[str, StatisticAggregator]]:
+        if self._executor is None:
+            return build_chunk(spec, entities)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, build_chunk, spec, entities
+        )
 
     async def set_statistic_by_schema(
-        self, current_group: GroupSchema, data: list[BaseModel]
+        self,
+        current_group: GroupSchema,
+        data: Iterable[BaseModel | dict] | AsyncIterable[BaseModel | dict],
+        rows: bool = False,
+        complete: bool = False,
     ) -> BaseModel:
-        pipe = self.redis.pipeline()
-        raw_data = await self._create_hset_for_redis(
-            data=data,
-            pipe=pipe,
-            is_aggregate=current_group.is_aggregate,
-            group_name=current_group.group_name,
-        )
+        """Write entities to Redis in chunks, every chunk is written with its
+        own pipeline and aggregated incrementally, so memory does not depend
+        on group size. Entities may come from async iterator, chunk is
+        written as soon as it is received.
+        Entities are statistic records or Search rows when rows is set, rows
+        are converted to records with chunk.
+        Only a random sample of elements is written for approximate group,
+        frequency and maximum are calculated for the sample. Averages are
+        exact: entities out of sample are kept in totals, which are replaced
+        when data is complete, i.e. holds all entities of group."""
         try:
-            await pipe.execute()
-            data_for_group_create = {}
-            for k, v in raw_data.items():
-                result = self._get_aggregated_data(k, v)
-                data_for_group_create.setdefault(k.split(":")[2], {}).update(
-                    result
-                )
-            if not data_for_group_create.get("groupName", None):
-                data_for_group_create |= {"groupName": current_group.group_name}
-            # Create GroupStat Model
-            group_stat = self.app.store.group_scheme[f"{current_group.tmo_id}"](
-                **data_for_group_create
+            return await self._write_statistic(
+                current_group, data, rows, complete
             )
-            return group_stat
         except DataError as ex:
             self.logger.exception("Set statistic error: %s", ex)
             raise ValueError(f"{ex}: {ex.args}")
@@ -185,15 +471,185 @@ class RedisAccessor(BaseAccessor):
         except Exception as ex:
             self.logger.warning(msg=f"{type(ex)}: {ex}.")
 
+    async def _write_statistic(
+        self,
+        current_group: GroupSchema,
+        data: Iterable[BaseModel | dict] | AsyncIterable[BaseModel | dict],
+        rows: bool,
+        complete: bool = False,
+    ) -> BaseModel:
+        aggregators: dict[str, StatisticAggregator] = {}
+        # Aggregators of entities out of sample
+        rest: dict[str, StatisticAggregator] = {}
+        sampler = None
+        descriptor = None
+        if rows:
+            descriptor = self.app.store.grpc.statistic_descriptor(
+                current_group.tmo_id
+            )
+        if current_group.is_approximate:
+            sampler = await self._load_sampler(current_group.group_name)
+        async for chunk in self._entity_chunks(data):
+            if sampler is not None:
+                sampled, rejected = [], []
+                for entity in chunk:
+                    entity_id = str(entity["id"] if rows else entity.MO.id)
+                    if sampler.offer(entity_id):
+                        sampled.append(entity)
+                    else:
+                        rejected.append(entity)
+                if complete and rejected:
+                    _, partial = await self._aggregate_entities(
+                        rejected,
+                        current_group.is_aggregate,
+                        current_group.group_name,
+                        descriptor,
+                    )
+                    self._merge_aggregators(rest, partial)
+                chunk = sampled
+            pipe = self._pipeline()
+            await self._create_hset_for_redis(
+                data=chunk,
+                pipe=pipe,
+                is_aggregate=current_group.is_aggregate,
+                group_name=current_group.group_name,
+                aggregators=aggregators,
+                descriptor=descriptor,
+            )
+            await pipe.execute()
+        pipe = self.redis.pipeline(transaction=False)
+        if sampler is not None:
+            if complete:
+                await self._write_rest_totals(
+                    pipe, current_group.group_name, rest
+                )
+            await self._save_sampler(pipe, current_group.group_name, sampler)
+        await self._bump_version(pipe, current_group.group_name)
+        await pipe.execute()
+        if sampler is not None:
+            await self.delete_values(
+                current_group.group_name, list(sampler.evicted), evict=True
+            )
+            data_for_group_create = await self._collect_statistic(
+                await self._get_group_keys(current_group.group_name)
+            )
+        else:
+            data_for_group_create = {}
+            for path, aggregator in aggregators.items():
+                _, statistic_name, *_, name = self._split_key(path)
+                data_for_group_create.setdefault(statistic_name, {}).update(
+                    self._aggregated_result(name, aggregator)
+                )
+        if not data_for_group_create.get("groupName", None):
+            data_for_group_create |= {"groupName": current_group.group_name}
+        # Create GroupStat Model
+        group_stat = self.app.store.group_scheme[f"{current_group.tmo_id}"](
+            **data_for_group_create
+        )
+        return group_stat
+
+    async def _rebuild_statistic(
+        self,
+        group_schema: GroupSchema,
+        data: Iterable[BaseModel | dict] | AsyncIterable[BaseModel | dict],
+        rows: bool = False,
+    ) -> BaseModel:
+        """Write statistic of group which has no keys in Redis. Keys written
+        before failure are removed and error is raised, otherwise partially
+        written group would be served as complete one."""
+        try:
+            return await self._write_statistic(
+                group_schema, data, rows, complete=True
+            )
+        except Exception:
+            try:
+                await self.purge_groups([group_schema.group_name])
+            except Exception as ex:
+                self.logger.warning(
+                    "Purge of partial group %s failed %s: %s",
+                    group_schema.group_name,
+                    type(ex),
+                    ex,
+                )
+            raise
+
+    async def set_process_statistic(
+        self, group_schema: GroupSchema, processes: AsyncIterable[dict]
+    ) -> BaseModel:
+        """Write statistic of all processes of group, rows are written while
+        they are received from Search. Keys of group are removed and error
+        is raised if stream fails."""
+        return await self._rebuild_statistic(
+            group_schema, data=processes, rows=True
+        )
+
+    async def _set_process_statistic(
+        self, group_schema: GroupSchema, mo_ids: list[int]
+    ) -> BaseModel:
+        """Processes are written while they are read from Search. With
+        statistic executor rows are converted to records by its workers."""
+        grpc = self.app.store.grpc
+        if self._executor is None:
+            return await self._rebuild_statistic(
+                group_schema,
+                data=grpc.stream_severity_statistic(
+                    group_schema=group_schema, mo_ids=mo_ids
+                ),
+            )
+        return await self._rebuild_statistic(
+            group_schema,
+            data=grpc.stream_severity_rows(
+                group_schema=group_schema, mo_ids=mo_ids
+            ),
+            rows=True,
+        )
+
+    async def _entity_chunks(
+        self, data: Iterable[BaseModel] | AsyncIterable[BaseModel]
+    ) -> AsyncIterator[list[BaseModel]]:
+        chunk_size = self.app.config.redis.ingest_chunk_size
+        if not isinstance(data, AsyncIterable):
+            entities = iter(data)
+            while chunk := list(islice(entities, chunk_size)):
+                yield chunk
+            return
+        chunk = []
+        async for entity in data:
+            chunk.append(entity)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
     async def get_statistic(self, group_model: GroupModel) -> BaseModel:
         self.logger.debug(msg="Start redis function")
+        cache_key = (group_model.group_name, group_model.tmo_id)
+        reader = self._reader(group_model.group_name)
+        # Only statistic read from Redis is cached
+        cacheable = False
         try:
+            snapshots = await self._read_snapshots(
+                [group_model.group_name], client=reader
+            )
+            version, snapshot = snapshots[group_model.group_name]
+            group_stat = self._get_ready_statistic(
+                group_model, version, snapshot
+            )
+            if group_stat is not None:
+                return group_stat
             self.logger.debug(msg="Trying all groups...")
             data_for_group_create = {}
             # Looking for redis hashset with group_name
-            all_group_parameters = await self.redis.keys(
-                self.prefix + group_model.group_name + ":*"
+            all_group_parameters = await self._get_group_keys(
+                group_model.group_name, client=reader
             )
+            if not all_group_parameters and reader is not self.redis:
+                # Replica may be behind primary
+                reader = self.redis
+                all_group_parameters = await self._get_group_keys(
+                    group_model.group_name
+                )
             self.logger.debug(
                 msg=f"Get all group parameters {all_group_parameters}"
             )
@@ -209,10 +665,7 @@ class RedisAccessor(BaseAccessor):
                         mo_ids=[el.entity_id for el in group_model.elements],
                     )
                 elif group_model.group_type_id == 2:
-                    data: (
-                        list[BaseModel],
-                        bool,
-                    ) = await self.app.store.grpc.get_severity_processes(
+                    return await self._set_process_statistic(
                         group_schema=group_model.to_schema(),
                         mo_ids=[el.entity_id for el in group_model.elements],
                     )
@@ -220,21 +673,16 @@ class RedisAccessor(BaseAccessor):
                     raise TypeError("Incorrect group Type")
                 if not data:
                     raise ValueError("Entities not found in Search")
-                return await self.set_statistic_by_schema(
-                    current_group=group_model.to_schema(), data=data[0]
+                return await self._rebuild_statistic(
+                    group_model.to_schema(), data=data[0]
                 )
 
-            for parameter in all_group_parameters:
-                data_from_redis: list = await self.redis.hvals(parameter)
-                data_for_group_create.setdefault(
-                    parameter.split(":")[2], {}
-                ).update(
-                    self._get_aggregated_data(
-                        prm=parameter, data=data_from_redis
-                    )
-                )
+            data_for_group_create = await self._collect_statistic(
+                all_group_parameters, client=reader
+            )
             if not data_for_group_create.get("groupName", None):
                 data_for_group_create |= {"groupName": group_model.group_name}
+            cacheable = True
             # Create GroupStat Model
             # group_stat: BaseModel = self.app.store.group_scheme[f"{group_model.tmo_id}"](**data_for_group_create)
             # return group_stat
@@ -258,24 +706,89 @@ class RedisAccessor(BaseAccessor):
                 "groupName": group_model.group_name,
                 "MO": {"tmo_id": group_model.tmo_id},
             }
-        finally:
-            group_stat: BaseModel = self.app.store.group_scheme[
-                f"{group_model.tmo_id}"
-            ](**data_for_group_create)
+        group_stat: BaseModel = self.app.store.group_scheme[
+            f"{group_model.tmo_id}"
+        ](**data_for_group_create)
+        if cacheable:
+            self.statistic_cache.set(cache_key, version, group_stat)
+            await self._write_snapshots(
+                [(group_model.group_name, version, group_stat)]
+            )
         return group_stat
 
+    async def get_statistics(
+        self, group_models: list[GroupModel]
+    ) -> AsyncIterator[tuple[GroupModel, BaseModel]]:
+        """Statistic of many groups. Groups are processed in chunks, versions,
+        snapshots, group keys and statistic keys of all groups in chunk are
+        read with pipelines. Statistic is yielded when its chunk is ready."""
+        for chunk in self._chunks(group_models):
+            group_names = [group_model.group_name for group_model in chunk]
+            reader = self._reader(*group_names)
+            snapshots = await self._read_snapshots(group_names, client=reader)
+            missing: list[GroupModel] = []
+            for group_model in chunk:
+                version, snapshot = snapshots[group_model.group_name]
+                group_stat = self._get_ready_statistic(
+                    group_model, version, snapshot
+                )
+                if group_stat is None:
+                    missing.append(group_model)
+                else:
+                    yield group_model, group_stat
+            if not missing:
+                continue
+            group_keys = await self._get_many_group_keys(
+                [group_model.group_name for group_model in missing],
+                client=reader,
+            )
+            collected = await self._collect_many_statistics(
+                group_keys, client=reader
+            )
+            ready = []
+            for group_model in missing:
+                group_name = group_model.group_name
+                try:
+                    if not group_keys[group_name]:
+                        raise LookupError("Group keys not found")
+                    data_for_group_create = collected[group_name]
+                    if not data_for_group_create.get("groupName", None):
+                        data_for_group_create |= {"groupName": group_name}
+                    group_stat = self.app.store.group_scheme[
+                        f"{group_model.tmo_id}"
+                    ](**data_for_group_create)
+                except Exception as ex:
+                    # Statistic is created from scratch or default is built
+                    self.logger.debug("Get statistics %s: %s.", group_name, ex)
+                    yield group_model, await self.get_statistic(group_model)
+                    continue
+                version, _ = snapshots[group_name]
+                self.statistic_cache.set(
+                    (group_name, group_model.tmo_id), version, group_stat
+                )
+                ready.append((group_name, version, group_stat))
+                yield group_model, group_stat
+            await self._write_snapshots(ready)
+
     async def get_statistic_by_schema(
         self, group_schema: GroupSchema
     ) -> BaseModel:
         # Very slow method
         self.logger.debug(msg="Start redis function")
+        reader = self._reader(group_schema.group_name)
         try:
             self.logger.debug(msg="Trying all groups...")
             data_for_group_create = {}
             # Looking for redis hashset with group_name
-            all_group_parameters = await self.redis.keys(
-                self.prefix + group_schema.group_name + ":*"
+            all_group_parameters = await self._get_group_keys(
+                group_schema.group_name, client=reader
             )
+            if not all_group_parameters and reader is not self.redis:
+                # Replica may be behind primary
+                reader = self.redis
+                all_group_parameters = await self._get_group_keys(
+                    group_schema.group_name
+                )
             self.logger.debug(
                 msg=f"Get all group parameters {all_group_parameters}"
             )
@@ -291,10 +804,7 @@ class RedisAccessor(BaseAccessor):
                         mo_ids=[el.entity_id for el in group_schema.elements],
                     )
                 elif group_schema.group_type_id == 2:
-                    data: (
-                        list[BaseModel],
-                        bool,
-                    ) = await self.app.store.grpc.get_severity_processes(
+                    return await self._set_process_statistic(
                         group_schema=group_schema,
                         mo_ids=[el.entity_id for el in group_schema.elements],
                     )
@@ -302,19 +812,11 @@ class RedisAccessor(BaseAccessor):
                     raise TypeError("Incorrect group Type")
                 if not data:
                     raise ValueError("Entities not found in Search")
-                return await self.set_statistic_by_schema(
-                    current_group=group_schema, data=data[0]
-                )
+                return await self._rebuild_statistic(group_schema, data=data[0])
 
-            for parameter in all_group_parameters:
-                data_from_redis: list = await self.redis.hvals(parameter)
-                data_for_group_create.setdefault(
-                    parameter.split(":")[2], {}
-                ).update(
-                    self._get_aggregated_data(
-                        prm=parameter, data=data_from_redis
-                    )
-                )
+            data_for_group_create = await self._collect_statistic(
+                all_group_parameters, client=reader
+            )
             if not data_for_group_create.get("groupName", None):
                 data_for_group_create |= {"groupName": group_schema.group_name}
             # Create GroupStat Model
@@ -349,56 +851,200 @@ class RedisAccessor(BaseAccessor):
     async def get_statistic_by_schema_for_delete(
         self, group_schema: GroupSchema
     ) -> BaseModel:
-        all_group_parameters = await self.redis.keys(
-            self.prefix + group_schema.group_name + ":*"
+        all_group_parameters = await self._get_group_keys(
+            group_schema.group_name
         )
 
-        data_for_group_create = {}
         if not all_group_parameters:
             # Generate empty statistic
             return self.generate_empty_statistic(group_schema=group_schema)
-        for parameter in all_group_parameters:
-            data_from_redis: list = await self.redis.hvals(parameter)
-            data_for_group_create.setdefault(
-                parameter.split(":")[2], {}
-            ).update(
-                self._get_aggregated_data(prm=parameter, data=data_from_redis)
-            )
-            if not data_for_group_create.get("groupName", None):
-                data_for_group_create |= {"groupName": group_schema.group_name}
+        data_for_group_create = await self._collect_statistic(
+            all_group_parameters
+        )
+        if not data_for_group_create.get("groupName", None):
+            data_for_group_create |= {"groupName": group_schema.group_name}
         group_stat: BaseModel = self.app.store.group_scheme[
             f"{group_schema.tmo_id}"
         ](**data_for_group_create)
         return group_stat
 
     async def remove_groups(self, group_names: list[str]) -> int:
-        result = 0
         try:
-            for group_name in group_names:
-                keys = await self.redis.keys(f"{self.prefix}{group_name}:*")
-                if keys:
-                    result += await self.redis.delete(*keys)
-            return result
+            report = await self.purge_groups(group_names)
+            return sum(report.values())
         except Exception as ex:
             self.logger.warning("%s: %s.", type(ex), ex)
             raise
 
+    async def purge_groups(self, group_names: list[str]) -> dict[str, int]:
+        """Remove statistic of many groups at once. Keys are taken from group
+        index (one SCAN pass for groups without index until group index
+        migration is applied) and removed with non-blocking UNLINK in
+        pipelined chunks.
+        Returns number of removed statistic keys per group."""
+        report = dict.fromkeys(group_names, 0)
+        if not group_names:
+            return report
+        group_keys = await self._get_many_group_keys(group_names)
+        not_indexed = {name for name, paths in group_keys.items() if not paths}
+        if (
+            not_indexed
+            and await self.redis.hget(self.meta_key, "group_index") is None
+        ):
+            # Keys created before group index existed
+            async for path in self.redis.scan_iter(
+                match=f"{self.prefix}*", count=1000
+            ):
+                group_name, *_ = self._split_key(path)
+                if group_name in not_indexed:
+                    group_keys[group_name].append(path)
+
+        # Ids of compact keys are freed with group
+        group_ids = dict(
+            zip(group_keys, await self._lookup_group_ids(list(group_keys)))
+        )
+        chunk_size = self.app.config.redis.pipeline_chunk_size
+        pipe = self.redis.pipeline(transaction=False)
+        # Group name for every queued command which removes statistic keys
+        owners: list[str | None] = []
+        queued_keys = 0
+        for group_name, paths in group_keys.items():
+            for chunk in self._chunks(paths):
+                await pipe.unlink(*chunk)
+                owners.append(group_name)
+                for path in chunk:
+                    _, statistic_name, *_, parameter_name = self._split_key(
+                        path
+                    )
+                    if statistic_name == "TPRM":
+                        await pipe.srem(
+                            self._tprm_index_key(parameter_name), path
+                        )
+                        owners.append(None)
+                await pipe.unlink(
+                    *(
+                        companion
+                        for path in chunk
+                        for companion in self._companion_keys(path)
+                    )
+                )
+                owners.append(None)
+                queued_keys += len(chunk)
+            await pipe.unlink(
+                self._index_key(group_name),
+                self._snapshot_key(group_name),
+                self._sample_key(group_name),
+            )
+            await self._drop_version(pipe, group_name)
+            owners.extend((None, None))
+            if not self.cluster:
+                await pipe.hdel(self.registry_key, group_name)
+                owners.append(None)
+            if group_ids[group_name] is not None:
+                await pipe.hdel(self.group_ids_key, group_name)
+                await pipe.hdel(self.group_names_key, group_ids[group_name])
+                owners.extend((None, None))
+                self._group_names.pop(group_ids[group_name], None)
+            if queued_keys >= chunk_size:
+                await self._execute_purge(pipe, owners, report)
+                pipe = self.redis.pipeline(transaction=False)
+                owners = []
+                queued_keys = 0
+        if owners:
+            await self._execute_purge(pipe, owners, report)
+        return report
+
+    @staticmethod
+    async def _execute_purge(
+        pipe, owners: list[str | None], report: dict[str, int]
+    ) -> None:
+        for group_name, removed in zip(owners, await pipe.execute()):
+            if group_name is not None:
+                report[group_name] += removed
+
     async def delete_values(
-        self, group_name: str, entity_ids: list[int]
+        self, group_name: str, entity_ids: list[int], evict: bool = False
     ) -> None:
+        """Remove entities from statistic of group. Values of entities
+        evicted from sample of approximate group stay in its averages."""
         if entity_ids:
             try:
-                all_group_parameters = await self.redis.keys(
-                    f"{self.prefix}{group_name}:*"
+                all_group_parameters = await self._get_group_keys(group_name)
+                # Keys of group are processed by script with running
+                # aggregates and group index, one script call touches at
+                # most script_fields fields, so Redis is not blocked long
+                keys_size = min(
+                    len(all_group_parameters),
+                    self.app.config.redis.pipeline_chunk_size,
                 )
-                # improve performance
-                # https://stackoverflow.com/questions/21975228/
-                # redis-python-how-to-delete-all-keys-according-to-a-specific-pattern-in-python
-                for parameter in all_group_parameters:
-                    await self.redis.hdel(parameter, *entity_ids)
+                ids_size = max(1, self.script_fields // max(keys_size, 1))
+                emptied = []
+                for start in range(0, len(entity_ids), ids_size):
+                    ids = entity_ids[start : start + ids_size]
+                    pipe = self.redis.pipeline(transaction=False)
+                    for chunk in self._chunks(all_group_parameters):
+                        keys = [self._index_key(group_name)]
+                        for parameter in chunk:
+                            keys.extend(
+                                (parameter, *self._companion_keys(parameter))
+                            )
+                        await self._delete_values_script(
+                            keys=keys,
+                            args=[
+                                int(evict),
+                                *(
+                                    self._script_aggregation(prm)
+                                    for prm in chunk
+                                ),
+                                *ids,
+                            ],
+                            client=pipe,
+                        )
+                    for paths in await pipe.execute():
+                        emptied.extend(paths)
+                # Emptied keys are removed from group index by script, key
+                # emptied by one call is reported again by next ones
+                emptied = list(dict.fromkeys(emptied))
+                pipe = self.redis.pipeline(transaction=False)
+                await pipe.srem(self._sample_key(group_name), *entity_ids)
+                await self._bump_version(pipe, group_name)
+                await pipe.execute()
+                dropped = await self._drop_placeholders(
+                    group_name, set(all_group_parameters).difference(emptied)
+                )
+                pipe = self.redis.pipeline(transaction=False)
+                if dropped:
+                    emptied.extend(dropped)
+                    await self._bump_version(pipe, group_name)
+                for path in emptied:
+                    _, statistic_name, *_, parameter_name = self._split_key(
+                        path
+                    )
+                    if statistic_name == "TPRM":
+                        await pipe.srem(
+                            self._tprm_index_key(parameter_name), path
+                        )
+                await pipe.execute()
             except Exception as ex:
                 self.logger.warning(msg=f"Delete values {type(ex)}: {ex}.)")
 
+    async def _drop_placeholders(
+        self, group_name: str, paths: set[str]
+    ) -> list[str]:
+        """Placeholder keys hold no entities and are never emptied by
+        DELETE_VALUES. They are removed with group index when only they
+        are left in group. Returns removed keys."""
+        if not self.compact_placeholders or not paths:
+            return []
+        if any(self._split_key(path)[2] != "None" for path in paths):
+            return []
+        keys = [self._index_key(group_name)]
+        for path in paths:
+            keys.extend((path, *self._companion_keys(path)))
+        return await self._drop_placeholders_script(
+            keys=keys, args=[self.placeholder_field]
+        )
+
     async def update_element_value(
         self,
         entity_id: int,
@@ -406,7 +1052,11 @@ class RedisAccessor(BaseAccessor):
         new_value: T,
         list_groups: list[str],
         group: GroupModel,
-    ):
+    ) -> list[str]:
+        """Update value of entity in groups which already contain it.
+        All groups are updated by one script call per chunk of groups.
+        Returns names of groups where statistic was changed."""
+        changed_groups = []
         try:
             # Serialize value to correct type
             if group.group_type_id == 1:
@@ -418,6 +1068,11 @@ class RedisAccessor(BaseAccessor):
                     **{"TPRM": {str(tprm_id): new_value}}
                 )
             new_value = temp_model.model_dump(exclude_none=True)
+            list_groups = list(dict.fromkeys(list_groups))
+            group_ids = dict(
+                zip(list_groups, await self._lookup_group_ids(list_groups))
+            )
+            keys, value = {}, None
             for group_name in list_groups:
                 path, mapping = self._redis_param_builder(
                     group_name=group_name,
@@ -426,14 +1081,45 @@ class RedisAccessor(BaseAccessor):
                     parameter_value=new_value["TPRM"][str(tprm_id)],
                     entity_id=entity_id,
                 )
-                # Check if key exists need to return 1
-                if await self.redis.hexists(path, str(entity_id)):
-                    # Update information in redis
-                    await self.redis.hset(name=path, mapping=mapping)
+                storage_keys = await self._storage_keys(
+                    group_name,
+                    [path],
+                    allocate=False,
+                    group_id=group_ids[group_name],
+                )
+                if path not in storage_keys:
+                    # Group was never written, it can't contain entity
+                    continue
+                keys[group_name] = storage_keys[path]
+                (value,) = self._encode_values(path, mapping).values()
+            if not keys:
+                return changed_groups
+            agg = self._script_aggregation(path)
+            pipe = self.redis.pipeline(transaction=False)
+            for chunk in self._slot_batches(list(keys), key=keys.get):
+                await self._update_if_member_script(
+                    keys=[
+                        key
+                        for group_name in chunk
+                        for key in (
+                            keys[group_name],
+                            *self._companion_keys(keys[group_name]),
+                        )
+                    ],
+                    args=[agg, entity_id, value, *chunk],
+                    client=pipe,
+                )
+            for changed in await pipe.execute():
+                changed_groups.extend(changed)
+            if changed_groups:
+                pipe = self.redis.pipeline(transaction=False)
+                await self._bump_version(pipe, *changed_groups)
+                await pipe.execute()
         except Exception as ex:
             self.logger.warning(
                 msg=f"Redis add element Error: {type(ex)}: {ex}.)"
             )
+        return changed_groups
 
     async def add_element_value(
         self,
@@ -457,8 +1143,15 @@ class RedisAccessor(BaseAccessor):
                     parameter_value=new_value["TPRM"][str(tprm_id)],
                     entity_id=entity_id,
                 )
+                path = (await self._storage_keys(group_name, [path]))[path]
 
-                await self.redis.hset(name=path, mapping=mapping)
+                pipe = self._pipeline()
+                await self._set_values(pipe=pipe, path=path, mapping=mapping)
+                await self._register_keys(
+                    pipe=pipe, group_name=group_name, paths=[path]
+                )
+                await self._bump_version(pipe, group_name)
+                await pipe.execute()
                 self.logger.info("Added element to Redis.")
         except Exception as ex:
             self.logger.warning(
@@ -466,124 +1159,996 @@ class RedisAccessor(BaseAccessor):
             )
 
     async def remove_parameter(self, tprm_id: int, val_type: str):
-        # Find all keys in redis by pattern
-        _, group_from_redis = await self.redis.scan(
-            cursor=0, match=f"*:TPRM:{val_type}:*:{tprm_id}", count=1000
-        )
         try:
-            for path in group_from_redis:
-                await self.redis.delete(path)
+            paths = await self.redis.smembers(self._tprm_index_key(tprm_id))
+            await self._load_key_names(paths)
+            paths = [
+                path for path in paths if self._split_key(path)[2] == val_type
+            ]
+            if await self.redis.hget(self.meta_key, "tprm_index") is None:
+                # Keys created before TPRM index existed
+                async for path in self.redis.scan_iter(
+                    match=f"{self.prefix}*:TPRM:{val_type}:*:{tprm_id}",
+                    count=1000,
+                ):
+                    paths.append(path)
+            paths = list(dict.fromkeys(paths))
+            pipe = self.redis.pipeline(transaction=False)
+            for chunk in self._slot_batches(paths):
+                await pipe.unlink(
+                    *chunk,
+                    *(
+                        companion
+                        for path in chunk
+                        for companion in self._companion_keys(path)
+                    ),
+                )
+                group_names = []
+                for path in chunk:
+                    group_name, *_ = self._split_key(path)
+                    await pipe.srem(self._index_key(group_name), path)
+                    group_names.append(group_name)
+                await self._bump_version(pipe, *group_names)
+                await pipe.srem(self._tprm_index_key(tprm_id), *chunk)
+            await pipe.execute()
         except Exception as ex:
             self.logger.warning(
                 msg=f"Update redis element Error: {type(ex)}: {ex}.)"
             )
 
-    def _redis_param_builder(
-        self,
-        group_name: str,
-        statistic_name: str,
-        parameter_name: str,
-        parameter_value: T,
-        entity_id: int,
-    ) -> (str, dict[str, T]):
-        # Strict mapping
-        if mapper.get(parameter_name):
-            if isinstance(parameter_value, bool):
-                return (
-                    f"{self.prefix}{group_name}:{statistic_name}:{type(parameter_value).__name__}:"
-                    f"{mapper[parameter_name]}:{parameter_name}",
-                    {entity_id: int(parameter_value)},
+    def _sample_key(self, group_name: str) -> str:
+        return f"{self.sample_prefix}{self._group_tag(group_name)}"
+
+    async def _load_sampler(self, group_name: str) -> ReservoirSampler:
+        return ReservoirSampler(
+            size=self.app.config.redis.approximate_sample_size,
+            members=await self.redis.smembers(self._sample_key(group_name)),
+            salt=group_name,
+        )
+
+    async def _save_sampler(
+        self, pipe, group_name: str, sampler: ReservoirSampler
+    ) -> None:
+        sample_key = self._sample_key(group_name)
+        if sampler.evicted:
+            await pipe.srem(sample_key, *sampler.evicted)
+        if sampler.added:
+            await pipe.sadd(sample_key, *sampler.added)
+
+    def _index_key(self, group_name: str) -> str:
+        return f"{self.index_prefix}{self._group_tag(group_name)}"
+
+    def _snapshot_key(self, group_name: str) -> str:
+        return f"{self.snapshot_prefix}{self._group_tag(group_name)}"
+
+    async def _read_snapshots(
+        self, group_names: list[str], client=None
+    ) -> dict[str, tuple[str | None, str | None]]:
+        """Current version and serialized statistic snapshot of every group,
+        snapshot is None when it is disabled, missing or dirty."""
+        pipe = (client or self.redis).pipeline(transaction=False)
+        if self.cluster:
+            for group_name in group_names:
+                await pipe.get(self._version_key(group_name))
+        else:
+            await pipe.hmget(self.version_key, group_names)
+        if self.snapshots:
+            for group_name in group_names:
+                await pipe.hmget(
+                    self._snapshot_key(group_name), "version", "data"
                 )
-            elif isinstance(parameter_value, datetime):
-                pattern = "%Y-%m-%dT%H:%M:%S.%fZ"
-                return (
-                    f"{self.prefix}{group_name}:{statistic_name}:{type(parameter_value).__name__}:"
-                    f"{mapper[parameter_name]}:{parameter_name}",
-                    {entity_id: parameter_value.strftime(pattern)},
+        replies = await pipe.execute()
+        if self.cluster:
+            versions = replies[: len(group_names)]
+            snapshots = replies[len(group_names) :]
+        else:
+            versions, *snapshots = replies
+        result = {}
+        for i, (group_name, version) in enumerate(zip(group_names, versions)):
+            data = None
+            if snapshots:
+                snapshot_version, data = snapshots[i]
+                if snapshot_version != str(version):
+                    data = None
+            result[group_name] = (version, data)
+        return result
+
+    def _get_ready_statistic(
+        self,
+        group_model: GroupModel,
+        version: str | None,
+        snapshot: str | None,
+    ) -> BaseModel | None:
+        """Statistic from in process cache or from snapshot if it is valid
+        for current group version."""
+        cache_key = (group_model.group_name, group_model.tmo_id)
+        statistic_model = self.app.store.group_scheme[f"{group_model.tmo_id}"]
+        group_stat = self.statistic_cache.get(cache_key, version)
+        if isinstance(group_stat, statistic_model):
+            return group_stat
+        if snapshot is None:
+            return None
+        try:
+            group_stat = statistic_model.model_validate_json(snapshot)
+        except ValidationError as ex:
+            self.logger.warning("Invalid statistic snapshot: %s.", ex)
+            return None
+        self.statistic_cache.set(cache_key, version, group_stat)
+        return group_stat
+
+    async def _write_snapshots(
+        self, snapshots: list[tuple[str, str | None, BaseModel]]
+    ) -> None:
+        """Snapshot is stamped with group version read before statistic was
+        collected, so it is dirty if group was changed in the meantime. It
+        is not written when group was purged, so it is removed together
+        with group version."""
+        snapshots = [item for item in snapshots if item[1] is not None]
+        if not self.snapshots or not snapshots:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for group_name, version, group_stat in snapshots:
+                if self.cluster:
+                    version_key, field = self._version_key(group_name), ""
+                else:
+                    version_key, field = self.version_key, group_name
+                await self._write_snapshot_script(
+                    keys=[version_key, self._snapshot_key(group_name)],
+                    args=[field, version, group_stat.model_dump_json()],
+                    client=pipe,
                 )
-            elif parameter_value is None:
-                return (
-                    f"{self.prefix}{group_name}:{statistic_name}:None:{mapper[parameter_name]}"
-                    f":{parameter_name}",
-                    {entity_id: "None"},
+            await pipe.execute()
+        except Exception as ex:
+            self.logger.warning("Write statistic snapshot error: %s.", ex)
+
+    def _group_tag(self, group_name: str) -> str:
+        """Group name as it is written in keys."""
+        if self.cluster:
+            return f"{{{group_name}}}"
+        return group_name
+
+    def _slot_batches(
+        self, items: list, key: Callable[[Any], str] | None = None
+    ) -> Iterator[list]:
+        """Chunks of items which keys are in one cluster slot, so they may be
+        used by one multi-key command or script. Without cluster same as
+        _chunks."""
+        if not self.cluster:
+            yield from self._chunks(items)
+            return
+        by_slot: dict[int, list] = {}
+        for item in items:
+            name = key(item) if key else item
+            by_slot.setdefault(key_slot(name.encode()), []).append(item)
+        for slot_items in by_slot.values():
+            yield from self._chunks(slot_items)
+
+    def _version_key(self, group_name: str) -> str:
+        return f"{self.version_key}:{self._group_tag(group_name)}"
+
+    async def _bump_version(self, pipe, *group_names: str) -> None:
+        """Versions are taken from one global counter, so group which is
+        purged and created again never gets version of statistic cached
+        before."""
+        group_names = tuple(dict.fromkeys(group_names))
+        if not group_names:
+            return
+        self._mark_written(*group_names)
+        last = await self.redis.incrby(
+            self.version_sequence_key, len(group_names)
+        )
+        versions = dict(
+            zip(group_names, range(last - len(group_names) + 1, last + 1))
+        )
+        if self.cluster:
+            for group_name, version in versions.items():
+                await pipe.set(self._version_key(group_name), version)
+        else:
+            await pipe.hset(self.version_key, mapping=versions)
+
+    async def _drop_version(self, pipe, group_name: str) -> None:
+        self._mark_written(group_name)
+        if self.cluster:
+            await pipe.unlink(self._version_key(group_name))
+        else:
+            await pipe.hdel(self.version_key, group_name)
+
+    def _tprm_index_key(self, tprm_id: int | str) -> str:
+        return f"{self.tprm_index_prefix}{tprm_id}"
+
+    def _companion_keys(self, path: str) -> tuple[str, str, str]:
+        """Keys with running aggregates for statistic key."""
+        if path.startswith(self.compact_prefix):
+            suffix = path.removeprefix(self.compact_prefix)
+            return tuple(
+                f"{prefix}{suffix}"
+                for prefix in self.compact_companion_prefixes
+            )
+        suffix = path.removeprefix(self.prefix)
+        return (
+            f"{self.aggregate_prefix}{suffix}",
+            f"{self.counter_prefix}{suffix}",
+            f"{self.maximum_prefix}{suffix}",
+        )
+
+    async def _set_values(self, pipe, path: str, mapping: dict) -> None:
+        """HSET for statistic key which keeps running aggregates up to date.
+        pipe is a pipeline or the client itself."""
+        args = [self._script_aggregation(path)]
+        for entity_id, value in self._encode_values(path, mapping).items():
+            args.extend((entity_id, value))
+        await self._set_values_script(
+            keys=[path, *self._companion_keys(path)], args=args, client=pipe
+        )
+
+    def _encode_values(self, path: str, mapping: dict) -> dict:
+        """Numbers of average and maximum statistics in binary form when
+        binary codec is used."""
+        if not self.binary_values or self._script_aggregation(path) not in (
+            "average",
+            "maximum_number",
+        ):
+            return mapping
+        return {
+            entity_id: encode_number(value)
+            if isinstance(value, (int, float))
+            else value
+            for entity_id, value in mapping.items()
+        }
+
+    def _chunks(self, items: list) -> Iterator[list]:
+        size = self.app.config.redis.pipeline_chunk_size
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+
+    async def _collect_statistic(self, paths: list[str], client=None) -> dict:
+        """Read statistic for all group keys. Keys are read in chunks with
+        one non-transactional pipeline (or script call) per chunk."""
+        data_for_group_create = {}
+        async for chunk, results in self._aggregate_chunks(paths, client):
+            for parameter, result in zip(chunk, results):
+                data_for_group_create.setdefault(
+                    self._split_key(parameter)[1], {}
+                ).update(result)
+        return data_for_group_create
+
+    async def _collect_many_statistics(
+        self, group_keys: dict[str, list[str]], client=None
+    ) -> dict[str, dict]:
+        """_collect_statistic for many groups, keys of different groups
+        share pipelines."""
+        result: dict[str, dict] = {name: {} for name in group_keys}
+        paths = [path for paths in group_keys.values() for path in paths]
+        async for chunk, results in self._aggregate_chunks(paths, client):
+            for parameter, data in zip(chunk, results):
+                group_name, statistic_name, *_ = self._split_key(parameter)
+                result[group_name].setdefault(statistic_name, {}).update(data)
+        return result
+
+    async def _aggregate_chunks(
+        self, paths: list[str], client=None
+    ) -> AsyncIterator[tuple[list[str], list[dict]]]:
+        engine = self.app.config.redis.statistic_engine
+        client = client or self.redis
+        for chunk in self._slot_batches(paths):
+            if engine == "lua":
+                results = await self._aggregate_with_lua(chunk, client)
+            elif engine == "aggregate":
+                results = await self._read_running_aggregates(chunk, client)
+            else:
+                pipe = client.pipeline(transaction=False)
+                for parameter in chunk:
+                    await pipe.hvals(parameter)
+                results = [
+                    self._get_aggregated_data(
+                        prm=parameter, data=decode_values(data)
+                    )
+                    for parameter, data in zip(chunk, await pipe.execute())
+                ]
+            if engine != "aggregate":
+                await self._add_rest_totals(chunk, results, client)
+            yield chunk, results
+
+    async def _aggregate_with_lua(
+        self, paths: list[str], client=None
+    ) -> list[dict]:
+        """Aggregate statistic hashes inside Redis with one script call
+        instead of HVALS for every key."""
+        split_paths = [self._split_key(path) for path in paths]
+        values = await self._aggregate_statistic_script(
+            keys=paths,
+            args=[
+                script_aggregation(agg, type_)
+                for *_, type_, agg, _ in split_paths
+            ],
+            client=client,
+        )
+        results = []
+        for (*_, type_, agg, name), value in zip(split_paths, values):
+            if value is not None and agg == "average":
+                value = float(value)
+                value = int(value) if type_ == "int" else round(value, 2)
+            elif agg == "maximum" and type_ in NUMERIC_MAXIMUM_TYPES:
+                value = decode_maximum(decode_value(value), type_)
+            results.append({name: value})
+        return results
+
+    async def _add_rest_totals(
+        self, paths: list[str], results: list[dict], client
+    ) -> None:
+        """Averages of approximate groups aggregated from values of sample
+        are replaced by averages with totals of entities out of sample."""
+        averages = [
+            index
+            for index, prm in enumerate(paths)
+            if self._script_aggregation(prm) == "average"
+        ]
+        if not averages:
+            return
+        pipe = client.pipeline(transaction=False)
+        for index in averages:
+            agg_key, *_ = self._companion_keys(paths[index])
+            await pipe.hmget(agg_key, *AVERAGE_FIELDS)
+        for index, totals in zip(averages, await pipe.execute()):
+            if totals[1] is None or totals[3] is None:
+                continue
+            *_, type_, _, name = self._split_key(paths[index])
+            results[index] = {name: self._average(type_, *totals)}
+
+    @staticmethod
+    def _average(
+        type_: str,
+        total: str,
+        count: str,
+        rest_total: str | None = None,
+        rest_count: str | None = None,
+    ) -> int | float | None:
+        """Average of running aggregates of statistic hash and totals of
+        entities out of sample."""
+        total, count = float(total), int(count)
+        if rest_count is not None:
+            total, count = total + float(rest_total), count + int(rest_count)
+        if count <= 0:
+            return None
+        if type_ == "int":
+            return int(total / count)
+        return round(total / count, 2)
+
+    async def _read_running_aggregates(
+        self, paths: list[str], client=None
+    ) -> list[dict]:
+        """Statistic from running aggregates. Keys without aggregates (not
+        built yet or removed by failed migration) or with aggregates which
+        are being rebuilt are aggregated from their values."""
+        client = client or self.redis
+        pipe = client.pipeline(transaction=False)
+        for prm in paths:
+            agg = self._script_aggregation(prm)
+            agg_key, counter_key, maximum_key = self._companion_keys(prm)
+            if agg == "average":
+                await pipe.hmget(agg_key, *AVERAGE_FIELDS, "building")
+                continue
+            elif agg == "frequency":
+                await pipe.zrevrange(counter_key, 0, 0)
+            elif agg == "maximum_number":
+                await pipe.zrevrange(maximum_key, 0, 0)
+            elif agg == "maximum":
+                await pipe.zrevrangebylex(maximum_key, "+", "-", start=0, num=1)
+            else:
+                raise ValueError(f"Wrong aggregation data for: {prm}")
+            await pipe.zcard(counter_key)
+            await pipe.hexists(agg_key, "building")
+        replies = iter(await pipe.execute())
+        results = []
+        # Index of result -> key without aggregates
+        missing: dict[int, str] = {}
+        for prm in paths:
+            *_, type_, agg, name = self._split_key(prm)
+            if agg == "average":
+                *totals, building = next(replies)
+                if totals[1] is None or building:
+                    missing[len(results)] = prm
+                    results.append({})
+                else:
+                    results.append({name: self._average(type_, *totals)})
+                continue
+            top, distinct, building = (
+                next(replies),
+                next(replies),
+                next(replies),
+            )
+            if not distinct or building:
+                missing[len(results)] = prm
+                results.append({})
+            elif not top or top[0] == "None" and distinct == 1:
+                results.append({name: None})
+            elif type_ in NUMERIC_MAXIMUM_TYPES and agg == "maximum":
+                results.append(
+                    {name: decode_maximum(decode_value(top[0]), type_)}
                 )
             else:
-                return (
-                    f"{self.prefix}{group_name}:{statistic_name}:{type(parameter_value).__name__}:"
-                    f"{mapper[parameter_name]}:{parameter_name}",
-                    {entity_id: parameter_value},
+                results.append({name: top[0]})
+        if missing:
+            pipe = client.pipeline(transaction=False)
+            for prm in missing.values():
+                await pipe.hvals(prm)
+            for (index, prm), data in zip(
+                missing.items(), await pipe.execute()
+            ):
+                results[index] = self._get_aggregated_data(
+                    prm=prm, data=decode_values(data)
                 )
-        # Mapping on type
+        return results
+
+    def _script_aggregation(self, path: str) -> str:
+        *_, type_, agg, _ = self._split_key(path)
+        return script_aggregation(agg, type_)
+
+    def _split_key(self, path: str) -> list[str]:
+        """Split statistic key into group name, statistic name, type,
+        aggregation and parameter name. Group name may contain ':'.
+        Names of compact keys must be loaded with _load_key_names."""
+        if path.startswith(self.compact_prefix):
+            group, code = path.removeprefix(self.compact_prefix).rsplit(":", 1)
+            if group.startswith("{"):
+                group_name = group[1:-1]
+            else:
+                group_name = self._group_names[group]
+            return [group_name, *self._parameter_names[code].split(":", 3)]
+        group_name, *names = path.removeprefix(self.prefix).rsplit(":", 4)
+        if self.cluster:
+            group_name = group_name[1:-1]
+        return [group_name, *names]
+
+    async def _storage_keys(
+        self,
+        group_name: str,
+        paths: list[str],
+        allocate: bool = True,
+        group_id: str | None = None,
+    ) -> dict[str, str]:
+        """Redis key for every statistic path built by _redis_param_builder
+        according to configured key layout. Without allocate id of group
+        read by _lookup_group_ids is passed, paths of group without id and
+        parameters without codes are skipped."""
+        if not self.compact_keys:
+            return {path: path for path in paths}
+        group_prefix = f"{self.prefix}{self._group_tag(group_name)}:"
+        parameters = [path.removeprefix(group_prefix) for path in paths]
+        if self.cluster:
+            # Group name is hash tag of key, group id is not used
+            group_id = self._group_tag(group_name)
+        elif allocate:
+            (group_id,) = await self._encode_group_ids([group_name])
+        if group_id is None:
+            return {}
+        if allocate:
+            codes = await self._encode_names(
+                parameters,
+                self._parameter_codes,
+                self._parameter_names,
+                (self.parameter_codes_key, self.parameter_names_key),
+                "parameter",
+            )
         else:
-            match parameter_value:
-                case bool():
-                    return (
-                        f"{self.prefix}{group_name}:{statistic_name}:{type(parameter_value).__name__}:"
-                        f"frequency:{parameter_name}",
-                        {entity_id: int(parameter_value)},
+            codes = await self._lookup_parameter_codes(parameters)
+        return {
+            path: f"{self.compact_prefix}{group_id}:{code}"
+            for path, code in zip(paths, codes)
+            if code is not None
+        }
+
+    async def _encode_group_ids(self, group_names: list[str]) -> list[str]:
+        if not self.compact_keys or self.cluster:
+            return []
+        return await self._encode_names(
+            group_names,
+            {},
+            self._group_names,
+            (self.group_ids_key, self.group_names_key),
+            "group",
+        )
+
+    async def _lookup_group_ids(
+        self, group_names: list[str]
+    ) -> list[str | None]:
+        """Ids of groups without allocation, None for group without id."""
+        if not self.compact_keys or self.cluster or not group_names:
+            return [None] * len(group_names)
+        group_ids = await self.redis.hmget(self.group_ids_key, group_names)
+        for group_name, group_id in zip(group_names, group_ids):
+            if group_id is not None:
+                self._group_names[group_id] = group_name
+        return group_ids
+
+    async def _lookup_parameter_codes(
+        self, parameters: list[str]
+    ) -> list[str | None]:
+        unknown = [
+            name
+            for name in dict.fromkeys(parameters)
+            if name not in self._parameter_codes
+        ]
+        if unknown:
+            codes = await self.redis.hmget(self.parameter_codes_key, unknown)
+            for name, code in zip(unknown, codes):
+                if code is not None:
+                    self._parameter_codes[name] = code
+                    self._parameter_names[code] = name
+        return [self._parameter_codes.get(name) for name in parameters]
+
+    async def _encode_names(
+        self,
+        names: list[str],
+        codes: dict[str, str],
+        names_by_code: dict[str, str],
+        keys: tuple[str, str],
+        sequence: str,
+    ) -> list[str]:
+        unknown = [name for name in dict.fromkeys(names) if name not in codes]
+        if unknown:
+            new_codes = await self._encode_names_script(
+                keys=[*keys, self.sequence_key], args=[sequence, *unknown]
+            )
+            for name, code in zip(unknown, new_codes):
+                codes[name] = code
+                names_by_code[code] = name
+        return [codes[name] for name in names]
+
+    async def _load_key_names(self, paths) -> None:
+        """Load group names and parameter names of compact keys which are
+        not cached yet."""
+        group_ids, codes = set(), set()
+        for path in paths:
+            if path.startswith(self.compact_prefix):
+                group_id, code = path.removeprefix(self.compact_prefix).rsplit(
+                    ":", 1
+                )
+                if group_id.startswith("{"):
+                    group_id = None
+                if group_id and group_id not in self._group_names:
+                    group_ids.add(group_id)
+                if code not in self._parameter_names:
+                    codes.add(code)
+        for ids, key, names_by_code, codes_by_name in (
+            # Ids of group names are not cached
+            (group_ids, self.group_names_key, self._group_names, {}),
+            (
+                codes,
+                self.parameter_names_key,
+                self._parameter_names,
+                self._parameter_codes,
+            ),
+        ):
+            if not ids:
+                continue
+            ids = list(ids)
+            for code, name in zip(ids, await self.redis.hmget(key, ids)):
+                if name is None:
+                    raise KeyError(f"Unknown compact key code: {code}")
+                names_by_code[code] = name
+                codes_by_name[name] = code
+
+    async def _register_keys(self, pipe, group_name: str, paths) -> None:
+        """Add statistic keys to the group index inside the same pipeline
+        (MULTI/EXEC) as the hset that creates them."""
+        paths = list(paths)
+        if not paths:
+            return
+        index_key = self._index_key(group_name)
+        await pipe.sadd(index_key, *paths)
+        if not self.cluster:
+            await pipe.hset(self.registry_key, group_name, index_key)
+        tprm_paths: dict[str, list[str]] = {}
+        for path in paths:
+            _, statistic_name, *_, parameter_name = self._split_key(path)
+            if statistic_name == "TPRM":
+                tprm_paths.setdefault(parameter_name, []).append(path)
+        for tprm_id, tprm_group_paths in tprm_paths.items():
+            await pipe.sadd(self._tprm_index_key(tprm_id), *tprm_group_paths)
+
+    async def _get_group_keys(self, group_name: str, client=None) -> list[str]:
+        paths = list(
+            await (client or self.redis).smembers(self._index_key(group_name))
+        )
+        await self._load_key_names(paths)
+        return paths
+
+    async def _get_many_group_keys(
+        self, group_names: list[str], client=None
+    ) -> dict[str, list[str]]:
+        result = {}
+        for chunk in self._chunks(list(dict.fromkeys(group_names))):
+            pipe = (client or self.redis).pipeline(transaction=False)
+            for group_name in chunk:
+                await pipe.smembers(self._index_key(group_name))
+            for group_name, paths in zip(chunk, await pipe.execute()):
+                result[group_name] = list(paths)
+                await self._load_key_names(paths)
+        return result
+
+    async def _start_migrations(self) -> None:
+        await self.migrate()
+        self._migration_task = asyncio.create_task(
+            self._migrate_in_background()
+        )
+
+    async def _migrate_in_background(self) -> None:
+        for attempt in range(1, self.migration_retries + 1):
+            try:
+                await self.migrate(background=True)
+                return
+            except Exception:
+                if attempt < self.migration_retries:
+                    await asyncio.sleep(
+                        attempt * self.app.config.redis.migration_lock_seconds
                     )
-                case datetime():
-                    pattern = "%Y-%m-%dT%H:%M:%S.%fZ"
-                    return (
-                        f"{self.prefix}{group_name}:{statistic_name}:{type(parameter_value).__name__}:"
-                        f"maximum:{parameter_name}",
-                        {entity_id: parameter_value.strftime(pattern)},
+        self.logger.error("Redis background migrations failed.")
+
+    async def migrate(self, background: bool = False) -> None:
+        """One-shot migrations of existing statistic keys. Each migration
+        runs once per version, applied versions are kept in meta hash.
+        Migrations run under lock, so keys are migrated by one instance,
+        other instances wait until lock is released. Lock is extended
+        while migrations run. Failed migration is marked in meta hash and
+        its error is raised, so application does not start on keys which
+        are partially migrated. background - run migrations of
+        background_migrations instead of the others."""
+        timeout = self.app.config.redis.migration_lock_seconds
+        lock = self.redis.lock(self.migration_lock_key, timeout=timeout)
+        keepalive = None
+        try:
+            await lock.acquire()
+            keepalive = asyncio.create_task(
+                self._extend_lock(lock, timeout / 3)
+            )
+            applied = await self.redis.hgetall(self.meta_key)
+            for name, (version, migration) in self.migrations.items():
+                if (name in self.background_migrations) != background:
+                    continue
+                current = applied.get(name, self.initial_versions.get(name))
+                if current == version:
+                    if name not in applied:
+                        await self.redis.hset(self.meta_key, name, version)
+                    continue
+                self.logger.info("Run redis migration: %s.", name)
+                try:
+                    total = await migration()
+                except Exception as ex:
+                    self.logger.error(
+                        "Redis migration %s error: %s: %s.", name, type(ex), ex
                     )
-                case date():
-                    pattern = "%Y-%m-%d"
-                    return (
-                        f"{self.prefix}{group_name}:{statistic_name}:{type(parameter_value).__name__}:"
-                        f"maximum:{parameter_name}",
-                        {entity_id: parameter_value.strftime(pattern)},
+                    await self.redis.hset(
+                        self.meta_key, f"{name}:failed", f"{version}: {ex!r}"
                     )
-                case int() | float():
-                    return (
-                        f"{self.prefix}{group_name}:{statistic_name}:{type(parameter_value).__name__}:"
-                        f"average:{parameter_name}",
-                        {entity_id: parameter_value},
+                    raise
+                await self.redis.hset(self.meta_key, name, version)
+                await self.redis.hdel(self.meta_key, f"{name}:failed")
+                self.logger.info(
+                    "Redis migration %s processed %d keys.", name, total
+                )
+        finally:
+            if keepalive is not None:
+                keepalive.cancel()
+                try:
+                    await lock.release()
+                except LockError as ex:
+                    self.logger.warning("Redis migration lock: %s.", ex)
+
+    async def _extend_lock(self, lock, interval: float) -> None:
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                await lock.reacquire()
+        except LockError as ex:
+            self.logger.warning("Redis migration lock is lost: %s.", ex)
+
+    async def _registered_groups(self) -> list[str]:
+        """Names of groups which have group index."""
+        if not self.cluster:
+            return await self.redis.hkeys(self.registry_key)
+        return [
+            index_key.removeprefix(self.index_prefix)[1:-1]
+            async for index_key in self.redis.scan_iter(
+                match=f"{self.index_prefix}*", count=1000
+            )
+        ]
+
+    async def drop_cluster_hashes(self) -> int:
+        """Version and registry hashes shared by all groups are replaced
+        by keys of every group in cluster mode."""
+        removed = 0
+        for key in (self.version_key, self.registry_key):
+            removed += await self.redis.unlink(key)
+        return removed
+
+    async def seed_version_sequence(self) -> int:
+        """Global version counter starts above versions of groups counted
+        per group before it, so they are not repeated."""
+        versions = [int(v) for v in await self.redis.hvals(self.version_key)]
+        if self.cluster:
+            async for key in self.redis.scan_iter(
+                match=f"{self.version_key}:*", count=1000
+            ):
+                versions.append(int(await self.redis.get(key) or 0))
+        top = max(versions, default=0)
+        current = int(await self.redis.get(self.version_sequence_key) or 0)
+        if top > current:
+            await self.redis.incrby(self.version_sequence_key, top - current)
+        return len(versions)
+
+    async def drop_sample_seen(self) -> int:
+        """Sample is restored from its members only."""
+        return await self.redis.unlink(self.sample_seen_key)
+
+    async def build_group_index(self, batch_size: int = 1000) -> int:
+        total = 0
+        batch: dict[str, list[str]] = {}
+        async for path in self.redis.scan_iter(
+            match=f"{self.prefix}*", count=batch_size
+        ):
+            group_name, *_ = self._split_key(path)
+            batch.setdefault(group_name, []).append(path)
+            total += 1
+            if total % batch_size == 0:
+                await self._flush_index_batch(batch)
+                batch = {}
+        await self._flush_index_batch(batch)
+        return total
+
+    async def build_tprm_index(self) -> int:
+        total = 0
+        group_names = await self._registered_groups()
+        for group_name in group_names:
+            paths = await self._get_group_keys(group_name)
+            await self._flush_index_batch({group_name: paths})
+            total += len(paths)
+        return total
+
+    async def build_compact_placeholders(self, batch_size: int = 100) -> int:
+        """Replace "None" field of every entity in placeholder keys
+        (type None) with one placeholder field."""
+        total = 0
+        group_names = await self._registered_groups()
+        for group_name in group_names:
+            paths = [
+                path
+                for path in await self._get_group_keys(group_name)
+                if self._split_key(path)[2] == "None"
+            ]
+            for start in range(0, len(paths), batch_size):
+                chunk = paths[start : start + batch_size]
+                pipe = self.redis.pipeline(transaction=False)
+                for path in chunk:
+                    await pipe.hlen(path)
+                lengths = await pipe.execute()
+                pipe = self._pipeline()
+                for path, length in zip(chunk, lengths):
+                    if length <= 1:
+                        continue
+                    await pipe.unlink(path, *self._companion_keys(path))
+                    await self._set_values(
+                        pipe=pipe,
+                        path=path,
+                        mapping={self.placeholder_field: "None"},
                     )
-                case str():
-                    return (
-                        f"{self.prefix}{group_name}:{statistic_name}:{type(parameter_value).__name__}:"
-                        f"frequency:{parameter_name}",
-                        {entity_id: parameter_value},
+                    total += 1
+                await pipe.execute()
+        return total
+
+    async def build_compact_keys(self, batch_size: int = 100) -> int:
+        """Rename statistic keys of legacy layout with their running
+        aggregates to compact layout."""
+        total = 0
+        group_names = await self._registered_groups()
+        for group_name in group_names:
+            paths = [
+                path
+                for path in await self._get_group_keys(group_name)
+                if path.startswith(self.prefix)
+            ]
+            for start in range(0, len(paths), batch_size):
+                chunk = paths[start : start + batch_size]
+                keys = await self._storage_keys(group_name, chunk)
+                pipe = self._pipeline()
+                for path, key in keys.items():
+                    await self._rename_keys_script(
+                        keys=[
+                            path,
+                            *self._companion_keys(path),
+                            key,
+                            *self._companion_keys(key),
+                        ],
+                        client=pipe,
                     )
-                case _:
-                    return (
-                        f"{self.prefix}{group_name}:{statistic_name}:None:frequency:{parameter_name}",
-                        {entity_id: "None"},
+                    _, statistic_name, *_, parameter_name = self._split_key(
+                        path
                     )
+                    if statistic_name == "TPRM":
+                        await pipe.srem(
+                            self._tprm_index_key(parameter_name), path
+                        )
+                await pipe.srem(self._index_key(group_name), *chunk)
+                await self._register_keys(
+                    pipe=pipe, group_name=group_name, paths=keys.values()
+                )
+                await pipe.execute()
+                total += len(chunk)
+        return total
+
+    async def build_aggregates(self, batch_size: int = 100) -> int:
+        """Rebuild running aggregates from statistic hashes."""
+        total = 0
+        group_names = await self._registered_groups()
+        for group_name in group_names:
+            paths = await self._get_group_keys(group_name)
+            for start in range(0, len(paths), batch_size):
+                chunk = paths[start : start + batch_size]
+                await self._rebuild_aggregates(chunk)
+                total += len(chunk)
+        return total
+
+    async def build_numeric_maximum(self, batch_size: int = 100) -> int:
+        """Convert dates and datetimes of maximum keys stored as ISO strings
+        to numbers and rebuild running aggregates of all numeric maximum
+        keys, which were kept in lex order."""
+        total = 0
+        group_names = await self._registered_groups()
+        for group_name in group_names:
+            paths = [
+                path
+                for path in await self._get_group_keys(group_name)
+                if self._script_aggregation(path) == "maximum_number"
+            ]
+            for start in range(0, len(paths), batch_size):
+                chunk = paths[start : start + batch_size]
+                await self._rebuild_aggregates(
+                    chunk,
+                    convert=lambda path, value: self._numeric_value(
+                        value, self._split_key(path)[2]
+                    ),
+                )
+                pipe = self.redis.pipeline(transaction=False)
+                await self._bump_version(pipe, group_name)
+                await pipe.execute()
+                total += len(chunk)
+        return total
+
+    async def build_value_codec(self, batch_size: int = 100) -> int:
+        """Convert numbers of average and maximum keys to configured codec
+        and rebuild their running aggregates."""
+        total = 0
+        group_names = await self._registered_groups()
+        for group_name in group_names:
+            paths = [
+                path
+                for path in await self._get_group_keys(group_name)
+                if self._script_aggregation(path)
+                in ("average", "maximum_number")
+            ]
+            for start in range(0, len(paths), batch_size):
+                chunk = paths[start : start + batch_size]
+                await self._rebuild_aggregates(
+                    chunk, convert=lambda _, value: self._codec_value(value)
+                )
+                pipe = self.redis.pipeline(transaction=False)
+                await self._bump_version(pipe, group_name)
+                await pipe.execute()
+                total += len(chunk)
+        return total
+
+    def _codec_value(self, value: str) -> str | bytes:
+        if value in EMPTY_VALUES:
+            return value
+        number = decode_value(value)
+        if self.binary_values:
+            return encode_number(float(number))
+        if isinstance(number, float):
+            return str(int(number)) if number.is_integer() else repr(number)
+        return number
+
+    @staticmethod
+    def _numeric_value(value: str, type_: str) -> str:
+        if (
+            value in EMPTY_VALUES
+            or is_binary(value)
+            or type_ not in ("datetime", "date")
+        ):
+            return value
+        try:
+            float(value)
+            return value
+        except ValueError:
+            pass
+        if type_ == "datetime":
+            return str(encode_maximum(datetime.fromisoformat(value)))
+        return str(encode_maximum(date.fromisoformat(value)))
+
+    async def _rebuild_aggregates(
+        self,
+        paths: list[str],
+        convert: Callable[[str, str], str | bytes] | None = None,
+    ) -> None:
+        """Rebuild running aggregates of statistic hashes by HSCAN batches of
+        rebuild_fields, so big hashes do not block Redis. Values are
+        converted by convert(path, value) in the same batches, values
+        changed since they were read are kept. Keys are read from their
+        values until their aggregates are rebuilt."""
+        cursors = dict.fromkeys(paths, 0)
+        while cursors:
+            batches: dict[str, dict] = {}
+            if convert is not None:
+                pipe = self.redis.pipeline(transaction=False)
+                for path, cursor in cursors.items():
+                    await pipe.hscan(path, cursor, count=self.rebuild_fields)
+                for path, (_, mapping) in zip(cursors, await pipe.execute()):
+                    batches[path] = mapping
+            pipe = self.redis.pipeline(transaction=False)
+            for path, cursor in cursors.items():
+                args = [
+                    self._script_aggregation(path),
+                    cursor,
+                    self.rebuild_fields,
+                ]
+                for entity_id, value in batches.get(path, {}).items():
+                    new = convert(path, value)
+                    if new != value:
+                        args.extend((entity_id, value, new))
+                await self._rebuild_aggregates_script(
+                    keys=[path, *self._companion_keys(path)],
+                    args=args,
+                    client=pipe,
+                )
+            cursors = {
+                path: int(cursor)
+                for path, cursor in zip(cursors, await pipe.execute())
+                if int(cursor)
+            }
+
+    async def _flush_index_batch(self, batch: dict[str, list[str]]) -> None:
+        if not batch:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        for group_name, paths in batch.items():
+            await self._register_keys(
+                pipe=pipe, group_name=group_name, paths=paths
+            )
+        await pipe.execute()
+
+    def _redis_param_builder(
+        self,
+        group_name: str,
+        statistic_name: str,
+        parameter_name: str,
+        parameter_value: T,
+        entity_id: int,
+    ) -> (str, dict[str, T]):
+        return param_path_and_mapping(
+            key_prefix=f"{self.prefix}{self._group_tag(group_name)}",
+            statistic_name=statistic_name,
+            parameter_name=parameter_name,
+            parameter_value=parameter_value,
+            entity_id=entity_id,
+        )
 
     def _get_aggregated_data(self, prm: str, data: list) -> dict:
         try:
-            result: dict = {}
-            *_, _, type_, agg, name = prm.split(":")
-            if all([True if x in ["None", None] else False for x in data]):
-                result |= {name: None}
-                return result
-            if agg == "frequency":
-                result |= {name: max(set(data), key=data.count)}
-            elif agg == "average":
-                data_from_redis = [float(el) for el in data]
-                if type_ == "int":
-                    result |= {
-                        name: int(sum(data_from_redis) / len(data_from_redis))
-                    }
-                elif type_ == "float":
-                    result |= {
-                        name: round(
-                            sum(data_from_redis) / len(data_from_redis), 2
-                        )
-                    }
-            elif agg == "maximum":
-                result |= {name: max(data)}
-            else:
-                raise ValueError(f"Wrong aggregation data for: {prm}: {data}")
-            return result
+            *_, type_, agg, name = self._split_key(prm)
+            aggregator = StatisticAggregator(agg=agg, type_=type_).update(data)
+            return self._aggregated_result(name, aggregator)
         except Exception as ex:
             self.logger.exception(ex)
             raise
 
+    @staticmethod
+    def _aggregated_result(
+        name: str, aggregator: StatisticAggregator
+    ) -> dict[str, Any]:
+        if not aggregator.has_result and not aggregator.is_empty:
+            return {}
+        return {name: aggregator.result()}
+
     def generate_empty_statistic(self, group_schema: GroupSchema):
         raw_data = {}
         for model_name, field_info in self.app.store.group_scheme[
@@ -0,0 +1,138 @@
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Iterable, Self
+
+AGGREGATIONS = ("frequency", "average", "maximum")
+EMPTY_VALUES = (None, "None")
+# Maximum of these types is stored as number: datetime as microseconds
+# since epoch, date as ordinal
+NUMERIC_MAXIMUM_TYPES = ("int", "float", "datetime", "date")
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_maximum(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return (value - EPOCH) // timedelta(microseconds=1)
+    if isinstance(value, date):
+        return value.toordinal()
+    return value
+
+
+def to_number(value: Any) -> float:
+    if isinstance(value, (datetime, date)):
+        return encode_maximum(value)
+    return float(value)
+
+
+def decode_maximum(value: Any, type_: str) -> Any:
+    if value in EMPTY_VALUES:
+        return None
+    number = float(value)
+    if type_ == "datetime":
+        return EPOCH + timedelta(microseconds=int(number))
+    if type_ == "date":
+        return date.fromordinal(int(number))
+    if type_ == "int":
+        return int(number)
+    return number
+
+
+def script_aggregation(agg: str, type_: str) -> str:
+    """Aggregation name passed to Lua scripts, numeric maximum is kept in
+    sorted set by score instead of lex order."""
+    if agg == "maximum" and type_ in NUMERIC_MAXIMUM_TYPES:
+        return "maximum_number"
+    return agg
+
+
+class StatisticAggregator:
+    """Single pass aggregation of one statistic parameter.
+
+    Values may be added in chunks with update() and aggregators built for
+    different chunks may be combined with merge(), result is the same as
+    for aggregation of all values at once."""
+
+    __slots__ = (
+        "agg",
+        "type_",
+        "numeric",
+        "total",
+        "empty",
+        "sum",
+        "counter",
+        "maximum",
+    )
+
+    def __init__(self, agg: str, type_: str):
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Wrong aggregation: {agg}")
+        self.agg = agg
+        self.type_ = type_
+        self.numeric = agg == "maximum" and type_ in NUMERIC_MAXIMUM_TYPES
+        self.total = 0
+        # Number of None values
+        self.empty = 0
+        self.sum = 0.0
+        self.counter: Counter = Counter()
+        self.maximum: Any = None
+
+    def update(self, values: Iterable) -> Self:
+        if not isinstance(values, list):
+            values = list(values)
+        if not values:
+            return self
+        # list.count, sum, map, max and Counter loop in C
+        empty = sum(map(values.count, EMPTY_VALUES))
+        self.total += len(values)
+        self.empty += empty
+        if empty == len(values):
+            return self
+        if self.agg == "frequency":
+            self.counter.update(values)
+        elif self.agg == "average":
+            self.sum += sum(map(float, values))
+        elif self.numeric:
+            self._update_maximum(
+                max(to_number(el) for el in values if el not in EMPTY_VALUES)
+            )
+        else:
+            self._update_maximum(max(values))
+        return self
+
+    def merge(self, other: "StatisticAggregator") -> Self:
+        self.total += other.total
+        self.empty += other.empty
+        self.sum += other.sum
+        self.counter.update(other.counter)
+        if other.total > other.empty:
+            self._update_maximum(other.maximum)
+        return self
+
+    def _update_maximum(self, value: Any) -> None:
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def is_empty(self) -> bool:
+        """All values are None."""
+        return self.empty == self.total
+
+    @property
+    def has_result(self) -> bool:
+        return self.agg != "average" or self.type_ in ("int", "float")
+
+    def result(self) -> Any:
+        if self.is_empty:
+            return None
+        if self.agg == "frequency":
+            return self.counter.most_common(1)[0][0]
+        if self.agg == "average":
+            average = self.sum / self.total
+            if self.type_ == "int":
+                return int(average)
+            return round(average, 2)
+        if self.numeric:
+            return decode_maximum(self.maximum, self.type_)
+        return self.maximum
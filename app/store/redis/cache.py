@@ -0,0 +1,50 @@
+from collections import OrderedDict
+from typing import Hashable
+
+from pydantic import BaseModel
+
+
+class StatisticCache:
+    """LRU cache of built statistic models.
+
+    Entry is valid only for group version it was built for. Version is
+    stored in Redis and bumped on every write, so entries of other replicas
+    are invalidated too."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict[Hashable, tuple[str | None, BaseModel]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: str | None) -> BaseModel | None:
+        item = self._items.get(key)
+        if item is None or item[0] != version:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, version: str | None, value: BaseModel) -> None:
+        if self.max_size <= 0:
+            return
+        self._items[key] = (version, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        requests = self.hits + self.misses
+        return {
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / requests if requests else 0.0,
+        }
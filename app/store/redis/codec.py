@@ -0,0 +1,42 @@
+import struct
+from typing import Any
+
+# Binary number is a marker byte followed by little endian double. Text
+# values never start with the marker.
+MARKER = "\x00"
+_DOUBLE = struct.Struct("<d")
+# Client decodes responses with surrogateescape, so bytes of binary values
+# which are not valid UTF-8 are restored by encoding with the same handler
+_ENCODING = ("utf-8", "surrogateescape")
+
+
+def encode_number(value: int | float) -> bytes:
+    return MARKER.encode() + _DOUBLE.pack(value)
+
+
+def is_binary(value: Any) -> bool:
+    if isinstance(value, bytes):
+        return value[:1] == MARKER.encode()
+    return isinstance(value, str) and value[:1] == MARKER
+
+
+def decode_value(value: Any) -> Any:
+    if not is_binary(value):
+        return value
+    if isinstance(value, str):
+        value = value.encode(*_ENCODING)
+    return _DOUBLE.unpack(value[1:])[0]
+
+
+def decode_values(values: list[str]) -> list:
+    """Binary numbers of values read from Redis are decoded with one unpack
+    call, other values are kept as is."""
+    positions = [i for i, value in enumerate(values) if value[:1] == MARKER]
+    if not positions:
+        return values
+    packed = "".join(values[i][1:] for i in positions).encode(*_ENCODING)
+    numbers = struct.unpack(f"<{len(positions)}d", packed)
+    result = list(values)
+    for i, number in zip(positions, numbers):
+        result[i] = number
+    return result
@@ -0,0 +1,178 @@
+"""Building of statistic hash mappings and partial aggregates.
+
+Functions here depend only on their arguments, so chunks of entities may
+be built in worker threads or processes of statistic executor.
+"""
+
+from datetime import date, datetime
+from typing import NamedTuple, Union
+
+from store.grpc.descriptor import StatisticDescriptor
+from store.redis.aggregation import StatisticAggregator, encode_maximum
+
+mapper = {
+    "Count": "frequency",
+    "endDate": "maximum",
+    "id": "maximum",
+    "processInstanceId": "frequency",
+    "processInstanceKey": "frequency",
+    "processVersion": "maximum",
+    "startDate": "maximum",
+    "tmo_id": "frequency",
+    "version": "frequency",
+    "name": "maximum",
+}
+EXCLUDED_PARAMETERS = ("sortValues", "operations", "params")
+NECESSARY_PARAMETERS = ("active", "tmo_id")
+
+T = Union[bool, date, datetime, int, float, str, None]
+
+
+class ChunkSpec(NamedTuple):
+    # Prefix of statistic keys with group name
+    key_prefix: str
+    is_aggregate: bool
+    # Written instead of "None" for every entity in not necessary parameters
+    # of non aggregate group, None - full placeholders
+    placeholder_field: str | None = None
+    # Entities are Search rows converted to records with descriptor,
+    # otherwise dumps of statistic records, see dump_records
+    descriptor: StatisticDescriptor | None = None
+    # Rows are validated into statistic models, otherwise only their fields
+    # used by statistic are validated, see validate_dicts
+    full_validation: bool = True
+
+
+def dump_records(records: list) -> list[dict]:
+    return [
+        record.model_dump(by_alias=True, exclude={"groupName"})
+        for record in records
+    ]
+
+
+def build_chunk(
+    spec: ChunkSpec, entities: list
+) -> tuple[dict[str, dict], dict[str, StatisticAggregator]]:
+    """Hash mapping and partial aggregate for every statistic path of
+    chunk of entities."""
+    if spec.descriptor is not None and spec.full_validation:
+        entities = dump_records(
+            spec.descriptor.validate_many(entities, group_name="")
+        )
+    elif spec.descriptor is not None:
+        entities = spec.descriptor.validate_dicts(entities)
+    mappings: dict[str, dict] = {}
+    raw_data: dict[str, list] = {}
+    for entity in entities:
+        entity_id = entity["MO"]["id"]
+        # TMO, MO, TPRM, Camunda
+        for statistic_name, statistic_value in entity.items():
+            for parameter_name, parameter_value in statistic_value.items():
+                if parameter_name in EXCLUDED_PARAMETERS or not parameter_value:
+                    continue
+                if spec.is_aggregate or parameter_name in NECESSARY_PARAMETERS:
+                    path, mapping = param_path_and_mapping(
+                        key_prefix=spec.key_prefix,
+                        statistic_name=statistic_name,
+                        parameter_name=parameter_name,
+                        parameter_value=parameter_value,
+                        entity_id=entity_id,
+                    )
+                else:
+                    path, mapping = param_path_and_mapping(
+                        key_prefix=spec.key_prefix,
+                        statistic_name=statistic_name,
+                        parameter_name=parameter_name,
+                        parameter_value=None,
+                        entity_id=entity_id,
+                    )
+                    if spec.placeholder_field is not None:
+                        mapping = {spec.placeholder_field: "None"}
+                mappings.setdefault(path, {}).update(mapping)
+                value = (
+                    parameter_value
+                    if spec.is_aggregate or parameter_name == "tmo_id"
+                    else None
+                )
+                raw_data.setdefault(path, []).append(value)
+    aggregators = {}
+    for path, values in raw_data.items():
+        *_, type_, agg, _ = path.rsplit(":", 4)
+        aggregators[path] = StatisticAggregator(agg=agg, type_=type_).update(
+            values
+        )
+    return mappings, aggregators
+
+
+def param_path_and_mapping(
+    key_prefix: str,
+    statistic_name: str,
+    parameter_name: str,
+    parameter_value: T,
+    entity_id: int,
+) -> (str, dict[str, T]):
+    """Statistic path of parameter and its hash mapping for entity.
+    key_prefix is prefix of statistic keys with group name."""
+    # Strict mapping
+    if mapper.get(parameter_name):
+        if isinstance(parameter_value, bool):
+            return (
+                f"{key_prefix}:{statistic_name}:{type(parameter_value).__name__}:"
+                f"{mapper[parameter_name]}:{parameter_name}",
+                {entity_id: int(parameter_value)},
+            )
+        elif isinstance(parameter_value, datetime):
+            pattern = "%Y-%m-%dT%H:%M:%S.%fZ"
+            if mapper[parameter_name] == "maximum":
+                value = encode_maximum(parameter_value)
+            else:
+                value = parameter_value.strftime(pattern)
+            return (
+                f"{key_prefix}:{statistic_name}:{type(parameter_value).__name__}:"
+                f"{mapper[parameter_name]}:{parameter_name}",
+                {entity_id: value},
+            )
+        elif parameter_value is None:
+            return (
+                f"{key_prefix}:{statistic_name}:None:{mapper[parameter_name]}"
+                f":{parameter_name}",
+                {entity_id: "None"},
+            )
+        else:
+            return (
+                f"{key_prefix}:{statistic_name}:{type(parameter_value).__name__}:"
+                f"{mapper[parameter_name]}:{parameter_name}",
+                {entity_id: parameter_value},
+            )
+    # Mapping on type
+    else:
+        match parameter_value:
+            case bool():
+                return (
+                    f"{key_prefix}:{statistic_name}:{type(parameter_value).__name__}:"
+                    f"frequency:{parameter_name}",
+                    {entity_id: int(parameter_value)},
+                )
+            case datetime() | date():
+                return (
+                    f"{key_prefix}:{statistic_name}:{type(parameter_value).__name__}:"
+                    f"maximum:{parameter_name}",
+                    {entity_id: encode_maximum(parameter_value)},
+                )
+            case int() | float():
+                return (
+                    f"{key_prefix}:{statistic_name}:{type(parameter_value).__name__}:"
+                    f"average:{parameter_name}",
+                    {entity_id: parameter_value},
+                )
+            case str():
+                return (
+                    f"{key_prefix}:{statistic_name}:{type(parameter_value).__name__}:"
+                    f"frequency:{parameter_name}",
+                    {entity_id: parameter_value},
+                )
+            case _:
+                return (
+                    f"{key_prefix}:{statistic_name}:None:frequency:{parameter_name}",
+                    {entity_id: "None"},
+                )
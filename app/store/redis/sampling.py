@@ -0,0 +1,58 @@
+import heapq
+from hashlib import blake2b
+from typing import Iterable
+
+
+class ReservoirSampler:
+    """Uniform sample of at most size entity ids from a stream of unknown
+    length (bottom-k sampling).
+
+    Every id has a pseudo-random priority derived from the id itself, the
+    sample holds ids with the smallest priorities. An id offered again
+    always gets the same decision, so elements updated or added to group
+    again are never counted twice and no state except members is kept.
+    Sampler may be restored from members of previous streams."""
+
+    def __init__(self, size: int, members: Iterable[str] = (), salt: str = ""):
+        self.size = size
+        self.salt = salt
+        # Max-heap of (-priority, entity id)
+        self._heap = [(-self.priority(member), member) for member in members]
+        heapq.heapify(self._heap)
+        self._members = {member for _, member in self._heap}
+        self.added: set[str] = set()
+        # Members which were replaced, their values have to be removed
+        self.evicted: set[str] = set()
+        while len(self._heap) > self.size:
+            self._evict()
+
+    @property
+    def members(self) -> list[str]:
+        return [member for _, member in self._heap]
+
+    def priority(self, entity_id: str) -> int:
+        digest = blake2b(
+            f"{self.salt}:{entity_id}".encode(), digest_size=8
+        ).digest()
+        return int.from_bytes(digest, "big")
+
+    def offer(self, entity_id: str) -> bool:
+        """Returns True if entity is in sample."""
+        if entity_id in self._members:
+            return True
+        priority = self.priority(entity_id)
+        if len(self._heap) >= self.size:
+            if self.size == 0 or priority >= -self._heap[0][0]:
+                return False
+            self._evict()
+        heapq.heappush(self._heap, (-priority, entity_id))
+        self._members.add(entity_id)
+        self.added.add(entity_id)
+        self.evicted.discard(entity_id)
+        return True
+
+    def _evict(self) -> None:
+        _, victim = heapq.heappop(self._heap)
+        self._members.discard(victim)
+        self.added.discard(victim)
+        self.evicted.add(victim)
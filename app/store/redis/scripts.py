@@ -0,0 +1,392 @@
+"""Lua scripts executed by RedisAccessor.
+
+Each statistic hash (entity id -> value) has companion keys with running
+aggregates, which are updated in the same script as the hash itself.
+They are passed to scripts as four consecutive KEYS starting at ``base``:
+
+* KEYS[base] statistic hash
+* KEYS[base + 1] hash with ``sum`` and ``count`` for ``average``
+* KEYS[base + 2] sorted set value -> number of entities for ``frequency``
+  and ``maximum``
+* KEYS[base + 3] sorted set of distinct values for ``maximum``, lex order
+  (score 0) or numeric order (score is value) for ``maximum_number``
+
+``maximum_number`` is ``maximum`` of values stored as numbers.
+
+Hash of approximate group holds only entities of sample, ``average`` hash
+keeps ``rest_sum`` and ``rest_count`` of entities out of sample as well.
+
+Aggregates of hash are rebuilt in batches while field ``building`` is set
+in its ``average`` hash. Fields counted by rebuild are marked there, value of
+field which is not marked is not counted in aggregates yet.
+
+Numbers are stored as text or in binary form: byte 0 followed by little
+endian double, see codec.py.
+"""
+
+NUMBER_FUNCTIONS = """
+local function to_number(value)
+    if #value ~= 9 or string.byte(value, 1) ~= 0 then
+        return tonumber(value)
+    end
+    local b1, b2, b3, b4, b5, b6, b7, b8 = string.byte(value, 2, 9)
+    local sign = 1
+    if b8 > 127 then
+        sign = -1
+    end
+    local exponent = (b8 % 128) * 16 + math.floor(b7 / 16)
+    local mantissa = b7 % 16
+    for _, b in ipairs({b6, b5, b4, b3, b2, b1}) do
+        mantissa = mantissa * 256 + b
+    end
+    if exponent == 2047 then
+        return nil
+    elseif exponent == 0 then
+        return sign * mantissa * 2 ^ -1074
+    end
+    return sign * (mantissa + 2 ^ 52) * 2 ^ (exponent - 1075)
+end
+"""
+
+AGGREGATE_FUNCTIONS = (
+    NUMBER_FUNCTIONS
+    + """
+local function agg_add(base, agg, value)
+    if agg == 'average' then
+        local number = to_number(value)
+        if number then
+            redis.call('HINCRBYFLOAT', KEYS[base + 1], 'sum', number)
+            redis.call('HINCRBY', KEYS[base + 1], 'count', 1)
+        end
+    else
+        redis.call('ZINCRBY', KEYS[base + 2], 1, value)
+        if agg == 'maximum' then
+            redis.call('ZADD', KEYS[base + 3], 0, value)
+        elseif agg == 'maximum_number' and to_number(value) then
+            redis.call('ZADD', KEYS[base + 3], to_number(value), value)
+        end
+    end
+end
+
+local function agg_remove(base, agg, value)
+    if agg == 'average' then
+        local number = to_number(value)
+        if number then
+            redis.call('HINCRBYFLOAT', KEYS[base + 1], 'sum', -number)
+            if redis.call('HINCRBY', KEYS[base + 1], 'count', -1) <= 0 then
+                redis.call('HDEL', KEYS[base + 1], 'sum', 'count')
+            end
+        end
+    else
+        local count = redis.call('ZINCRBY', KEYS[base + 2], -1, value)
+        if tonumber(count) <= 0 then
+            redis.call('ZREM', KEYS[base + 2], value)
+            if agg ~= 'frequency' then
+                redis.call('ZREM', KEYS[base + 3], value)
+            end
+        end
+    end
+end
+
+-- Value of entity evicted from sample stays in totals of average.
+local function agg_evict(base, agg, value)
+    if agg == 'average' then
+        local number = to_number(value)
+        if number then
+            redis.call('HINCRBYFLOAT', KEYS[base + 1], 'rest_sum', number)
+            redis.call('HINCRBY', KEYS[base + 1], 'rest_count', 1)
+        end
+    end
+end
+
+local function agg_building(base)
+    return redis.call('HEXISTS', KEYS[base + 1], 'building') == 1
+end
+
+-- Mark field as counted, returns whether its old value was counted.
+local function agg_counted(base, building, field)
+    return not building
+        or redis.call('HSETNX', KEYS[base + 1], 'counted:' .. field, 1) == 0
+end
+"""
+)
+
+# KEYS[1..4] statistic hash with companions.
+# ARGV[1] aggregation, ARGV[2..] entity id, value pairs.
+# Returns number of changed fields.
+SET_VALUES = (
+    AGGREGATE_FUNCTIONS
+    + """
+local agg = ARGV[1]
+local building = agg_building(1)
+local changed = 0
+for i = 2, #ARGV, 2 do
+    local field, value = ARGV[i], ARGV[i + 1]
+    local old = redis.call('HGET', KEYS[1], field)
+    if old ~= value then
+        if agg_counted(1, building, field) and old then
+            agg_remove(1, agg, old)
+        end
+        redis.call('HSET', KEYS[1], field, value)
+        agg_add(1, agg, value)
+        changed = changed + 1
+    end
+end
+return changed
+"""
+)
+
+# Update value of entity in statistic hashes of many groups, only hashes
+# which already contain the entity are updated.
+# KEYS statistic hashes with companions.
+# ARGV[1] aggregation, ARGV[2] entity id, ARGV[3] value,
+# ARGV[4..] group name for every statistic hash.
+# Returns names of changed groups.
+UPDATE_IF_MEMBER = (
+    AGGREGATE_FUNCTIONS
+    + """
+local agg, field, value = ARGV[1], ARGV[2], ARGV[3]
+local changed = {}
+for k = 1, #KEYS / 4 do
+    local base = 1 + (k - 1) * 4
+    local old = redis.call('HGET', KEYS[base], field)
+    if old and old ~= value then
+        if agg_counted(base, agg_building(base), field) then
+            agg_remove(base, agg, old)
+        end
+        redis.call('HSET', KEYS[base], field, value)
+        agg_add(base, agg, value)
+        changed[#changed + 1] = ARGV[3 + k]
+    end
+end
+return changed
+"""
+)
+
+# Remove entities from many statistic hashes of one group.
+# KEYS[1] group index, KEYS[2..] statistic hashes with companions.
+# ARGV[1] 1 when entities are evicted from sample, ARGV[2..n + 1]
+# aggregation for every statistic hash, ARGV[n + 2..] entity ids.
+# Hashes left without fields are removed from group index with their
+# companions.
+# Returns hashes left without fields.
+DELETE_VALUES = (
+    AGGREGATE_FUNCTIONS
+    + """
+local total = (#KEYS - 1) / 4
+local evict = ARGV[1] == '1'
+local emptied = {}
+for k = 1, total do
+    local base = 2 + (k - 1) * 4
+    local agg = ARGV[k + 1]
+    local building = agg_building(base)
+    for i = total + 2, #ARGV do
+        local old = redis.call('HGET', KEYS[base], ARGV[i])
+        if old then
+            redis.call('HDEL', KEYS[base], ARGV[i])
+            if agg_counted(base, building, ARGV[i]) then
+                agg_remove(base, agg, old)
+            end
+            if evict then
+                agg_evict(base, agg, old)
+            end
+        end
+    end
+    if redis.call('EXISTS', KEYS[base]) == 0 then
+        redis.call('DEL', KEYS[base + 1], KEYS[base + 2], KEYS[base + 3])
+        redis.call('SREM', KEYS[1], KEYS[base])
+        emptied[#emptied + 1] = KEYS[base]
+    end
+end
+return emptied
+"""
+)
+
+# Remove placeholder hashes of group which has no entities left.
+# KEYS[1] group index, KEYS[2..] statistic hashes with companions, which
+# must be all hashes of group index.
+# ARGV[1] placeholder field.
+# Nothing is removed when any hash holds entity or index has other hashes.
+# Returns removed hashes.
+DROP_PLACEHOLDERS = """
+local total = (#KEYS - 1) / 4
+if redis.call('SCARD', KEYS[1]) ~= total then
+    return {}
+end
+local removed = {}
+for k = 1, total do
+    local key = KEYS[2 + (k - 1) * 4]
+    if redis.call('HLEN', key) ~= 1
+        or redis.call('HEXISTS', key, ARGV[1]) == 0 then
+        return {}
+    end
+    removed[k] = key
+end
+for i = 1, #KEYS do
+    redis.call('DEL', KEYS[i])
+end
+return removed
+"""
+
+# Rebuild running aggregates of statistic hash by one HSCAN batch, so big
+# hashes do not block Redis. Converted values are replaced before batch is
+# counted, value is replaced only when it was not changed since it was read.
+# KEYS[1..4] statistic hash with companions.
+# ARGV[1] aggregation, ARGV[2] HSCAN cursor, 0 starts rebuild, ARGV[3] HSCAN
+# count, ARGV[4..] entity id, old value, new value triples.
+# Totals of entities out of sample are kept.
+# Returns next cursor, 0 when aggregates are rebuilt.
+REBUILD_AGGREGATES = (
+    AGGREGATE_FUNCTIONS
+    + """
+local agg, cursor = ARGV[1], ARGV[2]
+local function keep(fields)
+    local values = redis.call('HMGET', KEYS[2], unpack(fields))
+    redis.call('UNLINK', KEYS[2])
+    for i, field in ipairs(fields) do
+        if values[i] then
+            redis.call('HSET', KEYS[2], field, values[i])
+        end
+    end
+end
+if cursor == '0' then
+    keep({'rest_sum', 'rest_count'})
+    redis.call('DEL', KEYS[3], KEYS[4])
+    redis.call('HSET', KEYS[2], 'building', 1)
+end
+for i = 4, #ARGV, 3 do
+    local field, old, new = ARGV[i], ARGV[i + 1], ARGV[i + 2]
+    if redis.call('HGET', KEYS[1], field) == old then
+        redis.call('HSET', KEYS[1], field, new)
+        if agg_counted(1, true, field) then
+            agg_remove(1, agg, old)
+        end
+        agg_add(1, agg, new)
+    end
+end
+local reply = redis.call('HSCAN', KEYS[1], cursor, 'COUNT', ARGV[3])
+local items = reply[2]
+for i = 1, #items, 2 do
+    if not agg_counted(1, true, items[i]) then
+        agg_add(1, agg, items[i + 1])
+    end
+end
+if reply[1] == '0' then
+    keep({'sum', 'count', 'rest_sum', 'rest_count'})
+end
+return reply[1]
+"""
+)
+
+# Server side aggregation of statistic hashes.
+# KEYS statistic hashes, ARGV aggregation for every key.
+# Returns one value per key: average as string, most frequent value or
+# maximum value. nil when key is empty or contains only None values.
+AGGREGATE_STATISTIC = (
+    NUMBER_FUNCTIONS
+    + """
+local result = {}
+for i, key in ipairs(KEYS) do
+    local agg = ARGV[i]
+    local values = redis.call('HVALS', key)
+    local value = false
+    local only_none = true
+    for _, item in ipairs(values) do
+        if item ~= 'None' then
+            only_none = false
+            break
+        end
+    end
+    if not only_none then
+        if agg == 'average' then
+            local total = 0
+            for _, item in ipairs(values) do
+                total = total + to_number(item)
+            end
+            value = string.format('%.17g', total / #values)
+        elseif agg == 'frequency' then
+            local counts = {}
+            local best = 0
+            for _, item in ipairs(values) do
+                local count = (counts[item] or 0) + 1
+                counts[item] = count
+                if count > best then
+                    best = count
+                    value = item
+                end
+            end
+        elseif agg == 'maximum' then
+            for _, item in ipairs(values) do
+                if not value or item > value then
+                    value = item
+                end
+            end
+        elseif agg == 'maximum_number' then
+            local best
+            for _, item in ipairs(values) do
+                local number = to_number(item)
+                if number and (not best or number > best) then
+                    best = number
+                    value = item
+                end
+            end
+        else
+            return redis.error_reply('Wrong aggregation for: ' .. key)
+        end
+    end
+    result[i] = value
+end
+return result
+"""
+)
+
+# Intern names as short numeric codes.
+# KEYS[1] hash name -> code, KEYS[2] hash code -> name, KEYS[3] sequences.
+# ARGV[1] sequence field, ARGV[2..] names.
+# Returns code for every name, new codes are allocated from sequence.
+ENCODE_NAMES = """
+local codes = {}
+for i = 2, #ARGV do
+    local code = redis.call('HGET', KEYS[1], ARGV[i])
+    if not code then
+        code = tostring(redis.call('HINCRBY', KEYS[3], ARGV[1], 1))
+        redis.call('HSET', KEYS[1], ARGV[i], code)
+        redis.call('HSET', KEYS[2], code, ARGV[i])
+    end
+    codes[i - 1] = code
+end
+return codes
+"""
+
+# Rename existing keys, first half of KEYS are sources, second half
+# destinations. Returns number of renamed keys.
+RENAME_KEYS = """
+local total = #KEYS / 2
+local renamed = 0
+for i = 1, total do
+    if redis.call('EXISTS', KEYS[i]) == 1 then
+        redis.call('RENAME', KEYS[i], KEYS[total + i])
+        renamed = renamed + 1
+    end
+end
+return renamed
+"""
+
+# Write statistic snapshot only while group has version it was built for,
+# so snapshot of group purged in the meantime is not left behind.
+# KEYS[1] version hash (ARGV[1] is group name) or version key (ARGV[1] is
+# empty), KEYS[2] snapshot. ARGV[2] version, ARGV[3] snapshot data.
+# Returns 1 when snapshot is written.
+WRITE_SNAPSHOT = """
+local version
+if ARGV[1] == '' then
+    version = redis.call('GET', KEYS[1])
+else
+    version = redis.call('HGET', KEYS[1], ARGV[1])
+end
+if version ~= ARGV[2] then
+    return 0
+end
+redis.call('HSET', KEYS[2], 'version', ARGV[2], 'data', ARGV[3])
+return 1
+"""
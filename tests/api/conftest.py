@@ -0,0 +1,6 @@
+import os
+
+# Settings of application are read on import of api modules, database and
+# Redis of tests are set by fixtures
+os.environ.setdefault("DB_PASS", "password")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
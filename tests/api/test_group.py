@@ -0,0 +1,131 @@
+import json
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from api import utils
+from api.api_v1.endpoints.group import router
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from models.model_group import GroupModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from store.redis.accessor import RedisAccessor
+
+from tests.utils.utils import GroupStatistic, write_statistic
+
+
+@pytest_asyncio.fixture
+async def client(
+    async_session: AsyncSession, redis_accessor: RedisAccessor
+) -> AsyncIterator[AsyncClient]:
+    """Client of group endpoints, application state is set as it is set
+    by lifespan of main application."""
+    redis_accessor.app.store.group_scheme = {"1": GroupStatistic}
+    app = FastAPI()
+    app.include_router(router)
+
+    async def get_session() -> AsyncIterator[AsyncSession]:
+        yield async_session
+
+    app.dependency_overrides[utils.get_session] = get_session
+    lifespan_app = redis_accessor.app
+    lifespan_app.store.redis = redis_accessor
+
+    async def asgi(scope, receive, send):
+        scope["state"] = {"lifespan_app": lifespan_app}
+        await app(scope, receive, send)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=asgi), base_url="http://127.0.0.2"
+    ) as client:
+        yield client
+
+
+def statistic_lines(text: str) -> dict[str, dict]:
+    lines = [json.loads(line) for line in text.splitlines()]
+    return {line["group_name"]: line["statistic"] for line in lines}
+
+
+class TestGroupsStatistic:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_exact_and_approximate_groups(
+        self,
+        client: AsyncClient,
+        async_session: AsyncSession,
+        redis_accessor: RedisAccessor,
+        predefined_group: list[GroupModel],
+    ) -> None:
+        exact, approximate = predefined_group
+        approximate.is_approximate = True
+        await async_session.flush()
+        await write_statistic(redis_accessor, exact.group_name, {1: 2, 2: 4})
+        await write_statistic(
+            redis_accessor,
+            approximate.group_name,
+            {1: 2},
+            rest_sizes=[4, 6, 8],
+        )
+
+        response = await client.post(
+            "/groups/statistics/",
+            json={
+                "group_names": [
+                    exact.group_name,
+                    approximate.group_name,
+                    "missing",
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert statistic_lines(response.text) == {
+            exact.group_name: {
+                "groupName": exact.group_name,
+                "MO": {"tmo_id": None, "size": 3, "name": "a"},
+            },
+            approximate.group_name: {
+                "groupName": approximate.group_name,
+                "MO": {"tmo_id": None, "size": 5, "name": "a"},
+            },
+        }
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_groups_of_tmo(
+        self,
+        client: AsyncClient,
+        redis_accessor: RedisAccessor,
+        predefined_group: list[GroupModel],
+    ) -> None:
+        await write_statistic(
+            redis_accessor, predefined_group[0].group_name, {1: 2}
+        )
+
+        response = await client.post("/groups/statistics/", json={"tmo_id": 1})
+
+        assert response.status_code == 200
+        lines = statistic_lines(response.text)
+        assert lines[predefined_group[0].group_name]["MO"]["size"] == 2
+        # Group without statistic keys gets default statistic
+        assert lines[predefined_group[1].group_name]["MO"] == {
+            "tmo_id": 1,
+            "size": None,
+            "name": None,
+        }
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_missing_groups(
+        self, client: AsyncClient, predefined_group: list[GroupModel]
+    ) -> None:
+        response = await client.post(
+            "/groups/statistics/", json={"group_names": ["missing"]}
+        )
+
+        assert response.status_code == 200
+        assert response.text == ""
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_empty_filter(self, client: AsyncClient) -> None:
+        response = await client.post("/groups/statistics/", json={})
+
+        assert response.status_code == 422
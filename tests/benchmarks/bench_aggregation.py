@@ -0,0 +1,43 @@
+"""Micro-benchmark of statistic aggregation.
+
+Run from repository root: PYTHONPATH=app python tests/benchmarks/bench_aggregation.py
+"""
+
+import random
+import timeit
+
+from store.redis.aggregation import StatisticAggregator
+
+SIZE = 100_000
+
+
+def legacy_frequency(data: list):
+    if all([True if x in ["None", None] else False for x in data]):
+        return None
+    return max(set(data), key=data.count)
+
+
+def single_pass_frequency(data: list):
+    return (
+        StatisticAggregator(agg="frequency", type_="str").update(data).result()
+    )
+
+
+def main() -> None:
+    random.seed(0)
+    for distinct in (10, 100, 1_000):
+        data = [f"value_{random.randrange(distinct)}" for _ in range(SIZE)]
+        for name, function in (
+            ("legacy", legacy_frequency),
+            ("single pass", single_pass_frequency),
+        ):
+            number = 1 if name == "legacy" and distinct > 10 else 5
+            seconds = timeit.timeit(lambda: function(data), number=number)
+            print(
+                f"frequency {SIZE} values {distinct} distinct "
+                f"{name}: {seconds / number * 1000:.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
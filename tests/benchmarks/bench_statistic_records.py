@@ -0,0 +1,134 @@
+"""Micro-benchmark of statistic records built from Search rows.
+
+"needed fields" validates rows into dicts without building models, as
+row_validation="needed" does. "construct" skips validation and leaves
+dates as strings, it is shown as the upper bound of unvalidated decoding.
+
+Run from repository root:
+PYTHONPATH=app python tests/benchmarks/bench_statistic_records.py
+"""
+
+import timeit
+from datetime import datetime
+from typing import Union
+
+from pydantic import BaseModel, create_model
+from schemas.schema_group import CamundaSchema, TMOSchema
+
+from store.grpc.descriptor import StatisticDescriptor
+
+ROWS = 2_000
+TYPES = (int, str, float, datetime)
+
+
+def statistic_model(tprm_count: int) -> type[BaseModel]:
+    """Same shape as model generated by GRPCAccessor._create_model."""
+    mo_model = create_model(
+        "MO",
+        id=(Union[int, None], None),
+        name=(Union[str, None], None),
+        tmo_id=(Union[int, None], None),
+        creation_date=(Union[datetime, None], None),
+    )
+    tprm_model = create_model(
+        "1",
+        **{
+            str(100 + i): (Union[TYPES[i % len(TYPES)], None], None)
+            for i in range(tprm_count)
+        },
+    )
+    return create_model(
+        "1",
+        TMO=(create_model("TMO", __base__=TMOSchema), None),
+        MO=(mo_model, None),
+        TPRM=(tprm_model, None),
+        Camunda=(create_model("Camunda", __base__=CamundaSchema), None),
+        groupName=(str, None),
+    )
+
+
+def search_row(number: int, tprm_count: int) -> dict:
+    row = {
+        "id": number,
+        "name": f"mo_{number}",
+        "tmo_id": 1,
+        "creation_date": "2024-01-01T00:00:00.000000Z",
+        "state": "ACTIVE",
+        "startDate": "2024-01-01T00:00:00.000000Z",
+    }
+    for i in range(tprm_count):
+        type_ = TYPES[i % len(TYPES)]
+        if type_ is datetime:
+            row[str(100 + i)] = "2024-01-01T00:00:00.000000Z"
+        else:
+            row[str(100 + i)] = type_(number)
+    return row
+
+
+def per_record(descriptor: StatisticDescriptor, rows: list[dict]) -> list:
+    return [
+        descriptor.model(
+            Camunda=row,
+            TPRM=row,
+            TMO={"tmo_id": row["tmo_id"]},
+            MO=row,
+            groupName="group",
+        )
+        for row in rows
+    ]
+
+
+def batched(descriptor: StatisticDescriptor, rows: list[dict]) -> list:
+    return descriptor.validate_many(rows, group_name="group")
+
+
+def dicts(descriptor: StatisticDescriptor, rows: list[dict]) -> list:
+    return descriptor.validate_dicts(rows)
+
+
+def construct(descriptor: StatisticDescriptor, rows: list[dict]) -> list:
+    fields = descriptor.model.model_fields
+    nested = {
+        name: (fields[name].annotation, fields[name].annotation.model_fields)
+        for name in ("MO", "TPRM", "Camunda")
+    }
+    tmo_model = fields["TMO"].annotation
+    return [
+        descriptor.model.model_construct(
+            TMO=tmo_model.model_construct(tmo_id=row["tmo_id"]),
+            groupName="group",
+            **{
+                name: model.model_construct(
+                    **{key: row[key] for key in model_fields if key in row}
+                )
+                for name, (model, model_fields) in nested.items()
+            },
+        )
+        for row in rows
+    ]
+
+
+def main() -> None:
+    for tprm_count in (10, 100, 500):
+        descriptor = StatisticDescriptor(statistic_model(tprm_count))
+        rows = [search_row(number, tprm_count) for number in range(ROWS)]
+        assert per_record(descriptor, rows) == batched(descriptor, rows)
+        for name, function in (
+            ("per record", per_record),
+            ("batched", batched),
+            ("needed fields", dicts),
+            ("construct", construct),
+        ):
+            seconds = min(
+                timeit.repeat(
+                    lambda: function(descriptor, rows), number=1, repeat=5
+                )
+            )
+            print(
+                f"{ROWS} rows {tprm_count} TPRM {name}: "
+                f"{ROWS / seconds:,.0f} rows/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,12 @@ class TestsConfig(BaseSettings):
         default="localhost",
         alias="test_docker_db_host",
     )
+    run_container_redis_local: bool = Field(
+        default=True,
+        alias="tests_run_container_redis_local",
+    )
+    redis_host: str = Field(default="localhost", alias="tests_redis_host")
+    redis_port: int = Field(default=6379, alias="tests_redis_port")
 
     @computed_field  # type: ignore
     @property
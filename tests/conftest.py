@@ -1,6 +1,7 @@
 from .fixtures.common import async_session, test_engine, db_url
 from .fixtures.group import predefined_group
 from .fixtures.group_type import predefined_group_type, predefined_group_type_10
+from .fixtures.redis import redis_accessor, redis_config
 
 __all__ = [
     "async_session",
@@ -9,4 +10,6 @@ __all__ = [
     "predefined_group_type",
     "predefined_group_type_10",
     "predefined_group",
+    "redis_config",
+    "redis_accessor",
 ]
@@ -206,6 +206,46 @@ class TestGroup:
 
         assert current_group is None
 
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_groups_with_elements_by_names(
+        self, async_session: AsyncSession, predefined_group: list[GroupModel]
+    ) -> None:
+        groups: list[GroupModel] = await crud_group.get_groups_with_elements(
+            session=async_session,
+            group_names=[
+                predefined_group[0].group_name,
+                random_lower_string(10),
+            ],
+        )
+
+        assert [group.id for group in groups] == [predefined_group[0].id]
+        assert groups[0].elements == []
+        assert groups[0].group_type.name == predefined_group[0].group_type.name
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_groups_with_elements_by_names_and_tmo(
+        self, async_session: AsyncSession, predefined_group: list[GroupModel]
+    ) -> None:
+        groups: list[GroupModel] = await crud_group.get_groups_with_elements(
+            session=async_session,
+            group_names=[predefined_group[0].group_name],
+            tmo_id=predefined_group[1].tmo_id,
+        )
+
+        assert sorted(group.id for group in groups) == sorted(
+            group.id for group in predefined_group
+        )
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_get_groups_with_elements_without_filter(
+        self, async_session: AsyncSession, predefined_group: list[GroupModel]
+    ) -> None:
+        groups: list[GroupModel] = await crud_group.get_groups_with_elements(
+            session=async_session
+        )
+
+        assert groups == []
+
     @pytest.mark.asyncio(loop_scope="session")
     async def test_remove_group(
         self, async_session: AsyncSession, predefined_group: list[GroupModel]
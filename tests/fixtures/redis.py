@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+from typing import AsyncIterator, Iterator
+
+import pytest
+import pytest_asyncio
+from core.config import RedisConfig
+from store.redis.accessor import RedisAccessor
+from testcontainers.redis import RedisContainer
+
+from tests.config import TestsConfig
+
+
+@pytest.fixture(scope="session")
+def redis_config() -> Iterator[RedisConfig]:
+    tests = TestsConfig()
+    if tests.run_container_redis_local:
+        with RedisContainer() as container:
+            yield RedisConfig(
+                host=container.get_container_host_ip(),
+                port=int(container.get_exposed_port(container.port)),
+            )
+    else:
+        yield RedisConfig(host=tests.redis_host, port=tests.redis_port)
+
+
+@pytest_asyncio.fixture
+async def redis_accessor(
+    request: pytest.FixtureRequest, redis_config: RedisConfig
+) -> AsyncIterator[RedisAccessor]:
+    """Connected accessor, parametrize indirectly with dict of config
+    fields to change, e.g. {"key_layout": "legacy"}."""
+    app = SimpleNamespace(
+        config=SimpleNamespace(
+            redis=redis_config.model_copy(
+                update=getattr(request, "param", None) or {}
+            )
+        ),
+        store=SimpleNamespace(),
+        on_startup=[],
+        on_shutdown=[],
+    )
+    accessor = RedisAccessor(app)
+    await accessor.connect(app)
+    yield accessor
+    await accessor.redis.flushdb()
+    await accessor.disconnect(app)
@@ -0,0 +1,641 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+import redis.asyncio as redis
+from pydantic import BaseModel
+from store.redis.accessor import RedisAccessor
+from store.redis.aggregation import StatisticAggregator
+
+from tests.utils.utils import GroupStatistic, write_statistic
+
+AVERAGE = "GROUP_MS:g:TPRM:int:average:101"
+FREQUENCY = "GROUP_MS:g:MO:str:frequency:name"
+PLACEHOLDER = "GROUP_MS:g:TPRM:None:frequency:102"
+TMO_ID = "GROUP_MS:g:TMO:int:frequency:tmo_id"
+
+
+class Snapshot(BaseModel):
+    value: int
+
+
+LAYOUTS = pytest.mark.parametrize(
+    "redis_accessor",
+    [{"key_layout": "legacy"}, {"key_layout": "compact"}],
+    ids=["legacy", "compact"],
+    indirect=True,
+)
+
+
+async def write(accessor: RedisAccessor, group_name: str, values: dict):
+    """Write statistic keys of group with their running aggregates and
+    group index."""
+    pipe = accessor.redis.pipeline(transaction=False)
+    for path, mapping in values.items():
+        await accessor._set_values(pipe, path, mapping)
+    await accessor._register_keys(pipe, group_name, values)
+    await pipe.execute()
+
+
+def legacy_path(accessor: RedisAccessor, group_name: str, parameter: str):
+    """parameter is "<statistic>:<type>:<aggregation>:<name>"."""
+    return f"{accessor.prefix}{accessor._group_tag(group_name)}:{parameter}"
+
+
+async def write_group(
+    accessor: RedisAccessor, group_name: str, values: dict[str, dict]
+) -> dict[str, str]:
+    """Write statistic of group in configured key layout, values are keyed
+    by parameter. Returns Redis key of every parameter."""
+    paths = {
+        parameter: legacy_path(accessor, group_name, parameter)
+        for parameter in values
+    }
+    keys = await accessor._storage_keys(group_name, list(paths.values()))
+    result = {parameter: keys[path] for parameter, path in paths.items()}
+    await write(
+        accessor,
+        group_name,
+        {result[parameter]: mapping for parameter, mapping in values.items()},
+    )
+    return result
+
+
+async def bump_version(accessor: RedisAccessor, *group_names: str):
+    pipe = accessor.redis.pipeline(transaction=False)
+    await accessor._bump_version(pipe, *group_names)
+    await pipe.execute()
+
+
+async def companions_exist(accessor: RedisAccessor, keys) -> int:
+    return await accessor.redis.exists(
+        *(
+            companion
+            for key in keys
+            for companion in accessor._companion_keys(key)
+        )
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestSetValues:
+    async def test_aggregates_are_updated(self, redis_accessor):
+        await write(redis_accessor, "g", {AVERAGE: {1: 2, 2: 4}})
+        await redis_accessor._set_values(redis_accessor.redis, AVERAGE, {2: 8})
+        agg_key, *_ = redis_accessor._companion_keys(AVERAGE)
+        assert await redis_accessor.redis.hgetall(agg_key) == {
+            "sum": "10",
+            "count": "2",
+        }
+        assert await redis_accessor._collect_statistic([AVERAGE]) == {
+            "TPRM": {"101": 5}
+        }
+
+    async def test_unchanged_value_is_not_counted(self, redis_accessor):
+        await write(redis_accessor, "g", {FREQUENCY: {1: "a", 2: "a"}})
+        changed = await redis_accessor._set_values_script(
+            keys=[FREQUENCY, *redis_accessor._companion_keys(FREQUENCY)],
+            args=["frequency", 1, "a", 2, "b"],
+        )
+        _, counter_key, _ = redis_accessor._companion_keys(FREQUENCY)
+        assert changed == 1
+        assert await redis_accessor.redis.zrange(
+            counter_key, 0, -1, withscores=True
+        ) == [["a", 1.0], ["b", 1.0]]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestDeleteValues:
+    async def test_values_and_aggregates_are_removed(self, redis_accessor):
+        await write(redis_accessor, "g", {AVERAGE: {1: 2, 2: 4}})
+        await redis_accessor.delete_values("g", [1])
+        assert await redis_accessor.redis.hgetall(AVERAGE) == {"2": "4"}
+        assert await redis_accessor._collect_statistic([AVERAGE]) == {
+            "TPRM": {"101": 4}
+        }
+
+    async def test_emptied_keys_leave_index(self, redis_accessor):
+        await write(
+            redis_accessor, "g", {AVERAGE: {1: 2}, FREQUENCY: {1: "a", 2: "b"}}
+        )
+        await redis_accessor.delete_values("g", [1])
+        assert await redis_accessor._get_group_keys("g") == [FREQUENCY]
+        assert not await redis_accessor.redis.smembers(
+            redis_accessor._tprm_index_key("101")
+        )
+
+    @pytest.mark.parametrize(
+        "redis_accessor", [{"non_aggregate_storage": "compact"}], indirect=True
+    )
+    async def test_placeholders_of_empty_group_are_removed(
+        self, redis_accessor
+    ):
+        await write(
+            redis_accessor,
+            "g",
+            {TMO_ID: {1: 7, 2: 7}, PLACEHOLDER: {"*": "None"}},
+        )
+        await redis_accessor.delete_values("g", [1])
+        assert len(await redis_accessor._get_group_keys("g")) == 2
+        await redis_accessor.delete_values("g", [2])
+        assert await redis_accessor._get_group_keys("g") == []
+        assert not await redis_accessor.redis.exists(
+            PLACEHOLDER, *redis_accessor._companion_keys(PLACEHOLDER)
+        )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestUpdateIfMember:
+    async def test_only_groups_with_entity_are_changed(self, redis_accessor):
+        first = FREQUENCY
+        second = FREQUENCY.replace(":g:", ":h:")
+        await write(redis_accessor, "g", {first: {1: "a"}})
+        await write(redis_accessor, "h", {second: {2: "a"}})
+        changed = await redis_accessor._update_if_member_script(
+            keys=[
+                first,
+                *redis_accessor._companion_keys(first),
+                second,
+                *redis_accessor._companion_keys(second),
+            ],
+            args=["frequency", 1, "b", "g", "h"],
+        )
+        assert changed == ["g"]
+        assert await redis_accessor.redis.hgetall(first) == {"1": "b"}
+        assert await redis_accessor.redis.hgetall(second) == {"2": "a"}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestApproximateAverages:
+    async def test_evicted_values_stay_in_average(self, redis_accessor):
+        await write(redis_accessor, "g", {AVERAGE: {1: 2, 2: 4, 3: 9}})
+        await redis_accessor.delete_values("g", [3], evict=True)
+        await redis_accessor.delete_values("g", [2])
+        assert await redis_accessor.redis.hgetall(AVERAGE) == {"1": "2"}
+        assert await redis_accessor._collect_statistic([AVERAGE]) == {
+            "TPRM": {"101": 5}
+        }
+
+    @pytest.mark.parametrize(
+        "redis_accessor",
+        [{"statistic_engine": "aggregate"}, {"statistic_engine": "lua"}],
+        indirect=True,
+    )
+    async def test_totals_out_of_sample_are_replaced(self, redis_accessor):
+        await write(redis_accessor, "g", {AVERAGE: {1: 2}, FREQUENCY: {1: "a"}})
+        for values in (["4", "6", "8"], ["10"]):
+            rest = {
+                AVERAGE: StatisticAggregator("average", "int").update(values),
+                FREQUENCY: StatisticAggregator("frequency", "str").update(
+                    ["b", "b"]
+                ),
+            }
+            pipe = redis_accessor.redis.pipeline(transaction=False)
+            await redis_accessor._write_rest_totals(pipe, "g", rest)
+            await pipe.execute()
+        assert await redis_accessor._collect_statistic(
+            [AVERAGE, FREQUENCY]
+        ) == {"TPRM": {"101": 6}, "MO": {"name": "a"}}
+
+
+@LAYOUTS
+@pytest.mark.asyncio(loop_scope="session")
+class TestGetStatistics:
+    async def test_exact_approximate_and_missing_groups(self, redis_accessor):
+        redis_accessor.app.store.group_scheme = {"1": GroupStatistic}
+        await write_statistic(redis_accessor, "exact", {1: 2, 2: 4})
+        await write_statistic(
+            redis_accessor, "approximate", {1: 2}, rest_sizes=[4, 6, 8]
+        )
+        group_models = [
+            SimpleNamespace(
+                group_name=group_name,
+                tmo_id=1,
+                group_type_id=1,
+                column_filters=[],
+                elements=[],
+            )
+            for group_name in ("exact", "approximate", "missing")
+        ]
+        result = {
+            group_model.group_name: statistic.model_dump()
+            async for group_model, statistic in redis_accessor.get_statistics(
+                group_models
+            )
+        }
+        assert result == {
+            "exact": {
+                "groupName": "exact",
+                "MO": {"tmo_id": None, "size": 3, "name": "a"},
+            },
+            "approximate": {
+                "groupName": "approximate",
+                "MO": {"tmo_id": None, "size": 5, "name": "a"},
+            },
+            "missing": {
+                "groupName": "missing",
+                "MO": {"tmo_id": 1, "size": None, "name": None},
+            },
+        }
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestMigrations:
+    async def test_missing_aggregates_are_read_from_values(
+        self, redis_accessor
+    ):
+        await write(redis_accessor, "g", {AVERAGE: {1: 2, 2: 4}})
+        await redis_accessor.redis.delete(
+            *redis_accessor._companion_keys(AVERAGE)
+        )
+        assert await redis_accessor._collect_statistic([AVERAGE]) == {
+            "TPRM": {"101": 3}
+        }
+
+    async def test_aggregates_are_rebuilt(self, redis_accessor):
+        await write(redis_accessor, "g", {FREQUENCY: {1: "a", 2: "a"}})
+        _, counter_key, _ = redis_accessor._companion_keys(FREQUENCY)
+        await redis_accessor.redis.delete(counter_key)
+        assert await redis_accessor.build_aggregates() == 1
+        assert await redis_accessor.redis.zrange(
+            counter_key, 0, -1, withscores=True
+        ) == [["a", 2.0]]
+
+    async def test_migrations_run_once_under_lock(self, redis_accessor):
+        await redis_accessor.redis.delete(redis_accessor.meta_key)
+        runs = []
+
+        async def migration():
+            runs.append(
+                await redis_accessor.redis.exists(
+                    redis_accessor.migration_lock_key
+                )
+            )
+            await asyncio.sleep(0.1)
+            return 0
+
+        redis_accessor.migrations = {"test": ("1", migration)}
+        await asyncio.gather(redis_accessor.migrate(), redis_accessor.migrate())
+        assert runs == [1]
+        assert not await redis_accessor.redis.exists(
+            redis_accessor.migration_lock_key
+        )
+
+    async def test_failed_migration_is_marked_and_raised(self, redis_accessor):
+        await redis_accessor.redis.delete(redis_accessor.meta_key)
+        calls = []
+
+        async def migration():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ValueError("broken")
+            return 0
+
+        redis_accessor.migrations = {"test": ("1", migration)}
+        with pytest.raises(ValueError):
+            await redis_accessor.migrate()
+        meta = await redis_accessor.redis.hgetall(redis_accessor.meta_key)
+        assert "test" not in meta
+        assert meta["test:failed"].startswith("1: ValueError")
+        assert not await redis_accessor.redis.exists(
+            redis_accessor.migration_lock_key
+        )
+        await redis_accessor.migrate()
+        assert await redis_accessor.redis.hgetall(redis_accessor.meta_key) == {
+            "test": "1"
+        }
+
+    async def test_aggregates_are_rebuilt_by_batches(self, redis_accessor):
+        values = {i: i % 3 for i in range(300)}
+        await write(redis_accessor, "g", {AVERAGE: values})
+        keys = [AVERAGE, *redis_accessor._companion_keys(AVERAGE)]
+        cursor = await redis_accessor._rebuild_aggregates_script(
+            keys=keys, args=["average", 0, 10]
+        )
+        assert cursor != "0"
+        # Written while aggregates are rebuilt
+        await redis_accessor._set_values(
+            redis_accessor.redis, AVERAGE, {0: 30, 299: 30, 300: 30}
+        )
+        await redis_accessor.delete_values("g", [1, 298])
+        values.update({0: 30, 299: 30, 300: 30})
+        del values[1], values[298]
+        expected = {"TPRM": {"101": sum(values.values()) // len(values)}}
+        assert await redis_accessor._collect_statistic([AVERAGE]) == expected
+        while cursor != "0":
+            cursor = await redis_accessor._rebuild_aggregates_script(
+                keys=keys, args=["average", cursor, 10]
+            )
+        total, count = await redis_accessor.redis.hmget(keys[1], "sum", "count")
+        assert await redis_accessor.redis.hlen(keys[1]) == 2
+        assert float(total) == sum(values.values())
+        assert int(count) == len(values)
+        assert await redis_accessor._collect_statistic([AVERAGE]) == expected
+
+    async def test_value_migrations_run_in_background(self, redis_accessor):
+        await redis_accessor.redis.delete(redis_accessor.meta_key)
+        runs = []
+
+        def migration(name):
+            async def run():
+                runs.append(name)
+                return 0
+
+            return run
+
+        redis_accessor.migrations = {
+            "group_index": ("1", migration("group_index")),
+            "aggregates": ("1", migration("aggregates")),
+        }
+        await redis_accessor._start_migrations()
+        assert runs == ["group_index"]
+        await redis_accessor._migration_task
+        assert runs == ["group_index", "aggregates"]
+
+    async def test_version_sequence_starts_above_group_versions(
+        self, redis_accessor
+    ):
+        await redis_accessor.redis.hset(
+            redis_accessor.version_key, mapping={"g": 7, "h": 3}
+        )
+        assert await redis_accessor.seed_version_sequence() == 2
+        await bump_version(redis_accessor, "h")
+        assert (
+            await redis_accessor.redis.hget(redis_accessor.version_key, "h")
+            == "8"
+        )
+
+    async def test_text_codec_is_not_migrated_on_first_start(
+        self, redis_accessor
+    ):
+        await redis_accessor.redis.delete(redis_accessor.meta_key)
+        runs = []
+
+        async def migration():
+            runs.append(1)
+            return 0
+
+        redis_accessor.migrations = {"value_codec": ("text", migration)}
+        await redis_accessor.migrate(background=True)
+        assert not runs
+        assert (
+            await redis_accessor.redis.hget(
+                redis_accessor.meta_key, "value_codec"
+            )
+            == "text"
+        )
+        redis_accessor.migrations = {"value_codec": ("binary", migration)}
+        await redis_accessor.migrate(background=True)
+        assert runs == [1]
+
+
+@pytest.mark.parametrize(
+    "redis_accessor", [{"key_layout": "compact"}], indirect=True
+)
+@pytest.mark.asyncio(loop_scope="session")
+class TestGroupIds:
+    async def test_lookup_does_not_allocate_ids(self, redis_accessor):
+        assert await redis_accessor._lookup_group_ids(["g"]) == [None]
+        assert (
+            await redis_accessor._storage_keys(
+                "g", [AVERAGE], allocate=False, group_id=None
+            )
+            == {}
+        )
+        assert not await redis_accessor.redis.exists(
+            redis_accessor.group_ids_key
+        )
+
+    async def test_ids_are_freed_by_purge(self, redis_accessor):
+        keys = await redis_accessor._storage_keys("g", [AVERAGE])
+        await write(redis_accessor, "g", {keys[AVERAGE]: {1: 2}})
+        (group_id,) = await redis_accessor._lookup_group_ids(["g"])
+        assert group_id is not None
+        await redis_accessor.purge_groups(["g"])
+        assert await redis_accessor._lookup_group_ids(["g"]) == [None]
+        assert not await redis_accessor.redis.hexists(
+            redis_accessor.group_names_key, group_id
+        )
+
+
+@LAYOUTS
+@pytest.mark.asyncio(loop_scope="session")
+class TestGroupIndex:
+    async def test_group_keys_are_read_from_index(self, redis_accessor):
+        keys = await write_group(
+            redis_accessor,
+            "g",
+            {
+                "TPRM:int:average:101": {1: 2, 2: 4},
+                "MO:str:frequency:name": {1: "a"},
+            },
+        )
+        await write_group(
+            redis_accessor, "h", {"TPRM:int:average:101": {3: 10}}
+        )
+        group_keys = await redis_accessor._get_group_keys("g")
+        assert sorted(group_keys) == sorted(keys.values())
+        assert await redis_accessor._collect_statistic(group_keys) == {
+            "TPRM": {"101": 3},
+            "MO": {"name": "a"},
+        }
+
+    async def test_keys_without_index_are_migrated(self, redis_accessor):
+        path = legacy_path(redis_accessor, "g", "TPRM:int:average:101")
+        await redis_accessor._set_values(
+            redis_accessor.redis, path, {1: 2, 2: 4}
+        )
+        assert await redis_accessor._get_group_keys("g") == []
+        await redis_accessor.redis.delete(redis_accessor.meta_key)
+        await redis_accessor.migrate()
+        (key,) = await redis_accessor._get_group_keys("g")
+        assert key.startswith(redis_accessor.compact_prefix) == (
+            redis_accessor.compact_keys
+        )
+        assert await redis_accessor._collect_statistic([key]) == {
+            "TPRM": {"101": 3}
+        }
+
+
+@LAYOUTS
+@pytest.mark.asyncio(loop_scope="session")
+class TestPurgeGroups:
+    async def test_keys_of_group_are_removed(self, redis_accessor):
+        keys = await write_group(
+            redis_accessor,
+            "g",
+            {"TPRM:int:average:101": {1: 2}, "MO:str:frequency:name": {1: "a"}},
+        )
+        other = await write_group(
+            redis_accessor, "h", {"TPRM:int:average:101": {2: 4}}
+        )
+        report = await redis_accessor.purge_groups(["g", "missing"])
+        assert report == {"g": 2, "missing": 0}
+        assert await redis_accessor._get_group_keys("g") == []
+        assert not await redis_accessor.redis.exists(*keys.values())
+        assert not await companions_exist(redis_accessor, keys.values())
+        assert await redis_accessor.redis.smembers(
+            redis_accessor._tprm_index_key("101")
+        ) == set(other.values())
+        assert await redis_accessor._get_group_keys("h") == list(other.values())
+
+    async def test_version_of_purged_group_is_not_repeated(
+        self, redis_accessor
+    ):
+        await write_group(redis_accessor, "g", {"TPRM:int:average:101": {1: 2}})
+        await bump_version(redis_accessor, "g", "g")
+        ((before, _),) = (await redis_accessor._read_snapshots(["g"])).values()
+        await redis_accessor.purge_groups(["g"])
+        assert await redis_accessor._read_snapshots(["g"]) == {
+            "g": (None, None)
+        }
+        assert not await redis_accessor.redis.exists(redis_accessor.version_key)
+        await write_group(redis_accessor, "g", {"TPRM:int:average:101": {1: 2}})
+        await bump_version(redis_accessor, "g")
+        ((after, _),) = (await redis_accessor._read_snapshots(["g"])).values()
+        assert int(after) > int(before)
+
+    async def test_snapshot_is_removed_with_version(self, redis_accessor):
+        await write_group(redis_accessor, "g", {"TPRM:int:average:101": {1: 2}})
+        await bump_version(redis_accessor, "g")
+        ((version, _),) = (await redis_accessor._read_snapshots(["g"])).values()
+        snapshot = Snapshot(value=1)
+        await redis_accessor._write_snapshots([("g", version, snapshot)])
+        assert await redis_accessor._read_snapshots(["g"]) == {
+            "g": (version, snapshot.model_dump_json())
+        }
+        await redis_accessor.purge_groups(["g"])
+        # Statistic collected before purge
+        await redis_accessor._write_snapshots([("g", version, snapshot)])
+        await redis_accessor._write_snapshots([("g", None, snapshot)])
+        assert not await redis_accessor.redis.exists(
+            redis_accessor._snapshot_key("g"), redis_accessor.version_key
+        )
+
+    async def test_unindexed_keys_are_scanned_before_index_migration(
+        self, redis_accessor
+    ):
+        path = legacy_path(redis_accessor, "g", "TPRM:int:average:101")
+        await redis_accessor._set_values(redis_accessor.redis, path, {1: 2})
+        await redis_accessor.purge_groups(["g"])
+        assert await redis_accessor.redis.exists(path)
+        await redis_accessor.redis.hdel(redis_accessor.meta_key, "group_index")
+        assert await redis_accessor.purge_groups(["g"]) == {"g": 1}
+        assert not await redis_accessor.redis.exists(path)
+
+
+@LAYOUTS
+@pytest.mark.asyncio(loop_scope="session")
+class TestRemoveParameter:
+    async def test_keys_of_parameter_are_removed(self, redis_accessor):
+        values = {
+            "TPRM:int:average:101": {1: 2},
+            "TPRM:str:frequency:102": {1: "a"},
+        }
+        first = await write_group(redis_accessor, "g", values)
+        second = await write_group(redis_accessor, "h", values)
+        await redis_accessor.remove_parameter(101, "int")
+        removed = [
+            first["TPRM:int:average:101"],
+            second["TPRM:int:average:101"],
+        ]
+        assert not await redis_accessor.redis.exists(*removed)
+        assert not await companions_exist(redis_accessor, removed)
+        assert not await redis_accessor.redis.exists(
+            redis_accessor._tprm_index_key("101")
+        )
+        assert await redis_accessor._get_group_keys("g") == [
+            first["TPRM:str:frequency:102"]
+        ]
+        assert await redis_accessor._get_group_keys("h") == [
+            second["TPRM:str:frequency:102"]
+        ]
+
+    async def test_keys_of_other_type_are_kept(self, redis_accessor):
+        keys = await write_group(
+            redis_accessor, "g", {"TPRM:int:average:101": {1: 2}}
+        )
+        await redis_accessor.remove_parameter(101, "str")
+        assert await redis_accessor.redis.exists(*keys.values())
+
+    async def test_emptied_keys_leave_tprm_index(self, redis_accessor):
+        keys = await write_group(
+            redis_accessor,
+            "g",
+            {"TPRM:int:average:101": {1: 2}, "MO:str:frequency:name": {2: "a"}},
+        )
+        await redis_accessor.delete_values("g", [1])
+        assert not await redis_accessor.redis.exists(
+            redis_accessor._tprm_index_key("101")
+        )
+        assert await redis_accessor._get_group_keys("g") == [
+            keys["MO:str:frequency:name"]
+        ]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controlled monotonic time of accessor."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr("store.redis.accessor.monotonic", lambda: clock.now)
+    return clock
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def replica(redis_accessor):
+    """Separate client standing for replica of accessor's Redis."""
+    config = redis_accessor.app.config.redis
+    client = redis.Redis(host=config.host, port=config.port)
+    redis_accessor._replica = client
+    yield client
+    redis_accessor._replica = None
+    await client.aclose()
+
+
+@pytest.mark.parametrize(
+    "redis_accessor", [{"read_your_writes_seconds": 5}], indirect=True
+)
+@pytest.mark.asyncio(loop_scope="session")
+class TestReadYourWrites:
+    async def test_without_replica_reads_primary(self, redis_accessor, clock):
+        redis_accessor._mark_written("g")
+        assert redis_accessor._reader("g") is redis_accessor.redis
+        assert redis_accessor._recent_writes == {}
+
+    async def test_not_written_group_is_read_from_replica(
+        self, redis_accessor, replica, clock
+    ):
+        assert redis_accessor._reader("g") is replica
+
+    async def test_written_group_is_read_from_primary_until_window_expires(
+        self, redis_accessor, replica, clock
+    ):
+        await redis_accessor.purge_groups(["g"])
+
+        assert redis_accessor._reader("g") is redis_accessor.redis
+        assert redis_accessor._reader("h", "g") is redis_accessor.redis
+        assert redis_accessor._reader("h") is replica
+        clock.now += 4.9
+        assert redis_accessor._reader("g") is redis_accessor.redis
+        clock.now += 0.2
+        assert redis_accessor._reader("g") is replica
+
+    async def test_next_write_extends_window(
+        self, redis_accessor, replica, clock
+    ):
+        redis_accessor._mark_written("g")
+        clock.now += 4
+        redis_accessor._mark_written("g")
+        clock.now += 4
+        assert redis_accessor._reader("g") is redis_accessor.redis
+        clock.now += 2
+        assert redis_accessor._reader("g") is replica
+
+    async def test_expired_writes_are_dropped(
+        self, redis_accessor, replica, clock
+    ):
+        redis_accessor._mark_written(*(f"g{i}" for i in range(1001)))
+        clock.now += 10
+        redis_accessor._mark_written("g")
+        assert redis_accessor._recent_writes == {"g": clock.now + 5}
@@ -0,0 +1,62 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from store.redis.aggregation import (
+    StatisticAggregator,
+    decode_maximum,
+    encode_maximum,
+)
+
+
+class TestStatisticAggregator:
+    @pytest.mark.parametrize(
+        "agg, type_, data, expected",
+        [
+            ("frequency", "str", ["a", "b", "b", "None"], "b"),
+            ("maximum", "str", ["b", "None", "c"], "c"),
+            ("average", "int", ["1", "2", "4"], 2),
+            ("average", "float", ["1.5", "2.25"], 1.88),
+            ("frequency", "str", ["None", None], None),
+            ("maximum", "str", [], None),
+            ("maximum", "int", ["9", "10", "None"], 10),
+            ("maximum", "date", ["738000", "737000"], date.fromordinal(738000)),
+        ],
+    )
+    def test_result(self, agg, type_, data, expected):
+        aggregator = StatisticAggregator(agg=agg, type_=type_).update(data)
+        assert aggregator.result() == expected
+
+    @pytest.mark.parametrize("agg", ["frequency", "average", "maximum"])
+    def test_merge_equals_single_update(self, agg):
+        data = ["3", "5", "1", "3", "8", "2", "7", "3"]
+        whole = StatisticAggregator(agg=agg, type_="int").update(data)
+        merged = StatisticAggregator(agg=agg, type_="int")
+        for start in range(0, len(data), 3):
+            merged.merge(
+                StatisticAggregator(agg=agg, type_="int").update(
+                    data[start : start + 3]
+                )
+            )
+        assert merged.result() == whole.result()
+
+    def test_wrong_aggregation(self):
+        with pytest.raises(ValueError):
+            StatisticAggregator(agg="median", type_="int")
+
+    @pytest.mark.parametrize(
+        "value, type_",
+        [
+            (datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc), "datetime"),
+            (date(2024, 1, 2), "date"),
+        ],
+    )
+    def test_maximum_encoding_round_trip(self, value, type_):
+        encoded = encode_maximum(value)
+        assert isinstance(encoded, int)
+        assert decode_maximum(str(encoded), type_) == value
+
+    def test_naive_datetime_is_encoded_as_utc(self):
+        naive = datetime(2024, 1, 2, 3, 4, 5)
+        assert encode_maximum(naive) == encode_maximum(
+            naive.replace(tzinfo=timezone.utc)
+        )
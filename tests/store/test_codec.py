@@ -0,0 +1,35 @@
+import pytest
+from store.redis.codec import (
+    decode_value,
+    decode_values,
+    encode_number,
+    is_binary,
+)
+
+
+def as_response(value: bytes) -> str:
+    """Value as it is returned by client with surrogateescape decoding."""
+    return value.decode("utf-8", "surrogateescape")
+
+
+class TestCodec:
+    @pytest.mark.parametrize("number", [0, -2.5, 1e-310, 1718123456789012])
+    def test_round_trip(self, number):
+        encoded = encode_number(number)
+        assert len(encoded) == 9
+        assert decode_value(encoded) == number
+        assert decode_value(as_response(encoded)) == number
+
+    def test_text_values_are_kept(self):
+        assert not is_binary("1.5")
+        assert decode_value("None") == "None"
+
+    def test_bulk_decode(self):
+        values = [
+            as_response(encode_number(1.5)),
+            "None",
+            "7",
+            as_response(encode_number(-3)),
+        ]
+        assert decode_values(values) == [1.5, "None", "7", -3.0]
+        assert decode_values(["1", "2"]) == ["1", "2"]
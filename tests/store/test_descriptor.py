@@ -0,0 +1,51 @@
+from pydantic import BaseModel, create_model
+
+from store.grpc.descriptor import StatisticDescriptor
+
+
+def make_model() -> type[BaseModel]:
+    mo = create_model("MO", id=(int | None, None), name=(str | None, None))
+    tprm = create_model("7", **{"101": (int | None, None)})
+    camunda = create_model("Camunda", state=(str | None, None))
+    tmo = create_model("TMO", tmo_id=(int | None, None))
+    return create_model(
+        "7",
+        TMO=(tmo, None),
+        MO=(mo, None),
+        TPRM=(tprm, None),
+        Camunda=(camunda, None),
+        groupName=(str, None),
+    )
+
+
+class TestStatisticDescriptor:
+    def test_fields_of_nested_models(self):
+        descriptor = StatisticDescriptor(make_model())
+        assert descriptor.string_fields == ["groupName"]
+        assert descriptor.fields == {"id", "name", "101", "state"}
+
+    def test_validate_many(self):
+        descriptor = StatisticDescriptor(make_model())
+        rows = [{"id": "1", "name": "mo", "tmo_id": 7, "101": "5"}]
+        (record,) = descriptor.validate_many(rows, group_name="group")
+        assert record.MO.id == 1
+        assert record.TPRM.model_dump() == {"101": 5}
+        assert record.TMO.tmo_id == 7
+        assert record.groupName == "group"
+
+    def test_validate_dicts(self):
+        descriptor = StatisticDescriptor(make_model())
+        rows = [{"id": "1", "name": "mo", "tmo_id": 7, "101": "5"}]
+        assert descriptor.validate_dicts(rows) == [
+            {
+                "TMO": {"tmo_id": 7},
+                "MO": {"id": 1, "name": "mo"},
+                "Camunda": {},
+                "TPRM": {"101": 5},
+            }
+        ]
+
+    def test_missing_fields(self):
+        descriptor = StatisticDescriptor(make_model())
+        row = {"id": 1, "name": "mo", "tmo_id": 7}
+        assert descriptor.missing_fields(row) == {"101", "state"}
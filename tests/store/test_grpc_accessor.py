@@ -0,0 +1,188 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import grpc
+import pytest
+import pytest_asyncio
+from core.config import GRPCConfig
+from schemas.schema_group import GroupBase
+from store.grpc.accessor import GRPCAccessor
+from store.grpc.protobuf import (
+    from_group_to_search_pb2,
+    from_group_to_search_pb2_grpc,
+)
+
+from tests.store.test_descriptor import make_model
+
+GROUP = GroupBase(group_name="g", group_type_id=2, tmo_id=1)
+
+
+class Search(from_group_to_search_pb2_grpc.GroupSearchServicer):
+    """Search returning page of processes for limit and offset of request.
+    Later pages are answered faster, so they are received out of order."""
+
+    def __init__(self):
+        self.processes: list[dict] = []
+        self.offsets: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def GetProcesses(self, request, context):
+        page = json.loads(request.limit)
+        offset, limit = page["offset"], page["limit"]
+        self.offsets.append(offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05 / (1 + offset))
+        finally:
+            self.in_flight -= 1
+        for process in self.processes[offset : offset + limit]:
+            yield from_group_to_search_pb2.ResponseGetProcesses(
+                mo=json.dumps(process)
+            )
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def search():
+    search = Search()
+    server = grpc.aio.server()
+    from_group_to_search_pb2_grpc.add_GroupSearchServicer_to_server(
+        search, server
+    )
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    search.target = f"127.0.0.1:{port}"
+    yield search
+    await server.stop(None)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def accessor(request, search):
+    """Accessor reading from search, parametrize indirectly with dict of
+    GRPCConfig fields."""
+    app = SimpleNamespace(
+        config=SimpleNamespace(grpc=GRPCConfig(**request.param)),
+        on_startup=[],
+        on_shutdown=[],
+    )
+    accessor = GRPCAccessor(app)
+    accessor.channel_search = grpc.aio.insecure_channel(search.target)
+    yield accessor
+    await accessor.channel_search.close()
+
+
+def pages(size: int, concurrency: int):
+    return pytest.mark.parametrize(
+        "accessor",
+        [{"SEARCH_PAGE_SIZE": size, "SEARCH_PAGE_CONCURRENCY": concurrency}],
+        indirect=True,
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestIterProcesses:
+    @pytest.mark.parametrize(
+        "total, offsets",
+        [
+            (0, [0]),
+            (2, [0]),
+            (3, [0, 3, 6]),
+            (8, [0, 3, 6]),
+            (9, [0, 3, 6, 9, 12]),
+            (10, [0, 3, 6, 9, 12]),
+        ],
+    )
+    @pages(size=3, concurrency=2)
+    async def test_pages_until_short_or_empty_page(
+        self, accessor, search, total, offsets
+    ):
+        search.processes = [{"id": i} for i in range(total)]
+        rows = [row async for row in accessor._iter_processes(GROUP)]
+        assert rows == search.processes
+        assert sorted(search.offsets) == offsets
+
+    @pages(size=2, concurrency=3)
+    async def test_concurrent_pages_are_bounded(self, accessor, search):
+        search.processes = [{"id": i} for i in range(40)]
+        rows = [row async for row in accessor._iter_processes(GROUP)]
+        assert rows == search.processes
+        assert search.max_in_flight == 3
+        assert search.offsets[0] == 0
+
+
+@pytest.fixture
+def processes_group(accessor, search, redis_accessor) -> GroupBase:
+    """Aggregate group of processes of make_model TMO, both accessors share
+    store."""
+    store = redis_accessor.app.store
+    store.grpc = accessor
+    store.group_scheme = {"7": make_model()}
+    store.group_descriptors = {}
+    accessor.app.store = store
+    search.processes = [
+        {"id": i, "name": f"mo{i}", "tmo_id": 7, "101": 2 * i}
+        for i in range(1, 11)
+    ]
+    return GroupBase(
+        group_name="g", group_type_id=2, tmo_id=7, is_aggregate=True
+    )
+
+
+@pytest.mark.asyncio(loop_scope="session")
+class TestSetProcessStatistic:
+    @pytest.mark.parametrize(
+        "redis_accessor", [{"ingest_chunk_size": 2}], indirect=True
+    )
+    @pages(size=4, concurrency=2)
+    async def test_chunks_are_written_while_processes_are_received(
+        self, accessor, redis_accessor, processes_group
+    ):
+        key = f"{redis_accessor.prefix}g:TPRM:int:average:101"
+        # Values of group in Redis when every process is received
+        written = []
+
+        async def received(processes):
+            async for row in processes:
+                written.append(await redis_accessor.redis.hlen(key))
+                yield row
+
+        processes = accessor.stream_severity_processes(processes_group)
+        await redis_accessor.set_process_statistic(
+            group_schema=processes_group, processes=received(processes)
+        )
+
+        assert written == [0, 0, 2, 2, 4, 4, 6, 6, 8, 8]
+        assert await redis_accessor.redis.hlen(key) == 10
+        assert processes.ids == list(range(1, 11))
+        assert processes.missing_fields == {"state"}
+
+    @pytest.mark.parametrize(
+        "redis_accessor",
+        [
+            {
+                "statistic_executor": "process",
+                "statistic_workers": 1,
+                "ingest_chunk_size": 4,
+            }
+        ],
+        indirect=True,
+    )
+    @pages(size=4, concurrency=2)
+    async def test_rows_are_built_in_worker_processes(
+        self, accessor, redis_accessor, processes_group
+    ):
+        statistic = await redis_accessor.set_process_statistic(
+            group_schema=processes_group,
+            processes=accessor.stream_severity_processes(processes_group),
+        )
+
+        # Chunks were sent to spawned workers
+        assert redis_accessor._executor._processes
+        key = f"{redis_accessor.prefix}g:TPRM:int:average:101"
+        assert await redis_accessor.redis.hgetall(key) == {
+            str(i): str(2 * i) for i in range(1, 11)
+        }
+        assert statistic.TPRM.model_dump() == {"101": 11}
+        assert statistic.MO.model_dump() == {"id": 10, "name": "mo9"}
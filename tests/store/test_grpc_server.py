@@ -0,0 +1,102 @@
+import pickle
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from models.model_group import GroupModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from store.grpc.protobuf.grpc_group_pb2 import RequestGetGroupsStatistic
+from store.grpc.server import GroupGRPC
+from store.redis.accessor import RedisAccessor
+
+from tests.utils.utils import GroupStatistic, write_statistic
+
+
+def group_grpc(
+    async_session: AsyncSession, redis_accessor: RedisAccessor
+) -> GroupGRPC:
+    @asynccontextmanager
+    async def session():
+        yield async_session
+
+    redis_accessor.app.store.group_scheme = {"1": GroupStatistic}
+    redis_accessor.app.store.redis = redis_accessor
+    app = SimpleNamespace(
+        database=SimpleNamespace(session=session),
+        store=redis_accessor.app.store,
+    )
+    return GroupGRPC(app)
+
+
+class TestGetGroupsStatistic:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_exact_approximate_and_missing_groups(
+        self,
+        async_session: AsyncSession,
+        redis_accessor: RedisAccessor,
+        predefined_group: list[GroupModel],
+    ) -> None:
+        exact, approximate = predefined_group
+        approximate.is_approximate = True
+        await async_session.flush()
+        await write_statistic(redis_accessor, exact.group_name, {1: 2, 2: 4})
+        await write_statistic(
+            redis_accessor,
+            approximate.group_name,
+            {1: 2},
+            rest_sizes=[4, 6, 8],
+        )
+        servicer = group_grpc(async_session, redis_accessor)
+
+        responses = [
+            response
+            async for response in servicer.GetGroupsStatistic(
+                RequestGetGroupsStatistic(
+                    group_names=[
+                        exact.group_name,
+                        approximate.group_name,
+                        "missing",
+                    ]
+                ),
+                context=None,
+            )
+        ]
+
+        statistic = {
+            response.group_name: pickle.loads(
+                bytes.fromhex(response.group_statistic)
+            )
+            for response in responses
+        }
+        assert statistic == {
+            exact.group_name: {
+                "groupName": exact.group_name,
+                "MO": {"tmo_id": None, "size": 3, "name": "a"},
+                "group_type": exact.group_type.name,
+            },
+            approximate.group_name: {
+                "groupName": approximate.group_name,
+                "MO": {"tmo_id": None, "size": 5, "name": "a"},
+                "group_type": approximate.group_type.name,
+            },
+        }
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_groups_of_tmo(
+        self,
+        async_session: AsyncSession,
+        redis_accessor: RedisAccessor,
+        predefined_group: list[GroupModel],
+    ) -> None:
+        servicer = group_grpc(async_session, redis_accessor)
+
+        responses = [
+            response
+            async for response in servicer.GetGroupsStatistic(
+                RequestGetGroupsStatistic(tmo_id=1), context=None
+            )
+        ]
+
+        assert sorted(response.group_name for response in responses) == sorted(
+            group.group_name for group in predefined_group
+        )
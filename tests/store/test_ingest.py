@@ -0,0 +1,70 @@
+import pickle
+
+from store.grpc.descriptor import StatisticDescriptor
+from store.redis.ingest import ChunkSpec, build_chunk, dump_records
+
+from tests.store.test_descriptor import make_model
+
+ROWS = [
+    {"id": 1, "name": "a", "tmo_id": 7, "101": 2, "state": "ACTIVE"},
+    {"id": 2, "name": "b", "tmo_id": 7, "101": 4, "state": "ACTIVE"},
+]
+
+
+class TestBuildChunk:
+    def test_mappings_and_aggregates(self):
+        spec = ChunkSpec(key_prefix="GROUP_MS:g", is_aggregate=True)
+        descriptor = StatisticDescriptor(make_model())
+        records = descriptor.validate_many(ROWS, group_name="g")
+        mappings, aggregators = build_chunk(spec, dump_records(records))
+        path = "GROUP_MS:g:TPRM:int:average:101"
+        assert mappings[path] == {1: 2, 2: 4}
+        assert aggregators[path].result() == 3
+        assert aggregators["GROUP_MS:g:MO:str:maximum:name"].result() == "b"
+
+    def test_rows_are_converted_with_descriptor(self):
+        descriptor = StatisticDescriptor(make_model())
+        spec = ChunkSpec(key_prefix="GROUP_MS:g", is_aggregate=True)
+        records = descriptor.validate_many(ROWS, group_name="g")
+        expected, _ = build_chunk(spec, dump_records(records))
+        mappings, _ = build_chunk(spec._replace(descriptor=descriptor), ROWS)
+        assert mappings == expected
+
+    def test_rows_are_converted_with_needed_fields(self):
+        spec = ChunkSpec(
+            key_prefix="GROUP_MS:g",
+            is_aggregate=True,
+            descriptor=StatisticDescriptor(make_model()),
+        )
+        expected, expected_aggregators = build_chunk(spec, ROWS)
+        mappings, aggregators = build_chunk(
+            spec._replace(full_validation=False), ROWS
+        )
+        assert mappings == expected
+        assert {path: agg.result() for path, agg in aggregators.items()} == {
+            path: agg.result() for path, agg in expected_aggregators.items()
+        }
+
+    def test_placeholders_of_non_aggregate_group(self):
+        spec = ChunkSpec(
+            key_prefix="GROUP_MS:g",
+            is_aggregate=False,
+            placeholder_field="*",
+            descriptor=StatisticDescriptor(make_model()),
+        )
+        mappings, aggregators = build_chunk(spec, ROWS)
+        assert mappings["GROUP_MS:g:TPRM:None:frequency:101"] == {"*": "None"}
+        assert mappings["GROUP_MS:g:TMO:int:frequency:tmo_id"] == {1: 7, 2: 7}
+        assert (
+            aggregators["GROUP_MS:g:TPRM:None:frequency:101"].result() is None
+        )
+
+
+class TestDescriptorPickle:
+    def test_descriptor_is_rebuilt_from_spec(self):
+        descriptor = StatisticDescriptor(make_model())
+        copy = pickle.loads(pickle.dumps(descriptor))
+        assert copy.fields == descriptor.fields
+        assert dump_records(copy.validate_many(ROWS, "g")) == dump_records(
+            descriptor.validate_many(ROWS, "g")
+        )
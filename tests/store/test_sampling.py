@@ -0,0 +1,55 @@
+from store.redis.sampling import ReservoirSampler
+
+
+class TestReservoirSampler:
+    def test_all_items_kept_until_full(self):
+        sampler = ReservoirSampler(size=5)
+        items = [str(i) for i in range(5)]
+        assert all(sampler.offer(item) for item in items)
+        assert sorted(sampler.members) == items
+        assert sampler.added == set(items)
+        assert not sampler.evicted
+
+    def test_sample_size_is_bounded(self):
+        sampler = ReservoirSampler(size=10)
+        for i in range(1000):
+            sampler.offer(str(i))
+        assert len(sampler.members) == 10
+        assert sampler.added == set(sampler.members)
+
+    def test_restored_sampler_evicts_previous_members(self):
+        sampler = ReservoirSampler(size=3, members=["1", "2", "3"])
+        for i in range(4, 100):
+            sampler.offer(str(i))
+        assert len(sampler.members) == 3
+        assert sampler.evicted
+        assert not sampler.evicted & set(sampler.members)
+
+    def test_restored_sampler_is_shrunk_to_size(self):
+        sampler = ReservoirSampler(size=2, members=["1", "2", "3"])
+        assert len(sampler.members) == 2
+        assert len(sampler.evicted) == 1
+
+    def test_member_offered_again_is_not_counted(self):
+        sampler = ReservoirSampler(size=2, members=["1", "2"])
+        assert sampler.offer("1")
+        assert not sampler.added
+
+    def test_rejected_item_offered_again_is_rejected(self):
+        sampler = ReservoirSampler(size=10)
+        for i in range(1000):
+            sampler.offer(str(i))
+        members = set(sampler.members)
+        rejected = [str(i) for i in range(1000) if str(i) not in members]
+        assert not any(sampler.offer(item) for item in rejected * 3)
+        assert set(sampler.members) == members
+
+    def test_sample_does_not_depend_on_order(self):
+        items = [str(i) for i in range(100)]
+        first = ReservoirSampler(size=5, salt="group")
+        second = ReservoirSampler(size=5, salt="group")
+        for item in items:
+            first.offer(item)
+        for item in reversed(items):
+            second.offer(item)
+        assert set(first.members) == set(second.members)
@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from store.redis.cache import StatisticCache
+
+
+class Statistic(BaseModel):
+    groupName: str
+
+
+class TestStatisticCache:
+    def test_hit_for_same_version(self):
+        cache = StatisticCache(max_size=2)
+        statistic = Statistic(groupName="group")
+        cache.set(("group", 1), "1", statistic)
+        assert cache.get(("group", 1), "1") is statistic
+        assert cache.stats()["hits"] == 1
+
+    def test_miss_for_other_version(self):
+        cache = StatisticCache(max_size=2)
+        cache.set(("group", 1), "1", Statistic(groupName="group"))
+        assert cache.get(("group", 1), "2") is None
+        assert cache.get(("other", 1), "1") is None
+        assert cache.stats()["misses"] == 2
+
+    def test_least_recently_used_is_evicted(self):
+        cache = StatisticCache(max_size=2)
+        for name in ("first", "second"):
+            cache.set(name, None, Statistic(groupName=name))
+        cache.get("first", None)
+        cache.set("third", None, Statistic(groupName="third"))
+        assert cache.get("second", None) is None
+        assert cache.get("first", None) is not None
+        assert cache.stats()["size"] == 2
+
+    def test_disabled_cache(self):
+        cache = StatisticCache(max_size=0)
+        cache.set("group", None, Statistic(groupName="group"))
+        assert cache.get("group", None) is None
@@ -1,6 +1,10 @@
 import random
 import string
 
+from pydantic import BaseModel
+from store.redis.accessor import RedisAccessor
+from store.redis.aggregation import StatisticAggregator
+
 INVALID_CHARS = r"/\;,.<>|?*"
 
 
@@ -11,3 +15,50 @@ def random_lower_string(length: int = 32, invalid_count: int = 0) -> str:
         insert_pos = random.randint(0, len(result) - 1)
         result = result[:insert_pos] + invalid_char + result[insert_pos:]
     return result
+
+
+class MOStatistic(BaseModel):
+    tmo_id: int | None = None
+    size: int | None = None
+    name: str | None = None
+
+
+class GroupStatistic(BaseModel):
+    """Statistic model of TMO with MO parameters size (average) and name
+    (frequency)."""
+
+    groupName: str
+    MO: MOStatistic = MOStatistic()
+
+
+async def write_statistic(
+    accessor: RedisAccessor,
+    group_name: str,
+    sizes: dict[int, int],
+    rest_sizes: list[int] | None = None,
+) -> None:
+    """Write statistic of group, rest_sizes are sizes of entities out of
+    sample of approximate group."""
+    prefix = f"{accessor.prefix}{accessor._group_tag(group_name)}"
+    size_path = f"{prefix}:MO:int:average:size"
+    name_path = f"{prefix}:MO:str:frequency:name"
+    keys = await accessor._storage_keys(group_name, [size_path, name_path])
+    pipe = accessor.redis.pipeline(transaction=False)
+    await accessor._set_values(pipe, keys[size_path], sizes)
+    await accessor._set_values(
+        pipe, keys[name_path], {entity_id: "a" for entity_id in sizes}
+    )
+    await accessor._register_keys(pipe, group_name, keys.values())
+    await pipe.execute()
+    if rest_sizes:
+        pipe = accessor.redis.pipeline(transaction=False)
+        await accessor._write_rest_totals(
+            pipe,
+            group_name,
+            {
+                size_path: StatisticAggregator("average", "int").update(
+                    map(str, rest_sizes)
+                )
+            },
+        )
+        await pipe.execute()